@@ -0,0 +1,185 @@
+"""
+观察者框架固定开销基准：
+- 被监听方法调用（0 / 1 / 10 / 100 个订阅插件）
+- RunnerResult / Data 构造
+- PluginPool.get_plugins（含按内置插件顺序排序）
+- ServerStock 迭代（实例化 + initialize 广播）
+- 服务注册表：注册、删除一半、按位置遍历（生成的大量 ServerRunner 类）
+
+结果为单次操作耗时（us，多轮取最小值）。与基线文件比较，任一项变慢超过阈值时以非零状态码退出，可用于 CI 回归检查。
+基线与机器相关，更换运行环境后需重新生成。
+
+运行：python -m benchmarks.dispatch_overhead [--tolerance 25] [--save-baseline] [--baseline PATH]
+"""
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from core.base import Server, ServerPlugin, ServerStock, RunnerResult, Data, EmptyParameter
+from core.context import RunContext
+from core.generator import PluginPool
+from core.utils import OrderedRegistry
+
+SUBSCRIBER_COUNTS = (0, 1, 10, 100)
+SERVER_COUNT = 10
+REGISTRY_SIZE = 500
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "dispatch_overhead.json"
+
+
+class _BenchServer(Server):
+    source_name = "BenchServer"
+
+    def __init__(self):
+        # 不创建 Sender，只测量框架开销
+        pass
+
+    @classmethod
+    def ping(cls) -> bool:
+        return True
+
+    def set_base_headers(self, *args, **kwargs) -> None:
+        pass
+
+    def tokenization(self) -> bool:
+        return True
+
+    def set_tokenization_headers(self):
+        pass
+
+    def run(self, *args, **kwargs):
+        return {"total": 1}
+
+
+class _BenchPlugin(ServerPlugin):
+
+    def get_notify(self, data: Data):
+        pass
+
+
+def _per_call_us(statement, number: int, repeat: int) -> float:
+    return min(timeit.repeat(statement, number=number, repeat=repeat)) / number * 1e6
+
+
+def _bench_monitored_call(number: int, repeat: int) -> dict:
+    results = {}
+    for subscriber_count in SUBSCRIBER_COUNTS:
+        with RunContext(include_inner_plugin=False):
+            list(PluginPool.register(_BenchPlugin()) for _ in range(subscriber_count))
+            server = _BenchServer()
+            results[f"monitored_call[{subscriber_count}]"] = _per_call_us(server.run, number, repeat)
+    return results
+
+
+def _bench_payload(number: int, repeat: int) -> dict:
+    server = _BenchServer()
+    runner_result = RunnerResult(server, {"total": 1})
+    return {
+        "runner_result_init": _per_call_us(lambda: RunnerResult(server, {"total": 1}), number, repeat),
+        "data_init": _per_call_us(lambda: Data(server, runner_result, "run"), number, repeat),
+    }
+
+
+def _bench_get_plugins(number: int, repeat: int) -> dict:
+    import inner_plugins  # noqa: F401 注册内置插件，使排序路径生效
+    results = {}
+    for plugin_count in (10, 100):
+        with RunContext(include_inner_plugin=True):
+            list(PluginPool.register(_BenchPlugin()) for _ in range(plugin_count))
+            results[f"get_plugins[{plugin_count}]"] = _per_call_us(PluginPool.get_plugins, number, repeat)
+    return results
+
+
+def _bench_server_stock(number: int, repeat: int) -> dict:
+    registry = OrderedRegistry()
+    for index in range(SERVER_COUNT):
+        registry[type(f"BenchServer{index}", (_BenchServer,), {"source_name": f"BenchServer{index}"})] = \
+            EmptyParameter
+    with RunContext(include_inner_plugin=False):
+        list(PluginPool.register(_BenchPlugin()) for _ in range(10))
+
+        def iterate():
+            for _ in ServerStock(registry, {}, include_inner_servers=False):
+                pass
+
+        per_stock = _per_call_us(iterate, max(number // SERVER_COUNT, 1), repeat)
+    return {f"server_stock_iter[{SERVER_COUNT}]": per_stock}
+
+
+def _bench_server_registry(number: int, repeat: int) -> dict:
+    server_classes = [type(f"BenchServer{index}", (_BenchServer,), {}) for index in range(REGISTRY_SIZE)]
+    sort_list = [server_class.__name__ for server_class in server_classes[::-1]]
+
+    def register_delete_iterate():
+        registry = OrderedRegistry()
+        for server_class in server_classes:
+            registry[server_class] = EmptyParameter
+        registry.sort(sort_list)
+        for server_class in server_classes[::2]:
+            del registry[server_class]
+        for index in range(len(registry)):
+            registry.get_item(index)
+
+    per_registry = _per_call_us(register_delete_iterate, max(number // REGISTRY_SIZE, 1), repeat)
+    return {f"server_registry[{REGISTRY_SIZE}]": per_registry}
+
+
+def run(number: int = 20000, repeat: int = 5) -> dict:
+    results = {}
+    results.update(_bench_monitored_call(number, repeat))
+    results.update(_bench_payload(number, repeat))
+    results.update(_bench_get_plugins(number, repeat))
+    results.update(_bench_server_stock(number, repeat))
+    results.update(_bench_server_registry(number, repeat))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    返回超过阈值的回归项：(名称, 基线us, 当前us, 变化百分比)
+    """
+    regressions = []
+    for name, value in results.items():
+        base_value = baseline.get(name)
+        if not base_value:
+            continue
+        change = (value - base_value) / base_value * 100
+        if change > tolerance:
+            regressions.append((name, base_value, value, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="每轮调用次数")
+    parser.add_argument("--repeat", type=int, default=5, help="轮数，取最小值")
+    parser.add_argument("--tolerance", type=float, default=25.0, help="允许变慢的百分比")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    options = parser.parse_args()
+
+    results = run(options.number, options.repeat)
+    baseline = json.loads(options.baseline.read_text(encoding="utf-8")) if options.baseline.exists() else {}
+    print(f"{'benchmark':<28}{'baseline(us)':>14}{'current(us)':>14}{'change':>10}")
+    for name, value in results.items():
+        base_value = baseline.get(name)
+        change = f"{(value - base_value) / base_value * 100:+.1f}%" if base_value else "-"
+        print(f"{name:<28}{base_value if base_value else float('nan'):>14.3f}{value:>14.3f}{change:>10}")
+
+    if options.save_baseline:
+        options.baseline.parent.mkdir(parents=True, exist_ok=True)
+        options.baseline.write_text(json.dumps({name: round(value, 4) for name, value in results.items()}, indent=2),
+                                    encoding="utf-8")
+        print(f"\n基线已保存：{options.baseline}")
+        return
+    regressions = compare(results, baseline, options.tolerance)
+    if regressions:
+        print(f"\n以下项目变慢超过 {options.tolerance:.0f}%：")
+        for name, base_value, value, change in regressions:
+            print(f"  {name}: {base_value:.3f}us -> {value:.3f}us ({change:+.1f}%)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
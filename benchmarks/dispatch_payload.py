@@ -0,0 +1,169 @@
+"""
+广播载荷构造基准：对比旧实现（每个订阅插件构造一次 Data）与当前实现（每次广播共享一个载荷）
+
+运行：python -m benchmarks.dispatch_payload [--number 2000]
+"""
+import argparse
+import time
+import tracemalloc
+
+import core.monitor as monitor
+from core.base import RunnerResult, Data
+from core.monitor import Dispatcher, DispatchStats, NotifyBatcher
+
+SUBSCRIBER_COUNTS = (1, 10, 100)
+
+
+class _LegacyRunnerResult:
+    __slots__ = ('source_type', 'source_name', '_data', '_initialized')
+
+    def __init__(self, source_object, data=None):
+        super().__setattr__('_initialized', False)
+        self.source_type = getattr(source_object, 'source_type', None) or str(type(source_object))
+        self.source_name = getattr(source_object, 'source_name', None) or source_object.__class__.__name__
+        self._data = data
+        super().__setattr__('_initialized', True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_initialized', False):
+            raise AttributeError(name)
+        super().__setattr__(name, value)
+
+
+class _LegacyData:
+    __slots__ = ('result', 'obj', 'method_name', '_initialized')
+
+    def __init__(self, obj, data, method_name):
+        super().__setattr__('_initialized', False)
+        self.result = data
+        self.obj = obj
+        self.method_name = method_name
+        super().__setattr__('_initialized', True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_initialized', False):
+            raise AttributeError(name)
+        super().__setattr__(name, value)
+
+
+class _Counter:
+    def __init__(self):
+        self.count = 0
+
+
+def _counting(cls, counter):
+    class Counting(cls):
+        __slots__ = ()
+
+        def __init__(self, *args, **kwargs):
+            counter.count += 1
+            super().__init__(*args, **kwargs)
+
+    return Counting
+
+
+class _Source:
+    source_type = "server"
+    source_name = "BenchServer"
+    disable_method = []
+
+
+class _Subscriber:
+
+    def __init__(self):
+        self.payloads = []
+
+    def get_notify(self, data):
+        self.payloads.append(data)
+
+
+class _Pool:
+    event_bus = None
+
+    def __init__(self, subscribers):
+        self.subscribers = tuple(subscribers)
+        self.dispatch_stats = DispatchStats()
+        self.notify_batcher = NotifyBatcher()
+
+    def record_input(self, source_name, result):
+        pass
+
+    def get_subscribers(self, monitor_attr, method_name, source_name):
+        return self.subscribers
+
+    def get_delivery_lock(self, plugin):
+        return None
+
+
+def _legacy_dispatch(obj, plugins, method_name, result, runner_result_cls, data_cls):
+    # 旧实现：逐个插件判断订阅关系，并为每个插件构造新的 Data
+    for plugin in plugins:
+        if method_name in ["run"]:
+            result = result if isinstance(result, runner_result_cls) else runner_result_cls(obj, result)
+            plugin.get_notify(data_cls(obj, result, method_name))
+
+
+def _current_dispatch(obj, pool, method_name, result):
+    Dispatcher._generic_dispatch(obj, pool, method_name, result, 'server_allow_monitor_functions', False)
+
+
+def _measure(fn, subscribers, number):
+    for subscriber in subscribers:
+        subscriber.payloads.clear()
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    for _ in range(number):
+        fn()
+    retained = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+    for subscriber in subscribers:
+        subscriber.payloads.clear()
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    elapsed = time.perf_counter() - start
+    return retained / number, elapsed / number * 1e6
+
+
+def run(number: int = 2000):
+    rows = []
+    obj = _Source()
+    for subscriber_count in SUBSCRIBER_COUNTS:
+        subscribers = [_Subscriber() for _ in range(subscriber_count)]
+        pool = _Pool(subscribers)
+
+        legacy_counter = _Counter()
+        legacy_rr = _counting(_LegacyRunnerResult, legacy_counter)
+        legacy_data = _counting(_LegacyData, legacy_counter)
+        legacy_bytes, legacy_us = _measure(
+            lambda: _legacy_dispatch(obj, subscribers, "run", {"k": 1}, legacy_rr, legacy_data), subscribers, number)
+        legacy_objects = legacy_counter.count / (number * 2)
+
+        current_counter = _Counter()
+        counting_types = (_counting(RunnerResult, current_counter), _counting(Data, current_counter))
+        get_payload_types = monitor._get_payload_types
+        monitor._get_payload_types = lambda: counting_types
+        try:
+            current_bytes, current_us = _measure(
+                lambda: _current_dispatch(obj, pool, "run", {"k": 1}), subscribers, number)
+        finally:
+            monitor._get_payload_types = get_payload_types
+        current_objects = current_counter.count / (number * 2)
+
+        rows.append((subscriber_count, legacy_objects, current_objects, legacy_bytes, current_bytes, legacy_us,
+                     current_us))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=2000, help="每组广播次数")
+    options = parser.parse_args()
+    header = ("订阅数", "载荷对象(旧)", "载荷对象(新)", "字节(旧)", "字节(新)", "耗时us(旧)", "耗时us(新)")
+    print("\t".join(header))
+    for row in run(options.number):
+        print("\t".join([str(row[0])] + [f"{value:.1f}" for value in row[1:]]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+"""
+DynamicFreezeObject 基准：对比旧实现（构造时递归复制全部嵌套数据）与当前实现（包装原始数据，访问时冻结）。
+数据为 20k 条 BUG 的服务结果（BUG 列表 + 按环境统计），分别测量：
+- 构造：耗时与新分配的内存
+- 读取汇总：订阅方只读取统计字段
+- 全量遍历：逐条读取每个 BUG 的全部字段
+另外对比序列化（旧实现先还原为普通字典再 pickle）与内容哈希的耗时
+
+运行：python -m benchmarks.freeze_object [--bugs 20000] [--repeat 5]
+"""
+import argparse
+import pickle
+import random
+import time
+import tracemalloc
+from collections.abc import Mapping
+
+from core.utils import DynamicFreezeObject
+
+
+class _LegacyFreezeObject(Mapping):
+
+    def __init__(self, *args, **kwargs):
+        def process_value(value):
+            if isinstance(value, dict):
+                return _LegacyFreezeObject(**{str(k): process_value(v) for k, v in value.items()})
+            elif isinstance(value, list):
+                return tuple(process_value(item) for item in value)
+            else:
+                return value
+
+        for key, value in kwargs.items():
+            self.__dict__[str(key)] = process_value(value)
+
+    def __getitem__(self, key):
+        return self.__dict__[str(key)]
+
+    def __len__(self):
+        return len(self.__dict__)
+
+    def __iter__(self):
+        return iter(self.__dict__)
+
+
+def _make_result(count: int) -> dict:
+    rng = random.Random(1)
+    bugs = [{"id": index, "title": f"[test] bug {index}", "severity": rng.choice([1, 2, 3, 4]),
+             "status": rng.choice(["active", "resolved", "closed"]), "resolution": rng.choice(["fixed", ""]),
+             "openedBy": {"account": f"user{index % 50}", "realname": f"用户{index % 50}"},
+             "execution": rng.choice([1, 2])} for index in range(count)]
+    summary = {env: {"total": count, "severity": {str(level): count // 4 for level in range(1, 5)}}
+               for env in ("test", "prod")}
+    return {"bugs": bugs, "bug": summary, "task": {"executionName": "迭代1"}, "bug_file_path": "/tmp/bugs.xlsx"}
+
+
+def _construct(cls, result):
+    return cls(**result)
+
+
+def _read_summary(obj):
+    return obj["bug"]["test"]["total"], obj["task"]["executionName"]
+
+
+def _read_all(obj):
+    total = 0
+    for bug in obj["bugs"]:
+        for key in bug.keys():
+            bug[key]
+        total += len(bug["openedBy"])
+    return total
+
+
+def _measure(cls, result, repeat: int) -> dict:
+    tracemalloc.start()
+    obj = _construct(cls, result)
+    construct_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del obj
+
+    def best(fn) -> float:
+        timings = []
+        for _ in range(repeat):
+            obj = _construct(cls, result)
+            start = time.perf_counter()
+            fn(obj)
+            timings.append((time.perf_counter() - start) * 1e3)
+        return min(timings)
+
+    return {
+        "construct_ms": min(_time(lambda: _construct(cls, result)) for _ in range(repeat)),
+        "construct_kb": construct_bytes / 1024,
+        "read_summary_ms": best(_read_summary),
+        "read_all_ms": best(_read_all),
+    }
+
+
+def _time(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e3
+
+
+def _thaw(value):
+    if isinstance(value, DynamicFreezeObject):
+        return {key: _thaw(item) for key, item in value._data.items()}
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _measure_serialization(result, repeat: int) -> dict:
+    obj = DynamicFreezeObject(**result)
+    legacy_frame = pickle.dumps(_thaw(obj), protocol=pickle.HIGHEST_PROTOCOL)
+    frame = obj.to_bytes()
+
+    def first_hash() -> float:
+        fresh = DynamicFreezeObject(**result)
+        return _time(fresh.content_hash)
+
+    return {
+        "legacy_dumps_ms": min(_time(lambda: pickle.dumps(_thaw(obj), protocol=pickle.HIGHEST_PROTOCOL))
+                               for _ in range(repeat)),
+        "legacy_loads_ms": min(_time(lambda: DynamicFreezeObject(**pickle.loads(legacy_frame))) for _ in range(repeat)),
+        "legacy_kb": len(legacy_frame) / 1024,
+        "dumps_ms": min(_time(obj.to_bytes) for _ in range(repeat)),
+        "loads_ms": min(_time(lambda: DynamicFreezeObject.from_bytes(frame)) for _ in range(repeat)),
+        "kb": len(frame) / 1024,
+        "hash_ms": min(first_hash() for _ in range(repeat)),
+        "cached_hash_ms": min(_time(obj.content_hash) for _ in range(repeat)),
+    }
+
+
+def run(bug_count: int = 20000, repeat: int = 5) -> dict:
+    result = _make_result(bug_count)
+    return {"legacy": _measure(_LegacyFreezeObject, result, repeat),
+            "lazy": _measure(DynamicFreezeObject, result, repeat),
+            "serialization": _measure_serialization(result, repeat)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bugs", type=int, default=20000, help="BUG 条数")
+    parser.add_argument("--repeat", type=int, default=5, help="轮数，取最小值")
+    options = parser.parse_args()
+    results = run(options.bugs, options.repeat)
+    print(f"{'实现':<10}{'构造(ms)':>12}{'构造内存(KB)':>16}{'读取汇总(ms)':>16}{'全量遍历(ms)':>16}")
+    for name in ("legacy", "lazy"):
+        row = results[name]
+        print(f"{name:<10}{row['construct_ms']:>12.3f}{row['construct_kb']:>16.1f}"
+              f"{row['read_summary_ms']:>16.3f}{row['read_all_ms']:>16.3f}")
+    row = results["serialization"]
+    print(f"\n{'序列化':<10}{'dumps(ms)':>12}{'loads(ms)':>12}{'大小(KB)':>12}")
+    print(f"{'legacy':<10}{row['legacy_dumps_ms']:>12.3f}{row['legacy_loads_ms']:>12.3f}{row['legacy_kb']:>12.1f}")
+    print(f"{'to_bytes':<10}{row['dumps_ms']:>12.3f}{row['loads_ms']:>12.3f}{row['kb']:>12.1f}")
+    print(f"\ncontent_hash：首次 {row['hash_ms']:.3f}ms，缓存后 {row['cached_hash_ms']:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+GlobalData 读写基准：对比旧实现（每次读取、写入都在锁内 deepcopy 全部数据）与当前实现（不可变版本快照）。
+数据为 50k 条 BUG 记录，外加若干小的中间结果；update_item[1k] 为已有 1000 个（已被读取过的）键时单个键的写入耗时，
+deepcopy 一列为单独 deepcopy 写入数据的耗时，作为 set_data 的下限参考
+
+运行：python -m benchmarks.global_data_snapshot [--bugs 50000] [--number 20]
+"""
+import argparse
+import random
+import threading
+import time
+from copy import deepcopy
+
+from core._config._global_obj import GlobalDataType
+
+
+class _LegacyGlobalData:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+        self._version = 0
+
+    def set_data(self, value):
+        with self._lock:
+            self._data = deepcopy(value)
+            self._version += 1
+
+    def get_data(self):
+        with self._lock:
+            return deepcopy(self._data)
+
+    def update_item(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._version += 1
+
+    def get_with_version(self):
+        with self._lock:
+            return deepcopy(self._data), self._version
+
+
+def _make_bugs(count: int) -> list:
+    rng = random.Random(1)
+    return [{"id": index, "title": f"[test] bug {index}", "severity": rng.choice([1, 2, 3, 4]),
+             "status": rng.choice(["active", "resolved", "closed"]), "resolution": rng.choice(["fixed", ""]),
+             "execution": rng.choice([1, 2])} for index in range(count)]
+
+
+def _per_call_us(fn, number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number * 1e6
+
+
+def run(bug_count: int = 50000, number: int = 20) -> list:
+    bugs = _make_bugs(bug_count)
+    value = {"bugs": bugs, "summary": {"total": bug_count}}
+    copy_us = _per_call_us(lambda: deepcopy(value), 1)
+    many_keys = {f"step_{index}": {"index": index} for index in range(1000)}
+    rows = []
+    for name, global_data in (("deepcopy", _LegacyGlobalData()), ("snapshot", GlobalDataType())):
+        set_us = _per_call_us(lambda: global_data.set_data(value), 1)
+        counter = iter(range(10 ** 9))
+        row = [
+            name,
+            copy_us,
+            set_us,
+            _per_call_us(global_data.get_data, number),
+            _per_call_us(global_data.get_with_version, number),
+            _per_call_us(lambda: global_data.update_item("step", next(counter)), number),
+        ]
+        global_data.set_data(many_keys)
+        for key in many_keys:
+            global_data.get_data()[key]
+        row.append(_per_call_us(lambda: global_data.update_item("step_0", {"index": next(counter)}), number))
+        rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bugs", type=int, default=50000, help="BUG 记录条数")
+    parser.add_argument("--number", type=int, default=20, help="每项操作的次数")
+    options = parser.parse_args()
+    print(f"{'实现':<12}{'deepcopy(us)':>14}{'set_data(us)':>14}{'get_data(us)':>14}{'get_with_version(us)':>22}"
+          f"{'update_item(us)':>17}{'update_item[1k](us)':>21}")
+    for name, copy_us, set_us, get_us, get_version_us, update_us, update_many_us in run(options.bugs, options.number):
+        print(f"{name:<12}{copy_us:>14.1f}{set_us:>14.1f}{get_us:>14.1f}{get_version_us:>22.1f}{update_us:>17.1f}"
+              f"{update_many_us:>21.1f}")
+
+
+if __name__ == '__main__':
+    main()
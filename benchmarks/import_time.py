@@ -0,0 +1,62 @@
+"""
+CLI 冷启动导入耗时基准：以 -X importtime 导入入口模块，统计总耗时与最慢的模块，
+并检查启动阶段是否误导入了只在运行时才需要的重量级依赖
+
+运行：python -m benchmarks.import_time [--module report_generator] [--top 15] [--threshold-ms 300]
+存在禁止的依赖或总耗时超过阈值时以非零状态码退出，可用于 CI 回归检查
+"""
+import argparse
+import subprocess
+import sys
+from typing import List, Tuple
+
+# 启动阶段不应导入的依赖（均由服务/插件在 run 时按需导入）
+FORBIDDEN_MODULES = ('openpyxl', 'aiohttp', 'aiofiles', 'PIL', 'docx', 'lxml', 'olefile', 'xmindparser', 'yaml',
+                     'requests', 'multiprocessing', 'concurrent.futures')
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """
+    返回 (模块名, 自身耗时us, 累计耗时us) 列表，按导入顺序排列
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败：\n{process.stderr}")
+    records = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        records.append((name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--module', default='report_generator')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--threshold-ms', type=float, default=300.0)
+    args = parser.parse_args()
+
+    records = measure(args.module)
+    total_ms = next(cumulative for name, _, cumulative in records if name == args.module) / 1000
+    print(f"{'module':<50}{'self(ms)':>12}{'cumulative(ms)':>16}")
+    for name, self_us, cumulative_us in sorted(records, key=lambda record: record[1], reverse=True)[:args.top]:
+        print(f"{name:<50}{self_us / 1000:>12.2f}{cumulative_us / 1000:>16.2f}")
+    print(f"\nimport {args.module}: {total_ms:.2f} ms（阈值 {args.threshold_ms:.0f} ms）")
+
+    imported = {name for name, _, _ in records}
+    forbidden = [module for module in FORBIDDEN_MODULES if module in imported]
+    failed = False
+    if forbidden:
+        print(f"启动阶段导入了重量级依赖：{', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.threshold_ms:
+        print("导入耗时超过阈值")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
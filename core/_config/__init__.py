@@ -1,3 +1,3 @@
-from ._global_obj import _PluginPool, _GlobalData
+from ._global_obj import _PluginPool, _GlobalData, get_current_plugin_pool, get_current_global_data
 
-__all__ = ['_PluginPool', '_GlobalData']
+__all__ = ['_PluginPool', '_GlobalData', 'get_current_plugin_pool', 'get_current_global_data']
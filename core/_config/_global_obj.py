@@ -1,74 +1,360 @@
-import functools
+import itertools
 import threading
+import warnings
+from collections import deque
+from collections.abc import Mapping
+from contextvars import ContextVar
 from copy import deepcopy
-from typing import Dict, TypeVar
+from types import MappingProxyType
+from typing import Dict, TypeVar, Tuple, List, Callable
 
 T = TypeVar("T", bound=object)
+# 全局数据的初始快照
+_EMPTY_SNAPSHOT = MappingProxyType({})
+# 写入时无需复制的不可变类型
+_IMMUTABLE_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
 
 
-def singleton(cls):
-    instances = {}
-    lock = threading.Lock()
-
-    @functools.wraps(cls)
-    def get_instance(*args, **kwargs):
-        if cls not in instances:
-            with lock:
-                if cls not in instances:
-                    instances[cls] = cls(*args, **kwargs)
-        return instances[cls]
-
-    return get_instance
-
-
-@singleton
 class _PluginPool:
 
     def __init__(self, include_inner_plugin: bool = True):
         self.plugins = []
         self.include_inner_plugin: bool = include_inner_plugin
+        # plugins 是否已按顺序排列，register / set_plugins 等修改插件列表时重置
+        self._plugins_ordered = False
+        # 待激活的插件类，首次获取插件或 activate 时才实例化
+        self._pending_classes = []
+        # 服务/插件 run 的结果：source_name -> 结果，用于判断插件声明的 required_inputs 是否已产生
+        self._produced_inputs: Dict[str, T] = {}
+        # 因输入缺失未激活或未运行的插件：source_name -> 缺失的输入
+        self.skipped_plugins: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        # (监听类型属性, 方法名) -> 订阅插件列表，按 get_plugins 顺序排列，None 表示需要重建
+        self._subscription_index: Dict[Tuple[str, str], List] | None = None
+        # (监听类型属性, 方法名, source_name) -> 订阅插件元组，按需由索引过滤得到
+        self._subscriber_cache: Dict[Tuple[str, str, str], tuple] = {}
+        # 异步广播总线（core.monitor.EventBus），None 表示同步广播
+        self.event_bus = None
+        # 广播日志（core.journal.EventJournal），None 表示不记录
+        self.journal = None
+        # 插件执行守卫（core.guard.PluginGuard），None 表示不设时间预算与熔断
+        self.guard = None
+        self._dispatch_stats = None
+        self._notify_batcher = None
+        # 并发调度时为每个插件分配的投递锁，None 表示未开启串行投递
+        self._delivery_locks: Dict[int, threading.RLock] | None = None
 
     def register(self, plugin):
         self.plugins.append(plugin)
+        self._invalidate_subscriptions()
+
+    def register_lazy(self, plugin_class):
+        """
+        登记插件类，延迟到首次获取插件或 activate 时实例化
+        """
+        with self._lock:
+            self._pending_classes.append(plugin_class)
+        self._invalidate_subscriptions()
+
+    def activate(self, active_sources=None) -> List[str]:
+        """
+        实例化待激活的插件类。
+        :param active_sources: 本次运行中会产生结果的服务 source_name，required_inputs 中的来源
+            既不在其中也不是已激活的插件时，该插件不实例化；None 表示全部实例化
+        :return: 未激活的插件名称
+        """
+        with self._lock:
+            pending, self._pending_classes = self._pending_classes, []
+            if not pending:
+                return []
+            if active_sources is None:
+                list(self.register(plugin_class()) for plugin_class in pending)
+                return []
+            sources = set(active_sources) | {_get_source_name(plugin) for plugin in self.plugins}
+            # 插件之间可能互为输入，重复检查直到没有新的插件被激活
+            while pending:
+                remaining = []
+                for plugin_class in pending:
+                    missing = [required for required in plugin_class.required_inputs or ()
+                               if required.partition('.')[0] not in sources]
+                    if missing:
+                        remaining.append(plugin_class)
+                        continue
+                    self.register(plugin_class())
+                    sources.add(_get_source_name(plugin_class))
+                if len(remaining) == len(pending):
+                    break
+                pending = remaining
+            for plugin_class in pending:
+                self.skipped_plugins[_get_source_name(plugin_class)] = [
+                    required for required in plugin_class.required_inputs
+                    if required.partition('.')[0] not in sources]
+            return [_get_source_name(plugin_class) for plugin_class in pending]
+
+    def record_input(self, source_name: str, result):
+        self._produced_inputs[source_name] = result
+
+    def get_input(self, source_name: str):
+        return self._produced_inputs.get(source_name)
+
+    def get_missing_inputs(self, plugin) -> List[str]:
+        """
+        插件声明的 required_inputs 中尚未产生的项。
+        "来源" 表示该来源的 run 结果不为空，"来源.字段" 表示结果中该字段不为空
+        """
+        missing = []
+        for required in getattr(plugin, 'required_inputs', None) or ():
+            source_name, _, field = required.partition('.')
+            value = self._produced_inputs.get(source_name)
+            get_data = getattr(value, 'get_data', None)
+            value = get_data() if callable(get_data) else value
+            if value and field:
+                value = value.get(field) if isinstance(value, dict) else getattr(value, field, None)
+            if not value:
+                missing.append(required)
+        return missing
+
+    @staticmethod
+    def get_dependencies(plugin) -> List[str] | None:
+        """
+        插件依赖的来源：required_inputs 中的来源，加上 depends_on 中只需先运行、但并非必需的来源；
+        均未声明时返回 None（按原顺序在所有服务及之前的插件之后运行，见 core.scheduler）
+        """
+        required_inputs = getattr(plugin, 'required_inputs', None)
+        depends_on = getattr(plugin, 'depends_on', None)
+        if required_inputs is None and depends_on is None:
+            return None
+        sources = []
+        for source_name in itertools.chain((required.partition('.')[0] for required in required_inputs or ()),
+                                           depends_on or ()):
+            if source_name not in sources:
+                sources.append(source_name)
+        return sources
+
+    def check_inputs(self, plugin) -> bool:
+        """
+        插件的输入是否均已产生，未产生时记录到 skipped_plugins
+        """
+        missing = self.get_missing_inputs(plugin)
+        if missing:
+            self.skipped_plugins[_get_source_name(plugin)] = missing
+        return not missing
 
     def get_plugins(self):
+        """
+        按顺序返回插件：priority 小的在前，相同时内置插件按 inner_plugins.__all__ 排列，其余按注册顺序。
+        排序结果缓存至插件列表下次变化
+        """
+        if self._pending_classes:
+            self.activate()
+        if not self._plugins_ordered:
+            with self._lock:
+                if not self._plugins_ordered:
+                    self._sort_plugins()
+                    self._plugins_ordered = True
+        return self.plugins
+
+    def _sort_plugins(self):
+        order_map = {}
         if self.include_inner_plugin:
             import inner_plugins
             sort_list = getattr(inner_plugins, '__all__', None) or []
             order_map = {name: index for index, name in enumerate(sort_list)}
-            self.plugins.sort(key=lambda p: order_map.get(type(p).__name__, float('inf')))
-        return self.plugins
+        self.plugins.sort(key=lambda p: (getattr(p, 'priority', None) or 0,
+                                         order_map.get(type(p).__name__, float('inf'))))
 
     def set_plugins(self, plugins):
         self.plugins = plugins
+        self._invalidate_subscriptions()
+
+    @property
+    def dispatch_stats(self):
+        """
+        广播统计对象（core.monitor.DispatchStats）
+        """
+        if self._dispatch_stats is None:
+            from core.monitor import DispatchStats
+            self._dispatch_stats = DispatchStats()
+        return self._dispatch_stats
+
+    @property
+    def notify_batcher(self):
+        """
+        批量广播缓冲（core.monitor.NotifyBatcher）
+        """
+        if self._notify_batcher is None:
+            with self._lock:
+                if self._notify_batcher is None:
+                    from core.monitor import NotifyBatcher
+                    self._notify_batcher = NotifyBatcher()
+        return self._notify_batcher
+
+    def get_dispatch_stats(self) -> dict:
+        """
+        获取广播次数、送达订阅数以及各插件 get_notify / run 的耗时直方图
+        """
+        return self.dispatch_stats.snapshot()
+
+    def reset_dispatch_stats(self):
+        self.dispatch_stats.reset()
+
+    def set_event_bus(self, event_bus):
+        self.event_bus = event_bus
+
+    def set_journal(self, journal):
+        self.journal = journal
+
+    def set_guard(self, guard):
+        self.guard = guard
+
+    def flush_notify(self, plugin=None):
+        """
+        屏障：送出批量广播的缓冲，异步广播模式下并等待已发出的广播被插件处理完毕
+        :param plugin: 仅等待发往该插件的广播，None 表示所有插件
+        """
+        if self._notify_batcher is not None:
+            self._notify_batcher.flush(self, plugin)
+        if self.event_bus is not None:
+            self.event_bus.flush(plugin)
+
+    def set_serialize_delivery(self, flag: bool):
+        """
+        开启后，同步广播对同一插件的 get_notify 调用加锁串行，供多线程调度使用
+        """
+        with self._lock:
+            self._delivery_locks = {} if flag else None
+
+    def get_delivery_lock(self, plugin):
+        delivery_locks = self._delivery_locks
+        if delivery_locks is None:
+            return None
+        lock = delivery_locks.get(id(plugin))
+        if lock is None:
+            with self._lock:
+                lock = delivery_locks.setdefault(id(plugin), threading.RLock())
+        return lock
 
     def set_include_inner_plugin(self, flag):
         self.include_inner_plugin = flag
+        self._invalidate_subscriptions()
+
+    def get_subscribers(self, monitor_attr: str, method_name: str, source_name: str) -> tuple:
+        """
+        获取订阅了指定来源方法的插件
+        :param monitor_attr: 监听类型属性，如：server_allow_monitor_functions
+        :param method_name: 被监听的方法名
+        :param source_name: 广播来源的 source_name
+        :return: 订阅插件元组，顺序与 get_plugins 一致
+        """
+        key = (monitor_attr, method_name, source_name)
+        subscribers = self._subscriber_cache.get(key)
+        if subscribers is None:
+            with self._lock:
+                if self._subscription_index is None:
+                    self._subscription_index = self._build_subscription_index()
+                subscribers = tuple(
+                    plugin for plugin in self._subscription_index.get((monitor_attr, method_name), ())
+                    if self._accept_source(plugin, source_name))
+                self._subscriber_cache[key] = subscribers
+        return subscribers
+
+    def _build_subscription_index(self) -> Dict[Tuple[str, str], List]:
+        index = {}
+        for plugin in self.get_plugins():
+            for monitor_attr in ("server_allow_monitor_functions", "plugin_allow_monitor_functions",
+                                 "allow_monitor_functions", "allow_monitor_streams"):
+                for method_name in getattr(plugin, monitor_attr, None) or ():
+                    subscribers = index.setdefault((monitor_attr, method_name), [])
+                    if plugin not in subscribers:
+                        subscribers.append(plugin)
+        return index
+
+    @classmethod
+    def _accept_source(cls, plugin, source_name: str) -> bool:
+        if not getattr(plugin, "input_sources_only", False):
+            return True
+        return source_name in (cls.get_dependencies(plugin) or ())
+
+    def _invalidate_subscriptions(self):
+        with self._lock:
+            self._plugins_ordered = False
+            self._subscription_index = None
+            self._subscriber_cache = {}
+
+
+def _get_source_name(obj) -> str:
+    if isinstance(obj, type):
+        return getattr(obj, 'source_name', None) or obj.__name__
+    return getattr(obj, 'source_name', None) or obj.__class__.__name__
 
 
 def _get_plugin_pool() -> _PluginPool:
     return _PluginPool()
 
 
-@singleton
 class _GlobalData:
+    """
+    全局数据，以不可变的版本快照保存：
+    - 读取直接返回当前版本的快照（DynamicFreezeObject），不加锁、不复制，读取方不会阻塞写入方
+    - 写入时冻结新值（dict 转为 DynamicFreezeObject，list 转为 tuple），与上一版本共享未变化的值后发布新版本
+    - 最近 CHANGE_LOG_SIZE 个版本的变更键保存在变更日志中，供 changes_since / watch 只处理变化的部分
+    """
+    # 变更日志保留的版本数
+    CHANGE_LOG_SIZE = 1024
+    # changes_since 中表示键已被 set_data 移除
+    DELETED = object()
+
     def __init__(self):
         self._lock = threading.Lock()
-        self._data: Dict[str, T] = {}
+        # (快照, 版本号)，整体替换，读取时无需加锁即可得到一致的快照与版本
+        self._state: Tuple[Mapping, int] = (_EMPTY_SNAPSHOT, 0)
         self.system_parameters = None
-        self._version = 0  # 数据版本标识
+        # 共享内存存储（core.shared_data.SharedMemoryStore），None 表示仅在本进程内保存
+        self._shared = None
+        # 变更日志：(版本号, 变更的键)
+        self._changes: deque = deque(maxlen=self.CHANGE_LOG_SIZE)
+        # 监听：编号 -> (关注的键，None 表示全部, 回调)
+        self._watchers: Dict[int, tuple] = {}
+        self._watcher_ids = itertools.count(1)
+
+    @staticmethod
+    def _freeze(value: Mapping):
+        from core.utils import DynamicFreezeObject
+        return DynamicFreezeObject(**value)
 
     def set_data(self, value: Dict[str, T]) -> None:
+        # 与调用方的数据隔离，此后调用方修改原数据不会影响快照
+        snapshot = self._freeze(deepcopy(value))
         with self._lock:
-            self._data = deepcopy(value)
-            self._version += 1
+            previous, version = self._state
+            version += 1
+            self._state = (snapshot, version)
+            # 按原始数据比较（不触发冻结），移除的键与值不相等的键视为变更
+            previous_data, data = getattr(previous, '_data', previous), snapshot._data
+            changed = frozenset(key for key in previous_data.keys() | data.keys()
+                                if _is_changed(previous_data.get(key, self.DELETED), data.get(key, self.DELETED)))
+            self._changes.append((version, changed))
+            if self._shared is not None:
+                self._shared.update(dict(snapshot.items()), version, replace=True)
+        self._notify_watchers(snapshot, version, changed)
 
-    def get_data(self) -> Dict[str, T]:
-        with self._lock:
-            return deepcopy(self._data)
+    def get_data(self) -> Mapping:
+        """
+        当前版本的只读快照；开启共享内存后由共享内存反序列化并在进程内缓存
+        """
+        shared = self._shared
+        if shared is not None:
+            return self._freeze(shared.snapshot()[0])
+        return self._state[0]
+
+    def get_item(self, key: str, default: T = None) -> T:
+        shared = self._shared
+        if shared is not None:
+            return shared.get(key, default)
+        return self._state[0].get(key, default)
 
     @property
-    def data(self) -> Dict[str, T]:
+    def data(self) -> Mapping:
         return self.get_data()
 
     @data.setter
@@ -76,24 +362,173 @@ class _GlobalData:
         self.set_data(value)
 
     def update_item(self, key: str, value: T) -> None:
+        # 与调用方的数据隔离，同 set_data；不可变的标量无需复制
+        if type(value) not in _IMMUTABLE_TYPES:
+            value = deepcopy(value)
         with self._lock:
-            self._data[key] = value
-            self._version += 1
+            previous, version = self._state
+            if not hasattr(previous, '_replace'):
+                previous = self._freeze(previous)
+            # 其余键的原始数据与已冻结的值与上一版本共享，读取方已冻结的部分无需重新冻结
+            snapshot, version = previous._replace(key, value), version + 1
+            self._state = (snapshot, version)
+            changed = frozenset((key,)) if _is_changed(previous._data.get(key, self.DELETED), value) else frozenset()
+            self._changes.append((version, changed))
+            if self._shared is not None:
+                self._shared.update({key: snapshot.get(key)}, version)
+        self._notify_watchers(snapshot, version, changed)
 
     @property
     def version(self) -> int:
+        shared = self._shared
+        if shared is not None:
+            return shared.version
+        return self._state[1]
+
+    def get_with_version(self) -> tuple[Mapping, int]:
+        shared = self._shared
+        if shared is not None:
+            values, version = shared.snapshot()
+            return self._freeze(values), version
+        return self._state
+
+    def changes_since(self, version: int) -> tuple[Dict[str, T], int]:
+        """
+        获取指定版本之后变更的键值，已移除的键对应 DELETED。
+        该版本已超出变更日志（或在只读附加共享内存的子进程中）时返回全部键值，调用方按全量处理即可
+        :return: (变更的键值, 当前版本号)
+        """
+        if self._shared is not None and not self._shared.owner:
+            values, current = self._shared.snapshot()
+            return (values if version < current else {}), current
+        with self._lock:
+            snapshot, current = self._state
+            changes = list(self._changes)
+        if version >= current:
+            return {}, current
+        if not changes or changes[0][0] > version + 1:
+            return dict(snapshot.items()), current
+        keys = set()
+        for change_version, changed in changes:
+            if change_version > version:
+                keys.update(changed)
+        return {key: snapshot.get(key, self.DELETED) for key in keys}, current
+
+    def watch(self, keys: List[str] | None, callback: Callable[[Dict[str, T], int], None]) -> int:
+        """
+        监听键的变更，写入后在写入方线程中以 (变更的键值, 版本号) 调用 callback，回调异常不会影响写入
+        :param keys: 关注的键，None 表示全部
+        :return: 监听编号，用于 unwatch
+        """
+        watcher_id = next(self._watcher_ids)
         with self._lock:
-            return self._version
+            self._watchers[watcher_id] = (None if keys is None else frozenset(keys), callback)
+        return watcher_id
 
-    def get_with_version(self) -> tuple[Dict[str, T], int]:
+    def unwatch(self, watcher_id: int):
         with self._lock:
-            return deepcopy(self._data), self._version
+            self._watchers.pop(watcher_id, None)
+
+    def _notify_watchers(self, snapshot: Mapping, version: int, changed: frozenset):
+        if not self._watchers or not changed:
+            return
+        with self._lock:
+            watchers = list(self._watchers.values())
+        for keys, callback in watchers:
+            matched = changed if keys is None else changed & keys
+            if not matched:
+                continue
+            try:
+                callback({key: snapshot.get(key, self.DELETED) for key in matched}, version)
+            except Exception as e:
+                warnings.warn(f"GlobalData 监听回调执行失败：{type(e).__name__}: {e}")
+
+    @property
+    def shared_memory_name(self) -> str | None:
+        return None if self._shared is None else self._shared.name
+
+    def enable_shared_memory(self) -> str:
+        """
+        将数据写入共享内存，子进程可通过 attach_shared_memory(name) 直接读取，无需每次进程间通信
+        """
+        from core.shared_data import SharedMemoryStore
+        with self._lock:
+            if self._shared is None:
+                snapshot, version = self._state
+                self._shared = SharedMemoryStore()
+                self._shared.update(dict(snapshot.items()), version, replace=True)
+            return self._shared.name
+
+    def attach_shared_memory(self, name: str):
+        """
+        以只读方式附加到其他进程创建的共享数据，写入时抛出 PermissionError
+        """
+        from core.shared_data import SharedMemoryStore
+        with self._lock:
+            self._shared = SharedMemoryStore(name)
+
+    def close_shared_memory(self):
+        with self._lock:
+            shared, self._shared = self._shared, None
+        if shared is not None:
+            shared.close()
+
+
+def _is_changed(previous, value) -> bool:
+    if previous is value:
+        return False
+    try:
+        return bool(previous != value)
+    except Exception:
+        # 无法比较的值（如数组）按已变更处理
+        return True
 
 
 def _get_global_data() -> _GlobalData:
     return _GlobalData()
 
 
-_PluginPool: _PluginPool = _get_plugin_pool()
+# 当前运行上下文（core.context.RunContext）持有的插件池与全局数据，None 表示不在任何运行中
+_current_plugin_pool: ContextVar[_PluginPool | None] = ContextVar('plugin_pool', default=None)
+_current_global_data: ContextVar[_GlobalData | None] = ContextVar('global_data', default=None)
+
+# 进程默认对象：不在运行上下文中时使用（如 inner_plugin 导入时注册、子进程内执行插件）
+_default_plugin_pool: _PluginPool = _get_plugin_pool()
+_default_global_data: _GlobalData = _get_global_data()
+
+
+def get_current_plugin_pool() -> _PluginPool:
+    plugin_pool = _current_plugin_pool.get()
+    return _default_plugin_pool if plugin_pool is None else plugin_pool
+
+
+def get_current_global_data() -> _GlobalData:
+    global_data = _current_global_data.get()
+    return _default_global_data if global_data is None else global_data
+
+
+class _ContextProxy:
+    """
+    将属性访问转发到当前运行上下文中的对象，使多个运行可在同一进程的不同线程/协程中互不干扰
+    """
+    __slots__ = ('_getter',)
+
+    def __init__(self, getter):
+        object.__setattr__(self, '_getter', getter)
+
+    def __getattr__(self, name):
+        return getattr(self._getter(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._getter(), name, value)
+
+    def __repr__(self):
+        return f"<context proxy of {self._getter()!r}>"
+
+
+PluginPoolType = _PluginPool
+GlobalDataType = _GlobalData
+
+_PluginPool: _PluginPool = _ContextProxy(get_current_plugin_pool)
 
-_GlobalData: _GlobalData = _get_global_data()
+_GlobalData: _GlobalData = _ContextProxy(get_current_global_data)
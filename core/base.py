@@ -1,13 +1,14 @@
+import importlib
 import os
 import shutil
 from abc import ABC, abstractmethod
 from typing import TypeVar, Generic, Union, List
 
-from core._config import _const
+from core._config import _const, get_current_plugin_pool
 from core._config._exception import TempFileTypeException, FileControlException, FileException
-from core.monitor import MonitorBase
+from core.monitor import MonitorBase, Dispatcher
 from core.root import SourceType, get_base_dir
-from core.utils import Sender, IndexingDict, HiddenDefaultDict, HttpProtocolEnum, singleton
+from core.utils import Sender, OrderedRegistry, HiddenDefaultDict, HttpProtocolEnum
 
 T = TypeVar("T", bound=object)
 
@@ -15,6 +16,9 @@ T = TypeVar("T", bound=object)
 class Parameter:
 
     def __getattr__(self, item):
+        # 魔术方法（如 __setstate__、__deepcopy__）需按约定抛出异常，否则 pickle、copy 会误把 None 当作实现
+        if item.startswith('__') and item.endswith('__'):
+            raise AttributeError(item)
         return None
 
 
@@ -24,7 +28,6 @@ class EmptyParameter(Parameter):
         pass
 
 
-@singleton
 class SystemParameters(Parameter):
 
     def __init__(
@@ -32,6 +35,23 @@ class SystemParameters(Parameter):
             clean_temp_files: str = '2',
             kdocs_files_path: Union[str, List] = None,
             close_inner_all: str = '2',
+            async_notify: str = '2',
+            notify_queue_size: Union[str, int] = 64,
+            notify_workers: Union[str, int] = None,
+            process_plugins: Union[str, List] = None,
+            process_workers: Union[str, int] = None,
+            parallel_schedule: str = '2',
+            schedule_workers: Union[str, int] = None,
+            notify_timeout: Union[str, float] = None,
+            run_timeout: Union[str, float] = None,
+            circuit_breaker: str = '2',
+            breaker_threshold: Union[str, int] = 3,
+            concurrent_servers: str = '2',
+            prefetch: str = '1',
+            result_cache: str = '1',
+            result_cache_dir: str = None,
+            result_cache_size: Union[str, int] = 256,
+            shared_global_data: str = '2',
             *args,
             **kwargs
     ):
@@ -46,31 +66,56 @@ class SystemParameters(Parameter):
         # 参数处理解耦
         self.clean_temp_files = parse_bool_param(clean_temp_files, default=True)
         self.close_inner_all = parse_bool_param(close_inner_all, default=False)
+        self.async_notify = parse_bool_param(async_notify, default=False)
+        self.notify_queue_size = int(notify_queue_size)
+        self.notify_workers = int(notify_workers) if notify_workers else None
+        self.process_plugins: List[str] = process_plugins.split(_const.SYMBOL.SplitArgsSymbol) \
+            if isinstance(process_plugins, str) else list(process_plugins or [])
+        self.process_workers = int(process_workers) if process_workers else None
+        self.parallel_schedule = parse_bool_param(parallel_schedule, default=False)
+        self.schedule_workers = int(schedule_workers) if schedule_workers else None
+        self.notify_timeout = float(notify_timeout) if notify_timeout else None
+        self.run_timeout = float(run_timeout) if run_timeout else None
+        self.circuit_breaker = parse_bool_param(circuit_breaker, default=False)
+        self.breaker_threshold = int(breaker_threshold)
+        self.concurrent_servers = parse_bool_param(concurrent_servers, default=False)
+        self.prefetch = parse_bool_param(prefetch, default=True)
+        # run 结果缓存（见 core.result_cache），result_cache_size 单位 MB
+        self.result_cache = parse_bool_param(result_cache, default=True)
+        self.result_cache_dir = result_cache_dir
+        self.result_cache_size = int(result_cache_size)
+        # GlobalData 写入共享内存，子进程插件直接读取（见 core.shared_data）
+        self.shared_global_data = parse_bool_param(shared_global_data, default=False)
         self.strict_mode: bool = False
         self.kdocs_files_path = kdocs_files_path
         for name, value in kwargs.items():
             self.__dict__[name] = value
 
 
+_object_setattr = object.__setattr__
+
+
 class RunnerResult:
-    __slots__ = ('source_type', 'source_name', '_data', '_initialized')
+    """
+    广播结果，构造时直接写入 slots，构造完成后不可变
+    """
+    __slots__ = ('source_type', 'source_name', '_data')
 
     def __init__(self, source_object: Union['Server', 'Plugin'], data=None):
-        super().__setattr__('_initialized', False)
-        self.source_type = getattr(source_object, 'source_type', None) or str(type(source_object))
-        self.source_name = getattr(source_object, 'source_name', None) or source_object.__class__.__name__
-        self._data = data
-        super().__setattr__('_initialized', True)
+        _object_setattr(self, 'source_type', getattr(source_object, 'source_type', None) or str(type(source_object)))
+        _object_setattr(self, 'source_name',
+                        getattr(source_object, 'source_name', None) or source_object.__class__.__name__)
+        _object_setattr(self, '_data', data)
 
     def get_data(self):
         return self._data
 
+    def __reduce__(self):
+        return _restore_runner_result, (self.source_type, self.source_name, self._data)
+
     def __setattr__(self, name, value):
-        if getattr(self, '_initialized', False):
-            raise AttributeError(
-                f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
-        else:
-            super().__setattr__(name, value)
+        raise AttributeError(
+            f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
     def __delattr__(self, name):
         if hasattr(self, name):
@@ -89,22 +134,34 @@ class RunnerResult:
             f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
 
+def _restore_runner_result(source_type, source_name, data) -> RunnerResult:
+    runner_result = RunnerResult.__new__(RunnerResult)
+    _object_setattr(runner_result, 'source_type', source_type)
+    _object_setattr(runner_result, 'source_name', source_name)
+    _object_setattr(runner_result, '_data', data)
+    return runner_result
+
+
 class Data:
-    __slots__ = ('result', 'obj', 'method_name', '_initialized')
+    """
+    单次广播的载荷，同一次广播的所有订阅插件共享同一个实例
+    """
+    __slots__ = ('result', 'obj', 'method_name')
+    result: RunnerResult
+    # 订阅插件接收该载荷的方法
+    callback_name = 'get_notify'
 
     def __init__(self, obj, data, method_name):
-        super().__setattr__('_initialized', False)
-        self.result: RunnerResult = data
-        self.obj = obj
-        self.method_name = method_name
-        super().__setattr__('_initialized', True)
+        _object_setattr(self, 'result', data)
+        _object_setattr(self, 'obj', obj)
+        _object_setattr(self, 'method_name', method_name)
+
+    def __reduce__(self):
+        return Data, (self.obj, self.result, self.method_name)
 
     def __setattr__(self, name, value):
-        if getattr(self, '_initialized', False):
-            raise AttributeError(
-                f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
-        else:
-            super().__setattr__(name, value)
+        raise AttributeError(
+            f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
     def __delattr__(self, name):
         if hasattr(self, name):
@@ -123,9 +180,35 @@ class Data:
             f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
 
+class StreamData:
+    """
+    流式广播的单个元素，逐项送达订阅了该流的插件（Plugin.get_stream），end 为 True 时表示流已结束
+    """
+    __slots__ = ('obj', 'source_name', 'stream_name', 'item', 'end')
+    callback_name = 'get_stream'
+
+    def __init__(self, obj, stream_name, item, end=False):
+        _object_setattr(self, 'obj', obj)
+        _object_setattr(self, 'source_name', getattr(obj, 'source_name', None) or obj.__class__.__name__)
+        _object_setattr(self, 'stream_name', stream_name)
+        _object_setattr(self, 'item', item)
+        _object_setattr(self, 'end', end)
+
+    def __reduce__(self):
+        return StreamData, (self.obj, self.stream_name, self.item, self.end)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(
+            f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
+
+
 class Server(ABC, metaclass=MonitorBase):
     source_type = SourceType.SERVER
     source_name = None
+    # 依赖的其他服务/插件的 source_name，None 表示未声明（见 core.scheduler）
+    depends_on = None
+    # 运行顺序，数值小的在前，相同时按 servers.__all__ 顺序及注册顺序（见 ServerRunner、OrderedRegistry）
+    priority = 0
     __restrict_init__ = True
 
     def __init__(self, domain=None, protocol=HttpProtocolEnum.HTTP):
@@ -142,6 +225,19 @@ class Server(ABC, metaclass=MonitorBase):
         self.tokenization()
         self.set_tokenization_headers()
 
+    def publish_stream(self, stream_name: str, item):
+        """
+        向订阅了该流（allow_monitor_streams）的插件广播一个元素，适用于边接收边处理的大量数据。
+        异步广播模式下经由有界队列送达，队列满时阻塞，内存占用与数据总量无关
+        """
+        Dispatcher.stream_dispatch(self, get_current_plugin_pool(), stream_name, item)
+
+    def end_stream(self, stream_name: str):
+        Dispatcher.stream_dispatch(self, get_current_plugin_pool(), stream_name, None, end=True)
+
+    def has_stream_subscribers(self, stream_name: str) -> bool:
+        return Dispatcher.has_stream_subscribers(self, get_current_plugin_pool(), stream_name)
+
     def reset_sender(self, domain=None, protocol=None):
         self.sender = Sender(domain=domain or self.sender.domain, protocol=protocol or self.sender.protocol)
 
@@ -168,6 +264,53 @@ class Server(ABC, metaclass=MonitorBase):
         pass
 
 
+class AsyncServer(Server):
+    """
+    协程版服务：tokenization 与 run 为协程，由 ServerStock.run_all 在同一事件循环中并发登录与运行，
+    initialize / run 的广播与同步服务一致。同步的 Sender 请通过 send 放到线程中执行，避免阻塞事件循环
+    """
+
+    async def initialize(self):
+        self.set_base_headers()
+        await self.tokenization()
+        self.set_tokenization_headers()
+
+    @abstractmethod
+    async def tokenization(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def run(self, *args, **kwargs) -> Union[RunnerResult, T]:
+        pass
+
+    async def send(self, *args, **kwargs):
+        """
+        在线程中执行 Sender.send，参数与 Sender.send 一致
+        """
+        import asyncio
+        return await asyncio.to_thread(self.sender.send, *args, **kwargs)
+
+
+def run_sync(result):
+    """
+    同步调用服务方法：协程服务的方法返回协程对象，在新的事件循环中执行完毕后返回结果。
+    当前线程已有运行中的事件循环（在异步服务中调用）时，asyncio.run 无法嵌套，改为在新线程的事件循环中执行并等待；
+    在事件循环中请优先直接 await 协程（或使用 ServerStock.arun_all），避免阻塞当前事件循环
+    """
+    if not hasattr(result, '__await__'):
+        return result
+    import asyncio
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(result)
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # 新线程沿用当前的运行上下文（PluginPool、GlobalData 等）
+        return executor.submit(contextvars.copy_context().run, asyncio.run, result).result()
+
+
 ServerType = TypeVar('ServerType', bound=Server)
 
 
@@ -183,6 +326,27 @@ class Plugin(ABC, metaclass=MonitorBase):
     source_name = None
     plugin_allow_monitor_functions = ["run"]
     allow_monitor_functions = []
+    # 是否只接收依赖来源（required_inputs 与 depends_on 中的来源）的广播，见 PluginPool.get_dependencies
+    input_sources_only = False
+    # 是否在独立进程中执行 run（见 core.process_pool），适用于 CPU 密集型插件
+    run_in_process = False
+    # 运行与接收广播的顺序，数值小的在前，相同时按内置插件顺序及注册顺序（见 PluginPool.get_plugins）
+    priority = 0
+    # 除 required_inputs 中的来源外，还需先运行的服务/插件 source_name（非必需的输入）；
+    # 与 required_inputs 均为 None 时按原顺序在所有服务及之前的插件之后运行（见 PluginPool.get_dependencies）
+    depends_on = None
+    # 回放模式（--replay）下是否直接使用日志中记录的 run 结果而不实际运行（见 core.journal）
+    replayable = False
+    # 订阅的流名称，流中的元素通过 get_stream 逐项送达（见 Server.publish_stream）
+    allow_monitor_streams = []
+    # 运行所需的输入："来源" 或 "来源.字段"，来源即为插件的依赖，不在本次运行中时插件不会被实例化，
+    # 来源的 run 结果（或其字段）为空时跳过 run（见 PluginPool.activate / check_inputs）；None 表示无要求
+    required_inputs = None
+    # 重写 get_notify_batch 后广播批量送达，单批最多的广播条数（见 core.monitor.NotifyBatcher）
+    notify_batch_size = 64
+    # get_notify / run 的时间预算（秒），None 表示使用系统参数 notify_timeout / run_timeout（见 core.guard）
+    notify_timeout = None
+    run_timeout = None
 
     @abstractmethod
     def run(self, *args, **kwargs) -> Union[RunnerResult, T]:
@@ -191,6 +355,35 @@ class Plugin(ABC, metaclass=MonitorBase):
     def get_notify(self, data: Data):
         pass
 
+    def get_notify_batch(self, data_list: List[Data]):
+        """
+        批量接收广播，重写后广播会按插件缓冲，在插件运行前或累计 notify_batch_size 条时一次性送达，
+        适用于每次广播都需要重复准备工作的聚合型插件
+        """
+        for data in data_list:
+            self.get_notify(data)
+
+    get_notify_batch.__default_notify_batch__ = True
+
+    def get_stream(self, data: StreamData):
+        pass
+
+    def __reduce__(self):
+        return _restore_plugin, (type(self).__module__, type(self).__qualname__, self.__dict__)
+
+
+def _restore_plugin(module_name: str, qualname: str, state: dict) -> 'Plugin':
+    """
+    按模块路径还原插件实例。inner_plugin 装饰后模块属性指向的是实例，需要取其类型
+    """
+    target = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        target = getattr(target, name)
+    plugin_class = target if isinstance(target, type) else type(target)
+    plugin = plugin_class.__new__(plugin_class)
+    plugin.__dict__.update(state)
+    return plugin
+
 
 class ServerPlugin(Plugin):
     """
@@ -204,7 +397,7 @@ class ServerPlugin(Plugin):
 
 class ServerStock(Generic[ServerType]):
 
-    def __init__(self, stock: IndexingDict, args_mapping, include_inner_servers: bool = True) -> None:
+    def __init__(self, stock: OrderedRegistry, args_mapping, include_inner_servers: bool = True) -> None:
         self.current = 0
         if include_inner_servers:
             import servers
@@ -222,15 +415,57 @@ class ServerStock(Generic[ServerType]):
     def __next__(self) -> Union[ServerType, str]:
         try:
             server_class, server_parameter_class = self.stock.get_item(self.current)
-            self.current += 1
-            parameter = server_parameter_class(**self.args_mapping)
-            server_instance = server_class()
-            server_instance.parameter = parameter
-            server_instance.system_parameter = self.args_mapping
-            server_instance.initialize()
-            return server_instance
         except IndexError:
             raise StopIteration
+        self.current += 1
+        return self.build_server(server_class, server_parameter_class)
+
+    def build_server(self, server_class, server_parameter_class) -> ServerType:
+        """
+        实例化服务并完成初始化（登录等）
+        """
+        server_instance = self._create_server(server_class, server_parameter_class)
+        run_sync(server_instance.initialize())
+        return server_instance
+
+    def _create_server(self, server_class, server_parameter_class) -> ServerType:
+        parameter = server_parameter_class(**self.args_mapping)
+        server_instance = server_class()
+        server_instance.parameter = parameter
+        server_instance.system_parameter = self.args_mapping
+        return server_instance
+
+    def run_all(self) -> List:
+        """
+        在同一事件循环中并发初始化并运行所有服务，返回各服务 run 的结果（顺序与注册顺序一致）。
+        协程服务直接在事件循环中执行，同步服务放到线程中执行；任一服务出错时抛出首个异常。
+        已在事件循环中时请使用 arun_all
+        """
+        return run_sync(self.arun_all())
+
+    async def arun_all(self) -> List:
+        """
+        run_all 的协程版本，在当前事件循环中执行
+        """
+        import asyncio
+        return list(await asyncio.gather(*(self._initialize_and_run(server_class, server_parameter_class)
+                                           for server_class, server_parameter_class in self.stock.items())))
+
+    async def _initialize_and_run(self, server_class, server_parameter_class):
+        import asyncio
+        server_instance = self._create_server(server_class, server_parameter_class)
+        if isinstance(server_instance, AsyncServer):
+            await server_instance.initialize()
+            return await server_instance.run()
+
+        def initialize_and_run():
+            server_instance.initialize()
+            return server_instance.run()
+
+        return await asyncio.to_thread(initialize_and_run)
+
+    def items(self):
+        return self.stock.items()
 
 
 class SystemContext:
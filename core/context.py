@@ -0,0 +1,180 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Union, List, Optional, Dict
+
+from core._config._global_obj import PluginPoolType, GlobalDataType, _current_plugin_pool, _current_global_data
+from core.root import _current_temp_dir, get_temp_root
+from core.utils import OrderedRegistry
+
+# 当前生效的运行上下文，按线程/协程隔离
+_current_run_context: ContextVar[Optional['RunContext']] = ContextVar('run_context', default=None)
+# 超过该时长（秒）未修改、且不属于进行中运行的 core/temp/<run_id> 目录视为残留，在新的运行开始时删除
+STALE_TEMP_DIR_SECONDS = 60 * 60
+# 运行期间在 core/temp 下写入 <run_id>.pid 标记所属进程，其他进程据此判断该目录是否仍在使用
+RUN_MARKER_SUFFIX = ".pid"
+# 本进程中进行中的运行的临时目录 -> 进入次数
+_active_temp_dirs: Dict[Path, int] = {}
+_active_temp_dirs_lock = threading.Lock()
+
+
+class RunContext:
+    """
+    单次运行的上下文，持有本次运行独占的：
+    - plugin_pool：插件池（含本次运行的内置插件实例、广播总线、日志、守卫等）
+    - global_data：全局数据（含 system_parameters）
+    - server_stock：服务注册表的快照
+    - temp_dir：临时目录，默认为 core/temp/<run_id>；运行期间写入进程标记 core/temp/<run_id>.pid，
+      进入时删除其他运行残留的临时目录（见 prune_stale_temp_dirs）
+    - prefetch：预取结果登记处（core.prefetch.PrefetchRegistry），None 表示未开启预取
+    进入上下文后，PluginPool、GlobalData 与 get_base_dir() 均指向本次运行的对象，
+    同一进程中可在不同线程或协程中同时执行多次运行而互不影响。
+    线程池等跨线程执行需通过 contextvars.copy_context() 传递上下文
+    """
+
+    def __init__(self, system_parameters=None, include_inner_plugin: bool = True,
+                 server_registry: OrderedRegistry = None, temp_dir: Union[str, Path] = None):
+        from core.deco import server_stock, inner_plugin_registry
+        self.run_id = uuid.uuid4().hex[:12]
+        self.plugin_pool = PluginPoolType(include_inner_plugin)
+        self.global_data = GlobalDataType()
+        self.global_data.system_parameters = system_parameters
+        self.server_stock = OrderedRegistry(server_registry if server_registry is not None else server_stock)
+        self.temp_dir = Path(temp_dir) if temp_dir else get_temp_root() / self.run_id
+        self.prefetch = None
+        if include_inner_plugin:
+            # 内置插件在各次运行中各自实例化，get_notify 收集的状态不会互相污染；
+            # 实例化延迟到 activate，输入来源不在本次运行中的插件不会被创建
+            list(self.plugin_pool.register_lazy(plugin_class) for plugin_class in inner_plugin_registry)
+        self._tokens: List = []
+
+    @property
+    def system_parameters(self):
+        return self.global_data.system_parameters
+
+    def __enter__(self) -> 'RunContext':
+        with _active_temp_dirs_lock:
+            _active_temp_dirs[self.temp_dir] = _active_temp_dirs.get(self.temp_dir, 0) + 1
+            first_enter = _active_temp_dirs[self.temp_dir] == 1
+        if self.temp_dir.parent == get_temp_root():
+            if first_enter:
+                _write_run_marker(self.temp_dir)
+            prune_stale_temp_dirs()
+        self._tokens.append((
+            _current_run_context.set(self),
+            _current_plugin_pool.set(self.plugin_pool),
+            _current_global_data.set(self.global_data),
+            _current_temp_dir.set(self.temp_dir),
+        ))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        run_context_token, plugin_pool_token, global_data_token, temp_dir_token = self._tokens.pop()
+        _current_temp_dir.reset(temp_dir_token)
+        _current_global_data.reset(global_data_token)
+        _current_plugin_pool.reset(plugin_pool_token)
+        _current_run_context.reset(run_context_token)
+        with _active_temp_dirs_lock:
+            _active_temp_dirs[self.temp_dir] -= 1
+            last_exit = not _active_temp_dirs[self.temp_dir]
+            if last_exit:
+                del _active_temp_dirs[self.temp_dir]
+        if last_exit and self.temp_dir.parent == get_temp_root():
+            # 运行结束后保留的临时文件按修改时间由之后的运行清理
+            _get_run_marker(self.temp_dir).unlink(missing_ok=True)
+        # 运行结束后临时目录已被清空时一并移除
+        if self.temp_dir.is_dir() and not any(self.temp_dir.iterdir()):
+            self.temp_dir.rmdir()
+
+
+def prune_stale_temp_dirs(max_age: float = STALE_TEMP_DIR_SECONDS):
+    """
+    删除 core/temp 下其他运行残留的临时目录，以下目录视为仍在使用而保留：
+    - 属于本进程中进行中的运行
+    - 进程标记（<run_id>.pid）对应的进程仍存活
+    - 目录内任一文件或子目录在 max_age 秒内修改过（只写入子目录中的文件不会更新顶层目录的修改时间）
+    未开启 clean_temp_files 时运行结束后保留临时文件以便查看，由之后的运行清理
+    """
+    temp_root = get_temp_root()
+    if not temp_root.is_dir():
+        return
+    deadline = time.time() - max_age
+    with _active_temp_dirs_lock:
+        active_temp_dirs = set(_active_temp_dirs)
+    for path in temp_root.iterdir():
+        if path.suffix == RUN_MARKER_SUFFIX:
+            # 目录已删除（或尚未创建）的进程标记
+            temp_dir = path.with_suffix("")
+            if temp_dir not in active_temp_dirs and not temp_dir.exists() and not _is_run_alive(path):
+                path.unlink(missing_ok=True)
+            continue
+        try:
+            if path in active_temp_dirs or not path.is_dir():
+                continue
+            marker = _get_run_marker(path)
+            if marker.exists() and _is_run_alive(marker):
+                continue
+            if _get_newest_mtime(path) > deadline:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        marker.unlink(missing_ok=True)
+
+
+def _get_run_marker(temp_dir: Path) -> Path:
+    return temp_dir.with_name(temp_dir.name + RUN_MARKER_SUFFIX)
+
+
+def _write_run_marker(temp_dir: Path):
+    try:
+        temp_dir.parent.mkdir(parents=True, exist_ok=True)
+        _get_run_marker(temp_dir).write_text(str(os.getpid()))
+    except OSError:
+        # 无法写入标记时仍可运行，目录是否残留退回按修改时间判断
+        pass
+
+
+def _is_run_alive(marker: Path) -> bool:
+    try:
+        pid = int(marker.read_text())
+    except (OSError, ValueError):
+        return False
+    if pid == os.getpid():
+        # 本进程中进行中的运行已在 _active_temp_dirs 中，其余为之前同 pid 进程留下的标记
+        return False
+    if os.name == "nt":
+        # Windows 下 os.kill 会结束目标进程，无法用于探测，退回按修改时间判断
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 进程存在但属于其他用户
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _get_newest_mtime(path: Path) -> float:
+    newest = path.stat().st_mtime
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+            except OSError:
+                continue
+    return newest
+
+
+def get_current_context() -> Optional[RunContext]:
+    """
+    获取当前线程/协程中生效的运行上下文，不在运行中时返回 None
+    """
+    return _current_run_context.get()
@@ -1,15 +1,21 @@
 import functools
 
-from core.generator import PluginPool
-from core.utils import IndexingDict
+from core._config._global_obj import _default_plugin_pool
+from core.utils import OrderedRegistry
 
-server_stock = IndexingDict()
-plugin_pool = PluginPool
+server_stock = OrderedRegistry()
+# 内置插件类注册表，每次运行由 RunContext 创建独立的插件实例
+inner_plugin_registry = []
+plugin_pool = _default_plugin_pool
 
 
 class ServerRunner:
-    def __init__(self, parameter=None):
+    def __init__(self, parameter=None, priority: int = None):
+        """
+        :param priority: 服务的运行顺序，数值小的在前，None 表示使用服务类的 priority 属性
+        """
         self.parameter = parameter
+        self.priority = priority
 
     def __call__(self, cls):
         global server_stock
@@ -19,14 +25,15 @@ class ServerRunner:
             return cls(*args, **kwargs)
 
         server_stock[wrapper] = self.parameter
+        priority = self.priority if self.priority is not None else getattr(cls, 'priority', 0)
+        if priority:
+            server_stock.set_priority(wrapper, priority)
         return wrapper
 
 
 def inner_plugin(cls):
-    @functools.wraps(cls)
-    def wrapper(*args, **kwargs):
-        obj = cls(*args, **kwargs)
-        plugin_pool.register(obj)
-        return obj
-
-    return wrapper()
+    # 导入时只登记插件类，由插件池在运行中按需实例化（见 PluginPool.activate）
+    if cls not in inner_plugin_registry:
+        inner_plugin_registry.append(cls)
+        plugin_pool.register_lazy(cls)
+    return cls
@@ -1,15 +1,22 @@
+import functools
 from typing import Optional, Union, List
 
 from core.generator import PluginPool, GlobalData
-from core.deco import server_stock
-from core.base import ServerStock, Server, SystemContext, SystemParameters
+from core.base import ServerStock, Server, SystemContext, SystemParameters, run_sync
 from core.utils import RunnerParameter
 from core.generator import ServicePlugin
-from servers.zendao_server import HelpAction
+from core.monitor import EventBus
+from core.process_pool import PluginProcessPool
+from core.scheduler import DagScheduler
+from core.journal import EventJournal, replay_events
+from core.guard import PluginGuard
+from core.context import RunContext
+from core.prefetch import PrefetchRegistry
 
 
 def _runner(args: Optional[Union[List[Union[str, int]]]], plugins: List[ServicePlugin]):
     args_mapping = RunnerParameter(args).get_args_mapping()
+    from servers.zendao_server import HelpAction
     help_action = HelpAction(**args_mapping)
     if help_action.get_info() is True:
         return
@@ -18,13 +25,175 @@ def _runner(args: Optional[Union[List[Union[str, int]]]], plugins: List[ServiceP
         import importlib
         importlib.import_module("servers")
         importlib.import_module("inner_plugins")
+    # 每次运行使用独立的插件池、全局数据与临时目录，同一进程中可并发执行多次运行
+    with RunContext(system_parameters, include_inner_plugin=system_parameters.close_inner_all is False) as context:
+        _run(context, args_mapping, plugins)
+
+
+def _run(context: RunContext, args_mapping, plugins: List[ServicePlugin]):
+    system_parameters = context.system_parameters
+    event_bus = EventBus(system_parameters.notify_queue_size, system_parameters.notify_workers) \
+        if system_parameters.async_notify else None
+    PluginPool.set_event_bus(event_bus)
+    process_pool = PluginProcessPool(system_parameters.process_workers)
+    journal = EventJournal.open_for_record(system_parameters.record) if system_parameters.record else None
+    PluginPool.set_journal(journal)
+    guard = PluginGuard(system_parameters.notify_timeout, system_parameters.run_timeout,
+                        system_parameters.circuit_breaker, system_parameters.breaker_threshold)
+    PluginPool.set_guard(guard)
+    if system_parameters.shared_global_data:
+        GlobalData.enable_shared_memory()
+    try:
+        with SystemContext(system_parameters.clean_temp_files):
+            stock = ServerStock[Server](context.server_stock, args_mapping,
+                                        include_inner_servers=system_parameters.close_inner_all is False)
+            list(PluginPool.register(plugin) for plugin in plugins or [])
+            # 只实例化输入来源在本次运行中的插件
+            PluginPool.activate(_get_server_names(stock))
+            _start_prefetch(context, stock)
+            try:
+                if system_parameters.replay:
+                    _run_replay(system_parameters, process_pool)
+                elif system_parameters.parallel_schedule:
+                    _run_by_dependency(stock, system_parameters, process_pool)
+                else:
+                    _run_in_order(stock, system_parameters, process_pool)
+                PluginPool.flush_notify()
+            finally:
+                # 预取线程可能仍在写临时目录，需在清理前结束
+                if context.prefetch is not None:
+                    context.prefetch.close()
+            if journal is not None:
+                journal.snapshot_temp()
+    finally:
+        # 存在超时的调用时不再等待子进程，避免整个运行被挂起
+        process_pool.close(wait=guard.timeouts == 0)
+        PluginPool.set_journal(None)
+        if journal is not None:
+            journal.close()
+        PluginPool.set_event_bus(None)
+        if event_bus is not None:
+            event_bus.close()
+        if system_parameters.dispatch_stats_path:
+            PluginPool.dispatch_stats.dump(system_parameters.dispatch_stats_path)
+        GlobalData.close_shared_memory()
+        PluginPool.set_guard(None)
+        guard.close()
+        if system_parameters.guard_report_path:
+            guard.dump(system_parameters.guard_report_path)
+
+
+def _start_prefetch(context: RunContext, stock: ServerStock):
+    """
+    配置解析完成后立即在后台预取下载文件、字体、OLE 模板等（见 core.prefetch），与服务登录、拉取数据并行。
+    回放模式不访问网络，不预取
+    """
+    system_parameters = context.system_parameters
+    if system_parameters.prefetch is False or system_parameters.replay:
+        return
+    active_sources = [getattr(plugin, 'source_name', None) or plugin.__class__.__name__
+                      for plugin in PluginPool.get_plugins()]
+    active_sources.extend(_get_server_names(stock))
+    context.prefetch = PrefetchRegistry()
+    context.prefetch.start(system_parameters, active_sources)
+
+
+def _get_server_names(stock: ServerStock) -> List[str]:
+    names = []
+    for server_class, _ in stock.items():
+        real_class = getattr(server_class, '__wrapped__', server_class)
+        names.append(getattr(real_class, 'source_name', None) or real_class.__name__)
+    return names
+
+
+def _run_in_order(stock: ServerStock, system_parameters: SystemParameters, process_pool: PluginProcessPool):
+    if system_parameters.concurrent_servers:
+        # 并发运行期间广播可能来自多个线程，同一插件的 get_notify 需串行
+        PluginPool.set_serialize_delivery(True)
+        try:
+            stock.run_all()
+        finally:
+            PluginPool.set_serialize_delivery(False)
+    else:
+        list(run_sync(server.run()) for server in stock)
+    if system_parameters.strict_mode is False and len(stock) > 0:
+        for plugin in PluginPool.get_plugins():
+            # 依赖仍在子进程中运行的插件结果时，需先等待其完成并广播
+            if process_pool.depends_on_pending(plugin):
+                _wait_process_plugins(process_pool)
+            # 屏障：插件运行前，确保之前的广播均已送达
+            PluginPool.flush_notify()
+            if not PluginPool.check_inputs(plugin):
+                continue
+            if process_pool.is_process_plugin(plugin, system_parameters.process_plugins):
+                if PluginPool.guard.allows(plugin):
+                    process_pool.submit(plugin)
+            else:
+                PluginPool.guard.call(plugin, 'run', plugin.run)
+        _wait_process_plugins(process_pool)
+
+
+def _wait_process_plugins(process_pool: PluginProcessPool):
+    # 子进程插件的时间预算从开始等待其结果时计算
+    for plugin in process_pool.pending_plugins():
+        PluginPool.guard.call(plugin, 'run', process_pool.wait, plugin)
+
+
+def _run_by_dependency(stock: ServerStock, system_parameters: SystemParameters, process_pool: PluginProcessPool):
+    """
+    按 depends_on（插件还包括 required_inputs）声明构建依赖图并发执行。未声明依赖的服务在之前的服务之后运行，
+    未声明依赖的插件在所有服务及之前的插件之后运行，与顺序执行一致
+    """
+    scheduler = DagScheduler(system_parameters.schedule_workers)
+    server_names = []
+    for server_class, server_parameter_class in stock.items():
+        real_class = getattr(server_class, '__wrapped__', server_class)
+        name = getattr(real_class, 'source_name', None) or real_class.__name__
+        depends_on = real_class.depends_on if real_class.depends_on is not None else list(server_names)
+        scheduler.add(name, functools.partial(_run_server, stock, server_class, server_parameter_class), depends_on)
+        server_names.append(name)
+    if system_parameters.strict_mode is False and len(stock) > 0:
+        plugin_names = []
+        for plugin in PluginPool.get_plugins():
+            name = getattr(plugin, 'source_name', None) or plugin.__class__.__name__
+            depends_on = PluginPool.get_dependencies(plugin)
+            if depends_on is None:
+                depends_on = server_names + plugin_names
+            scheduler.add(name, functools.partial(_run_plugin, plugin, system_parameters, process_pool), depends_on)
+            plugin_names.append(name)
+    PluginPool.set_serialize_delivery(True)
+    try:
+        scheduler.run()
+    finally:
+        PluginPool.set_serialize_delivery(False)
+
+
+def _run_replay(system_parameters: SystemParameters, process_pool: PluginProcessPool):
+    """
+    回放模式：不运行服务与可回放插件，改为重新广播日志中记录的结果，其余插件照常运行
+    """
+    journal = EventJournal(system_parameters.replay)
+    journal.restore_temp()
+    plugins = PluginPool.get_plugins()
+    replayed = replay_events(journal, PluginPool, [plugin for plugin in plugins if plugin.replayable])
+    if system_parameters.strict_mode is False and len(replayed) > 0:
+        for plugin in plugins:
+            source_name = getattr(plugin, 'source_name', None) or plugin.__class__.__name__
+            if plugin.replayable and source_name in replayed:
+                continue
+            _run_plugin(plugin, system_parameters, process_pool)
+
+
+def _run_server(stock: ServerStock, server_class, server_parameter_class):
+    run_sync(stock.build_server(server_class, server_parameter_class).run())
+
+
+def _run_plugin(plugin, system_parameters: SystemParameters, process_pool: PluginProcessPool):
+    # 屏障：依赖节点发往该插件的广播需在运行前送达
+    PluginPool.flush_notify(plugin)
+    if not PluginPool.check_inputs(plugin):
+        return
+    if process_pool.is_process_plugin(plugin, system_parameters.process_plugins):
+        PluginPool.guard.call(plugin, 'run', process_pool.run, plugin)
     else:
-        PluginPool.set_include_inner_plugin(False)
-    GlobalData.system_parameters = system_parameters
-    with SystemContext(system_parameters.clean_temp_files):
-        stock = ServerStock[Server](server_stock, args_mapping,
-                                    include_inner_servers=system_parameters.close_inner_all is False)
-        list(PluginPool.register(plugin) for plugin in plugins or [])
-        list(server.run() for server in stock)
-        if system_parameters.strict_mode is False and len(stock) > 0:
-            list(plugin.run() for plugin in PluginPool.get_plugins())
+        PluginPool.guard.call(plugin, 'run', plugin.run)
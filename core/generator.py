@@ -1,17 +1,23 @@
 from core._config import _PluginPool as PluginPool, _GlobalData as GlobalData
 from core._config import _exception as report_exception
-from core.base import ServerPlugin as ServicePlugin, Server, Parameter, RunnerResult, Data, T
+from core.base import ServerPlugin as ServicePlugin, Server, AsyncServer, Parameter, RunnerResult, Data, T
 from core.deco import ServerRunner
+from core.monitor import monitored
 from core.assign import start
+from core.context import RunContext, get_current_context
 
 __all__ = [
     'start',
+    'RunContext',
+    'get_current_context',
     'PluginPool',
     'GlobalData',
     'ServicePlugin',
     'Server',
+    'AsyncServer',
     'Parameter',
     'ServerRunner',
+    'monitored',
     'RunnerResult',
     'Data',
     'T',
@@ -0,0 +1,240 @@
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+import warnings
+from typing import Dict, Optional, Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# 阶段 -> 插件上声明时间预算的属性名
+PHASE_TIMEOUT_ATTRS = {"get_notify": "notify_timeout", "run": "run_timeout"}
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+
+
+def _get_source_name(obj) -> str:
+    return getattr(obj, 'source_name', None) or obj.__class__.__name__
+
+
+class _GuardExecutor:
+    """
+    有界、可复用的守护线程池：有空闲线程时复用，否则新建，最多 max_workers 个，超出时排队等待。
+    超时的调用可能永远不会结束，使用守护线程以免阻塞进程退出（标准库线程池在退出时会等待所有线程）
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._tasks = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._closed = False
+
+    def submit(self, func: Callable) -> 'Future':
+        # concurrent.futures 导入较重，仅在确实有限时调用时加载
+        from concurrent.futures import Future
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PluginGuard 已关闭")
+            self._tasks.put((future, func))
+            if not self._idle.acquire(blocking=False) and self._threads < self.max_workers:
+                self._threads += 1
+                threading.Thread(target=self._work, daemon=True, name=f"PluginGuard-{self._threads}").start()
+        return future
+
+    def _work(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, func = task
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func())
+                except BaseException as e:
+                    future.set_exception(e)
+            self._idle.release()
+
+    def close(self):
+        """
+        通知线程在处理完已提交的调用后退出，不等待
+        """
+        with self._lock:
+            self._closed = True
+            for _ in range(self._threads):
+                self._tasks.put(None)
+
+
+class CircuitBreaker:
+    """
+    单个插件的熔断器：超时或异常累计达到阈值后断开，此后该插件的 get_notify 与 run 均被跳过
+    """
+
+    def __init__(self, source_name: str, threshold: int):
+        self.source_name = source_name
+        self.threshold = threshold
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.skipped: Dict[str, int] = {}
+        self.events = []
+        # 超时后仍在后台运行的调用，结束前不再向该插件发起新的调用
+        self.inflight: Optional['Future'] = None
+
+    def record_failure(self, phase: str, reason: str, elapsed: float):
+        self.failures += 1
+        self.events.append({"phase": phase, "reason": reason, "elapsed": round(elapsed, 6)})
+        if self.threshold and self.state == STATE_CLOSED and self.failures >= self.threshold:
+            self.state = STATE_OPEN
+            self.events.append({"phase": phase, "reason": f"累计失败 {self.failures} 次，熔断", "elapsed": 0})
+
+    def record_skip(self, phase: str):
+        self.skipped[phase] = self.skipped.get(phase, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {"state": self.state, "failures": self.failures, "skipped": dict(self.skipped),
+                "events": list(self.events)}
+
+
+class PluginGuard:
+    """
+    插件执行守卫：为 get_notify 与 run 设置时间预算，并为每个插件维护熔断器。
+    - 时间预算优先取插件的 notify_timeout / run_timeout 属性，其次取系统参数中的默认值，单位秒
+    - 受守卫的插件（设置了时间预算或开启了熔断）出现超时或异常时不再中断整个运行，而是记录原因后继续，
+      累计失败达到 breaker_threshold 次后熔断，跳过其后续调用
+    - 限时调用在有界、可复用的守护线程池中执行（max_workers），沿用调用方的上下文，
+      EventBus 消费线程内的嵌套广播在其中同样不会阻塞
+    - 超时的调用无法被强制终止，会在后台继续执行，其 run 的结果不再广播；结束前该插件的后续调用直接记为失败，
+      因此卡住的线程数不超过受守卫的插件数
+    - 未受守卫的插件保持原有行为：直接调用，异常向上抛出
+    """
+
+    def __init__(self, notify_timeout: float = None, run_timeout: float = None, circuit_breaker: bool = False,
+                 breaker_threshold: int = 3, max_workers: int = None):
+        self.default_timeouts = {"get_notify": notify_timeout, "run": run_timeout}
+        self.circuit_breaker = circuit_breaker
+        self.breaker_threshold = breaker_threshold
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        # run 超时或已熔断的插件 source_name，其后续广播被丢弃
+        self.suppressed = set()
+        self.timeouts = 0
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self._executor: Optional[_GuardExecutor] = None
+
+    def _get_executor(self) -> _GuardExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = _GuardExecutor(self.max_workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.close()
+
+    def get_timeout(self, plugin, phase: str) -> Optional[float]:
+        timeout = getattr(plugin, PHASE_TIMEOUT_ATTRS[phase], None)
+        return timeout if timeout is not None else self.default_timeouts[phase]
+
+    def is_guarded(self, plugin, phase: str) -> bool:
+        return self.circuit_breaker or self.get_timeout(plugin, phase) is not None
+
+    def get_breaker(self, plugin) -> CircuitBreaker:
+        source_name = _get_source_name(plugin)
+        breaker = self._breakers.get(source_name)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(source_name,
+                                                    CircuitBreaker(source_name, self.breaker_threshold))
+        return breaker
+
+    def allows(self, plugin, phase: str = "run") -> bool:
+        """
+        插件当前是否允许被调用，不允许时记录一次跳过
+        """
+        if not self.is_guarded(plugin, phase):
+            return True
+        breaker = self.get_breaker(plugin)
+        if breaker.state == STATE_OPEN:
+            with self._lock:
+                breaker.record_skip(phase)
+            return False
+        return True
+
+    def call(self, plugin, phase: str, func, *args):
+        """
+        在守卫下调用插件方法，超时、异常或已熔断时返回 None
+        :param plugin: 插件实例
+        :param phase: get_notify 或 run
+        :param func: 实际调用的函数
+        """
+        if not self.is_guarded(plugin, phase):
+            return func(*args)
+        breaker = self.get_breaker(plugin)
+        if breaker.state == STATE_OPEN:
+            with self._lock:
+                breaker.record_skip(phase)
+            return None
+        if breaker.inflight is not None:
+            if not breaker.inflight.done():
+                self._fail(breaker, phase, "上一次超时的调用仍未结束", 0)
+                return None
+            breaker.inflight = None
+
+        timeout = self.get_timeout(plugin, phase)
+        start = time.perf_counter()
+        try:
+            if timeout is None:
+                return func(*args)
+            return self._call_with_timeout(breaker, phase, timeout, func, args)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as e:
+            self._fail(breaker, phase, f"{type(e).__name__}: {getattr(e, 'message', None) or e}",
+                       time.perf_counter() - start)
+            return None
+
+    def _call_with_timeout(self, breaker: CircuitBreaker, phase: str, timeout: float, func, args):
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        # 沿用调用方的上下文：运行上下文（PluginPool 等）以及 EventBus 消费线程的标记
+        context = contextvars.copy_context()
+        start = time.perf_counter()
+        future = self._get_executor().submit(lambda: context.run(func, *args))
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            if future.done():
+                # 插件自身抛出的 TimeoutError
+                raise
+            breaker.inflight = future
+            if phase == "run":
+                self.suppressed.add(breaker.source_name)
+            self._fail(breaker, phase, f"超过时间预算 {timeout}s", time.perf_counter() - start, timed_out=True)
+            return None
+
+    def _fail(self, breaker: CircuitBreaker, phase: str, reason: str, elapsed: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            breaker.record_failure(phase, reason, elapsed)
+            if breaker.state == STATE_OPEN:
+                self.suppressed.add(breaker.source_name)
+        warnings.warn(f"插件 {breaker.source_name}.{phase} 执行失败，已跳过：{reason}")
+
+    def report(self) -> dict:
+        """
+        各插件的熔断状态、失败次数、跳过次数以及每次失败的原因
+        """
+        with self._lock:
+            return {source_name: breaker.to_dict() for source_name, breaker in self._breakers.items()
+                    if breaker.failures or breaker.skipped}
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, ensure_ascii=False, indent=2)
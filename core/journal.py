@@ -0,0 +1,146 @@
+import pickle
+import shutil
+import threading
+import warnings
+from pathlib import Path
+from typing import Union, Iterator, List
+
+from core._config._exception import FileException
+from core.root import get_base_dir
+from core.utils import freeze_temp_paths, restore_temp_paths
+
+JOURNAL_FILE_NAME = "events.journal"
+TEMP_SNAPSHOT_DIR_NAME = "temp"
+JOURNAL_VERSION = 1
+
+
+class JournalEvent:
+    __slots__ = ('monitor_attr', 'identity_check', 'source_type', 'source_name', 'method_name', 'data')
+
+    def __init__(self, monitor_attr, identity_check, source_type, source_name, method_name, data):
+        self.monitor_attr = monitor_attr
+        self.identity_check = identity_check
+        self.source_type = source_type
+        self.source_name = source_name
+        self.method_name = method_name
+        self.data = data
+
+    def __reduce__(self):
+        return JournalEvent, (self.monitor_attr, self.identity_check, self.source_type, self.source_name,
+                              self.method_name, self.data)
+
+
+class ReplaySource:
+    """
+    回放时代替未运行的服务作为广播来源
+    """
+    disable_method = []
+
+    def __init__(self, source_type, source_name):
+        self.source_type = source_type
+        self.source_name = source_name
+
+
+class EventJournal:
+    """
+    广播日志：按顺序追加记录每一次广播（来源、方法名、冻结后的结果），并在运行结束时保存临时目录快照。
+    回放时读取日志重新广播，无需再次请求禅道或下载金山文档。
+
+    目录结构：
+        <dir>/events.journal   pickle 帧顺序追加，首帧为版本信息
+        <dir>/temp/            运行结束时临时目录的快照（结果中引用的文件）
+    结果中指向临时目录的路径记录为相对路径（见 core.utils.freeze_temp_paths），回放时还原到回放运行的临时目录
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.path = self.directory / JOURNAL_FILE_NAME
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open_for_record(cls, directory: Union[str, Path]) -> 'EventJournal':
+        journal = cls(directory)
+        journal.directory.mkdir(parents=True, exist_ok=True)
+        snapshot_dir = journal.directory / TEMP_SNAPSHOT_DIR_NAME
+        if snapshot_dir.exists():
+            shutil.rmtree(snapshot_dir)
+        journal._file = open(journal.path, "wb")
+        pickle.dump({"version": JOURNAL_VERSION}, journal._file, protocol=pickle.HIGHEST_PROTOCOL)
+        return journal
+
+    def record(self, obj, source_name, method_name, result, monitor_attr, identity_check):
+        from core.base import RunnerResult
+        if isinstance(result, RunnerResult):
+            source_type, source_name, data = result.source_type, result.source_name, result.get_data()
+        else:
+            source_type, data = getattr(obj, 'source_type', None) or str(type(obj)), result
+        data = freeze_temp_paths(data, get_base_dir())
+        event = JournalEvent(monitor_attr, identity_check, source_type, source_name, method_name, data)
+        try:
+            frame = pickle.dumps(event, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            warnings.warn(f"广播结果无法序列化，未写入日志：{source_name}.{method_name}，原因：{e}")
+            return
+        with self._lock:
+            self._file.write(frame)
+            self._file.flush()
+
+    def events(self) -> Iterator[JournalEvent]:
+        if not self.path.exists():
+            raise FileException(f"回放日志不存在：{self.path}")
+        with open(self.path, "rb") as file:
+            header = pickle.load(file)
+            if header.get("version") != JOURNAL_VERSION:
+                raise FileException(f"回放日志版本不兼容：{header}，当前版本：{JOURNAL_VERSION}")
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+
+    def snapshot_temp(self):
+        """
+        保存临时目录快照，需在 SystemContext 清理临时目录之前调用
+        """
+        base_dir = get_base_dir()
+        if base_dir.exists():
+            shutil.copytree(base_dir, self.directory / TEMP_SNAPSHOT_DIR_NAME, dirs_exist_ok=True)
+
+    def restore_temp(self):
+        snapshot_dir = self.directory / TEMP_SNAPSHOT_DIR_NAME
+        if snapshot_dir.exists():
+            shutil.copytree(snapshot_dir, get_base_dir(), dirs_exist_ok=True)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def replay_events(journal: EventJournal, plugin_pool, replay_plugins: List) -> List[str]:
+    """
+    重新广播日志中服务以及可回放插件（replayable）产生的事件，返回被回放的来源名称
+    """
+    from core.monitor import Dispatcher, STREAM_MONITOR_ATTR
+    plugin_mapping = {getattr(plugin, 'source_name', None) or plugin.__class__.__name__: plugin
+                      for plugin in replay_plugins}
+    replayed = []
+    for event in journal.events():
+        if event.monitor_attr == 'plugin_allow_monitor_functions':
+            obj = plugin_mapping.get(event.source_name)
+            if obj is None:
+                # 非回放插件的广播由其实际运行产生
+                continue
+        else:
+            obj = ReplaySource(event.source_type, event.source_name)
+        data = restore_temp_paths(event.data)
+        if event.monitor_attr == STREAM_MONITOR_ATTR:
+            item, end = data
+            Dispatcher.stream_dispatch(obj, plugin_pool, event.method_name, item, end)
+        else:
+            Dispatcher._generic_dispatch(obj, plugin_pool, event.method_name, data, event.monitor_attr,
+                                         event.identity_check)
+        if event.source_name not in replayed:
+            replayed.append(event.source_name)
+    return replayed
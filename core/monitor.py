@@ -1,11 +1,88 @@
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import weakref
 from abc import ABCMeta, ABC
-from typing import List
+from collections import deque
+from typing import List, Dict, Optional
 
+from core._config import _PluginPool as PluginPool, get_current_plugin_pool
 from core.root import SourceType
 
+# 流式广播的订阅属性，与方法监听白名单分开，不参与方法包装
+STREAM_MONITOR_ATTR = "allow_monitor_streams"
+
+# inspect.CO_COROUTINE，直接比较标志位，避免启动时导入 inspect
+_CO_COROUTINE = 0x80
+
+
+def monitored(method):
+    """
+    显式声明需要被监听的方法，未出现在任何订阅白名单中的方法也会广播
+    """
+    method.__monitored__ = True
+    return method
+
+
+def _get_source_name(obj) -> str:
+    return getattr(obj, 'source_name', None) or obj.__class__.__name__
+
+
+def _is_coroutine_function(method) -> bool:
+    return bool(getattr(getattr(method, '__code__', None), 'co_flags', 0) & _CO_COROUTINE)
+
+
+def _make_wrapper(method):
+    if _is_coroutine_function(method):
+        return _make_async_wrapper(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        plugin_pool = get_current_plugin_pool()
+        plugin_pool.dispatch_stats.record_latency(_get_source_name(self), method.__name__,
+                                                  time.perf_counter() - start)
+        if type(self).__class__ is MonitorBase:
+            Dispatcher(self, plugin_pool, method.__name__, result).notify()
+        return result
+
+    wrapper.__monitor_wrapped__ = True
+    return wrapper
+
+
+def _make_async_wrapper(method):
+    """
+    协程方法的包装：await 得到结果后再广播。订阅插件的 get_notify 为同步方法，
+    广播放到线程中执行（沿用当前上下文），避免慢插件阻塞事件循环中并发运行的其他服务；广播完成后才返回结果
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = await method(self, *args, **kwargs)
+        plugin_pool = get_current_plugin_pool()
+        plugin_pool.dispatch_stats.record_latency(_get_source_name(self), method.__name__,
+                                                  time.perf_counter() - start)
+        if type(self).__class__ is MonitorBase:
+            import asyncio
+            await asyncio.to_thread(Dispatcher(self, plugin_pool, method.__name__, result).notify)
+        return result
+
+    wrapper.__monitor_wrapped__ = True
+    return wrapper
+
 
 class MethodCallMonitor(type):
     disable_method = ["__init__", "get_notify"]
+    # 订阅白名单属性，出现在任意白名单中的方法名都会被包装
+    monitor_attrs = ("server_allow_monitor_functions", "plugin_allow_monitor_functions", "allow_monitor_functions")
+    _monitored_names = set()
+    _monitored_classes = weakref.WeakSet()
 
     def __getattr__(cls, name):
         """通过类代理访问元类属性，同时限制访问"""
@@ -14,26 +91,46 @@ class MethodCallMonitor(type):
         raise AttributeError(f"'{cls.__name__}' 不存在属性： '{name}'")
 
     def __new__(cls, name, bases, namespace):
-
+        for base in bases:
+            if base.__name__ == "ServerPlugin":
+                if '__init__' in namespace:
+                    raise TypeError(f"ServerPlugin 子类 {name} 禁止定义 __init__ 方法")
+                break
+        new_names = cls._collect_monitor_names(namespace)
         for attr_name, attr_value in namespace.items():
-            for base in bases:
-                if base.__name__ == "ServerPlugin":
-                    if '__init__' in namespace:
-                        raise TypeError(f"ServerPlugin 子类 {name} 禁止定义 __init__ 方法")
-                    break
-            if callable(attr_value):
-                def make_wrapper(method):
-                    def wrapper(self, *args, **kwargs):
-                        result = method(self, *args, **kwargs)
-                        if type(self).__class__ is MonitorBase:
-                            from core.generator import PluginPool
-                            Dispatcher(self, PluginPool.get_plugins(), method.__name__, result).notify()
-                        return result
-
-                    return wrapper
-
-                namespace[attr_name] = make_wrapper(attr_value)
-        return super().__new__(cls, name, bases, namespace)
+            if cls._need_wrap(attr_name, attr_value):
+                namespace[attr_name] = _make_wrapper(attr_value)
+        new_class = super().__new__(cls, name, bases, namespace)
+        MethodCallMonitor._monitored_classes.add(new_class)
+        if new_names:
+            # 新出现的白名单方法名，需要补充包装已创建的类
+            cls._wrap_existing_classes(new_names)
+        return new_class
+
+    @classmethod
+    def _collect_monitor_names(mcs, namespace) -> set:
+        names = set()
+        for monitor_attr in mcs.monitor_attrs:
+            names.update(namespace.get(monitor_attr, None) or ())
+        names -= MethodCallMonitor._monitored_names
+        MethodCallMonitor._monitored_names |= names
+        return names
+
+    @classmethod
+    def _need_wrap(mcs, attr_name, attr_value) -> bool:
+        if attr_name in mcs.disable_method or not callable(attr_value) or isinstance(attr_value, type):
+            return False
+        if getattr(attr_value, '__monitor_wrapped__', False):
+            return False
+        return attr_name in MethodCallMonitor._monitored_names or getattr(attr_value, '__monitored__', False)
+
+    @classmethod
+    def _wrap_existing_classes(mcs, names: set):
+        for monitored_class in list(MethodCallMonitor._monitored_classes):
+            for attr_name in names:
+                attr_value = monitored_class.__dict__.get(attr_name, None)
+                if attr_value is not None and mcs._need_wrap(attr_name, attr_value):
+                    type.__setattr__(monitored_class, attr_name, _make_wrapper(attr_value))
 
 
 class MonitorBase(MethodCallMonitor, ABCMeta):
@@ -47,6 +144,9 @@ class GenericMonitor(ABC, metaclass=MonitorBase):
 
 
 class Dispatcher:
+    """
+    广播分发器，plugin_pool 需提供 get_subscribers 订阅索引（见 core._config._global_obj._PluginPool）
+    """
 
     def __init__(self, obj, plugin_pool, method_name, result):
         self.obj = obj
@@ -107,14 +207,398 @@ class Dispatcher:
         if method_name in type(obj).disable_method:
             return False
 
-        for plugin in plugin_pool:
+        source_name = _get_source_name(obj)
+        guard = getattr(plugin_pool, 'guard', None)
+        if guard is not None and source_name in guard.suppressed:
+            # run 超时或已熔断的插件，其迟到的结果不再广播
+            return False
+        if method_name == 'run':
+            plugin_pool.record_input(source_name, result)
+        journal = getattr(plugin_pool, 'journal', None)
+        if journal is not None:
+            journal.record(obj, source_name, method_name, result, monitor_attr, identity_check)
+        data_payload = None
+        notify_batcher = None
+        deliveries = 0
+        for plugin in plugin_pool.get_subscribers(monitor_attr, method_name, source_name):
             if identity_check and plugin is obj:
                 continue
+            if data_payload is None:
+                # 仅在存在订阅者时构造一次载荷，所有订阅者共享
+                data_payload = cls.build_payload(obj, method_name, result)
+                notify_batcher = plugin_pool.notify_batcher
+            batch_size = notify_batcher.get_batch_size(plugin)
+            if batch_size is None:
+                cls.deliver(plugin_pool, plugin, data_payload)
+            else:
+                notify_batcher.add(plugin_pool, plugin, data_payload, batch_size)
+            deliveries += 1
+        plugin_pool.dispatch_stats.record_notify(source_name, method_name, deliveries)
+        return True
 
-            if hasattr(plugin, monitor_attr) and method_name in getattr(plugin, monitor_attr):
-                from core.base import RunnerResult
-                from core.base import Data
-                result = result if isinstance(result, RunnerResult) else RunnerResult(obj, result)
-                data_payload = Data(obj, result, method_name)
-                plugin.get_notify(data_payload)
+    @staticmethod
+    def has_stream_subscribers(obj, plugin_pool, stream_name) -> bool:
+        """
+        是否有插件订阅了该流（记录广播日志时也视为有订阅），无订阅时发布方可省去构造元素的开销
+        """
+        if getattr(plugin_pool, 'journal', None) is not None:
+            return True
+        return len(plugin_pool.get_subscribers(STREAM_MONITOR_ATTR, stream_name, _get_source_name(obj))) > 0
+
+    @classmethod
+    def stream_dispatch(cls, obj, plugin_pool, stream_name, item, end=False):
+        """
+        流式广播：将单个元素送达订阅了该流（allow_monitor_streams）的插件
+        """
+        source_name = _get_source_name(obj)
+        guard = getattr(plugin_pool, 'guard', None)
+        if guard is not None and source_name in guard.suppressed:
+            return False
+        journal = getattr(plugin_pool, 'journal', None)
+        if journal is not None:
+            journal.record(obj, source_name, stream_name, (item, end), STREAM_MONITOR_ATTR, False)
+        data_payload = None
+        deliveries = 0
+        for plugin in plugin_pool.get_subscribers(STREAM_MONITOR_ATTR, stream_name, source_name):
+            if data_payload is None:
+                from core.base import StreamData
+                data_payload = StreamData(obj, stream_name, item, end)
+            cls.deliver(plugin_pool, plugin, data_payload)
+            deliveries += 1
+        plugin_pool.dispatch_stats.record_notify(source_name, stream_name, deliveries)
         return True
+
+    @staticmethod
+    def build_payload(obj, method_name, result):
+        RunnerResult, Data = _get_payload_types()
+        result = result if isinstance(result, RunnerResult) else RunnerResult(obj, result)
+        return Data(obj, result, method_name)
+
+    @staticmethod
+    def deliver(plugin_pool, plugin, data_payload):
+        event_bus: Optional[EventBus] = getattr(plugin_pool, 'event_bus', None)
+        if event_bus is None:
+            guard = getattr(plugin_pool, 'guard', None)
+            delivery_lock = plugin_pool.get_delivery_lock(plugin)
+            if delivery_lock is None:
+                timed_get_notify(plugin_pool.dispatch_stats, plugin, data_payload, guard)
+            else:
+                # 并发调度时，同一插件的 get_notify 串行执行
+                with delivery_lock:
+                    timed_get_notify(plugin_pool.dispatch_stats, plugin, data_payload, guard)
+        else:
+            event_bus.publish(plugin, data_payload)
+
+
+class NotifyBatch(list):
+    """
+    同一插件缓冲的多条广播，一次性送达 get_notify_batch
+    """
+    callback_name = 'get_notify_batch'
+
+
+class NotifyBatcher:
+    """
+    批量广播：重写了 get_notify_batch 的插件，其广播按插件缓冲，累计 notify_batch_size 条
+    或到达阶段边界（PluginPool.flush_notify，如插件运行前、运行结束时）时合并为一次调用。
+    同一插件的缓冲与送达在同一把锁内完成，保证送达顺序与广播顺序一致
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._batch_sizes: Dict[int, Optional[int]] = {}
+        self._batches: Dict[int, tuple] = {}
+
+    def get_batch_size(self, plugin) -> Optional[int]:
+        """
+        插件的批量大小，None 表示插件未重写 get_notify_batch，逐条送达
+        """
+        try:
+            return self._batch_sizes[id(plugin)]
+        except KeyError:
+            get_notify_batch = getattr(type(plugin), 'get_notify_batch', None)
+            if get_notify_batch is None or getattr(get_notify_batch, '__default_notify_batch__', False):
+                batch_size = None
+            else:
+                batch_size = max(int(getattr(plugin, 'notify_batch_size', None) or 1), 1)
+            self._batch_sizes[id(plugin)] = batch_size
+            return batch_size
+
+    def _get_batch(self, plugin) -> tuple:
+        batch = self._batches.get(id(plugin))
+        if batch is None:
+            with self._lock:
+                batch = self._batches.setdefault(id(plugin), (plugin, threading.RLock(), NotifyBatch()))
+        return batch
+
+    def add(self, plugin_pool, plugin, data_payload, batch_size: int):
+        _, lock, _ = self._get_batch(plugin)
+        with lock:
+            _, _, events = self._batches[id(plugin)]
+            events.append(data_payload)
+            if len(events) >= batch_size:
+                self._deliver(plugin_pool, plugin)
+
+    def flush(self, plugin_pool, plugin=None):
+        batches = list(self._batches.values()) if plugin is None else \
+            [batch for batch in [self._batches.get(id(plugin))] if batch is not None]
+        for batch_plugin, lock, _ in batches:
+            with lock:
+                self._deliver(plugin_pool, batch_plugin)
+
+    def _deliver(self, plugin_pool, plugin):
+        # 调用方持有该插件的锁；先换出缓冲，get_notify_batch 中产生的嵌套广播写入新的缓冲
+        _, lock, events = self._batches[id(plugin)]
+        if not events:
+            return
+        self._batches[id(plugin)] = (plugin, lock, NotifyBatch())
+        Dispatcher.deliver(plugin_pool, plugin, events)
+
+
+class _PluginChannel:
+    """
+    单个插件的有序事件队列，同一时间最多只有一个线程在消费，保证插件按广播顺序接收
+    """
+
+    def __init__(self, plugin, maxsize: int):
+        self.plugin = plugin
+        self.maxsize = maxsize
+        self.events = deque()
+        self.condition = threading.Condition()
+        self.draining = False
+        self.error: Optional[BaseException] = None
+
+
+# 当前正在消费事件的 EventBus，随上下文传递到消费线程派生的线程中
+_active_event_bus: contextvars.ContextVar[Optional['EventBus']] = contextvars.ContextVar('active_event_bus',
+                                                                                         default=None)
+
+
+class EventBus:
+    """
+    异步广播模式：广播写入每个插件独立的有界队列，由线程池消费。
+    - 同一插件的事件严格按写入顺序串行处理
+    - 队列满时，服务线程会阻塞等待（背压）；消费线程内的嵌套广播不会阻塞，避免互相等待
+    - flush 为屏障，返回时所有已写入的事件均已处理完毕，并抛出插件处理时的首个异常
+    """
+
+    def __init__(self, max_queue_size: int = 64, max_workers: int = None, dispatch_stats: 'DispatchStats' = None):
+        self.dispatch_stats = dispatch_stats if dispatch_stats is not None else PluginPool.dispatch_stats
+        self.max_queue_size = max(int(max_queue_size), 1)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        from concurrent.futures import ThreadPoolExecutor
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="EventBus")
+        self._channels: Dict[int, _PluginChannel] = {}
+        self._lock = threading.Lock()
+
+    def _get_channel(self, plugin) -> _PluginChannel:
+        channel = self._channels.get(id(plugin))
+        if channel is None:
+            with self._lock:
+                channel = self._channels.setdefault(id(plugin), _PluginChannel(plugin, self.max_queue_size))
+        return channel
+
+    def publish(self, plugin, data_payload):
+        channel = self._get_channel(plugin)
+        # 消费线程内（含其中通过 copy_context 派生的线程，如 PluginGuard 的超时调用）的嵌套广播
+        in_worker = _active_event_bus.get() is self
+        with channel.condition:
+            while not in_worker and len(channel.events) >= channel.maxsize:
+                channel.condition.wait()
+            channel.events.append(data_payload)
+            if channel.draining is False:
+                channel.draining = True
+                # 消费线程需沿用发布方的运行上下文（core.context.RunContext）
+                self._executor.submit(contextvars.copy_context().run, self._drain, channel)
+
+    def _drain(self, channel: _PluginChannel):
+        token = _active_event_bus.set(self)
+        try:
+            while True:
+                with channel.condition:
+                    if not channel.events:
+                        channel.draining = False
+                        channel.condition.notify_all()
+                        return
+                    data_payload = channel.events.popleft()
+                    channel.condition.notify_all()
+                if channel.error is not None:
+                    continue
+                try:
+                    timed_get_notify(self.dispatch_stats, channel.plugin, data_payload, PluginPool.guard)
+                except BaseException as e:
+                    channel.error = e
+        finally:
+            _active_event_bus.reset(token)
+
+    def flush(self, plugin=None):
+        """
+        等待插件队列清空，不可在插件的 get_notify 中调用
+        :param plugin: 仅等待指定插件的队列，None 表示等待所有插件
+        """
+        while True:
+            channels = list(self._channels.values()) if plugin is None else \
+                [channel for channel in [self._channels.get(id(plugin))] if channel is not None]
+            pending = [channel for channel in channels if channel.draining or channel.events]
+            if not pending:
+                break
+            # 消费过程中可能产生新的嵌套广播，需反复确认直到所有队列稳定
+            for channel in pending:
+                with channel.condition:
+                    while channel.draining or channel.events:
+                        channel.condition.wait()
+        for channel in channels:
+            if channel.error is not None:
+                error, channel.error = channel.error, None
+                raise error
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_payload_types() -> tuple:
+    # core.base 导入本模块，载荷类型在首次广播时再取得，之后不再重复执行导入语句
+    from core.base import RunnerResult, Data
+    return RunnerResult, Data
+
+
+def timed_get_notify(dispatch_stats: 'DispatchStats', plugin, data_payload, guard=None):
+    if guard is not None and guard.is_guarded(plugin, 'get_notify'):
+        return guard.call(plugin, 'get_notify', _timed_get_notify, dispatch_stats, plugin, data_payload)
+    return _timed_get_notify(dispatch_stats, plugin, data_payload)
+
+
+def _timed_get_notify(dispatch_stats: 'DispatchStats', plugin, data_payload):
+    # 普通广播送达 get_notify，流式广播送达 get_stream（见载荷的 callback_name）
+    callback_name = data_payload.callback_name
+    start = time.perf_counter()
+    try:
+        return getattr(plugin, callback_name)(data_payload)
+    finally:
+        dispatch_stats.record_latency(_get_source_name(plugin), callback_name, time.perf_counter() - start)
+
+
+class LatencyHistogram:
+    """
+    耗时直方图，桶上界单位：毫秒
+    """
+    BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, float('inf'))
+    # 记录时按秒比较，省去逐次换算
+    _BUCKETS_SECONDS = tuple(upper / 1000 for upper in BUCKETS_MS)
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self, samples: List[float] = ()):
+        self.count = 0
+        # 秒
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(self.BUCKETS_MS)
+        for seconds in samples:
+            self.add(seconds)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(self._BUCKETS_SECONDS, seconds)] += 1
+
+    def merge(self, other: 'LatencyHistogram'):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.buckets = [count + other_count for count, other_count in zip(self.buckets, other.buckets)]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "avg_ms": round(self.total * 1000 / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": {("+inf" if upper == float('inf') else f"<={upper}ms"): count
+                        for upper, count in zip(self.BUCKETS_MS, self.buckets) if count}
+        }
+
+
+class DispatchStats:
+    """
+    广播统计：
+    - notifications：每个 (source_name, method_name) 产生的广播次数，以及送达的订阅者总数
+    - latency：每个来源被监听方法（含插件 run）以及插件 get_notify 的耗时直方图
+    记录时直接聚合到计数与固定分桶的直方图，内存占用只与来源数量有关，与广播次数无关。
+    每个线程聚合到各自的分片，广播热路径上无需加锁，snapshot 时再合并各分片
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # 各线程的分片：((source_name, method_name) -> [广播次数, 送达的订阅者总数],
+        #              (source_name, method_name) -> LatencyHistogram)
+        self._shards: List[tuple] = []
+
+    def _get_shard(self) -> tuple:
+        """
+        当前线程首次记录时创建分片
+        """
+        shard = ({}, {})
+        with self._lock:
+            self._local.shard = shard
+            self._shards.append(shard)
+        return shard
+
+    def record_notify(self, source_name: str, method_name: str, deliveries: int):
+        try:
+            notifications = self._local.shard[0]
+        except AttributeError:
+            notifications = self._get_shard()[0]
+        counters = notifications.get((source_name, method_name))
+        if counters is None:
+            counters = notifications[(source_name, method_name)] = [0, 0]
+        counters[0] += 1
+        counters[1] += deliveries
+
+    def record_latency(self, source_name: str, method_name: str, seconds: float):
+        try:
+            latency = self._local.shard[1]
+        except AttributeError:
+            latency = self._get_shard()[1]
+        histogram = latency.get((source_name, method_name))
+        if histogram is None:
+            histogram = latency[(source_name, method_name)] = LatencyHistogram()
+        histogram.add(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._local = threading.local()
+            self._shards = []
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            shards = list(self._shards)
+        notifications = {}
+        latency = {}
+        for shard_notifications, shard_latency in shards:
+            for key, (count, deliveries) in list(shard_notifications.items()):
+                counters = notifications.setdefault(key, [0, 0])
+                counters[0] += count
+                counters[1] += deliveries
+            for key, histogram in list(shard_latency.items()):
+                latency.setdefault(key, LatencyHistogram()).merge(histogram)
+        latency_mapping = {}
+        for (source_name, method_name), histogram in latency.items():
+            latency_mapping.setdefault(source_name, {})[method_name] = histogram.to_dict()
+        return {
+            "notifications": [
+                {"source_name": source_name, "method_name": method_name, "count": count, "deliveries": deliveries}
+                for (source_name, method_name), (count, deliveries) in notifications.items()
+            ],
+            "latency": latency_mapping
+        }
+
+    def dump(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, ensure_ascii=False, indent=2)
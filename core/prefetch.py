@@ -0,0 +1,115 @@
+import contextvars
+import threading
+from typing import Callable, Dict, Optional, Iterable
+
+_PREFETCH_SKIPPED = object()
+
+
+class _Prefetcher:
+
+    def __init__(self, name: str, func: Callable, owner: Optional[str], after: Optional[str]):
+        self.name = name
+        self.func = func
+        self.owner = owner
+        self.after = after
+
+
+# 预取任务注册表：name -> _Prefetcher，由插件模块在导入时通过 register_prefetch 注册
+_prefetchers: Dict[str, _Prefetcher] = {}
+
+
+def register_prefetch(name: str, owner: str = None, after: str = None):
+    """
+    注册预取任务，在配置解析完成后于后台线程中提前执行，与服务登录、拉取数据并行
+    :param name: 预取结果名称，使用方通过 get_prefetched(name) 获取
+    :param owner: 所属插件/服务的 source_name，本次运行未启用该插件时不预取；None 表示总是预取
+    :param after: 依赖的预取任务名称，其结果作为第二个参数传入；依赖失败或未预取时跳过
+    函数签名：func(system_parameters[, after_result])
+    """
+
+    def decorator(func):
+        _prefetchers[name] = _Prefetcher(name, func, owner, after)
+        return func
+
+    return decorator
+
+
+class PrefetchRegistry:
+    """
+    单次运行的预取结果登记处，结果以 Future 形式共享。
+    预取失败不会中断运行：get 返回 None，由使用方按原流程自行获取，错误在原位置抛出
+    """
+
+    def __init__(self):
+        self._futures: Dict[str, 'Future'] = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self, system_parameters, active_sources: Iterable[str]):
+        active_sources = set(active_sources)
+        prefetchers = [prefetcher for prefetcher in _prefetchers.values()
+                       if prefetcher.owner is None or prefetcher.owner in active_sources]
+        if not prefetchers:
+            return
+        from concurrent.futures import ThreadPoolExecutor
+        # 每个任务一个线程，依赖其他预取结果的任务在线程内等待，不会互相占满线程池
+        self._executor = ThreadPoolExecutor(max_workers=len(prefetchers), thread_name_prefix="Prefetch")
+        with self._lock:
+            for prefetcher in prefetchers:
+                self._futures[prefetcher.name] = self._executor.submit(
+                    contextvars.copy_context().run, self._execute, prefetcher, system_parameters)
+
+    def _execute(self, prefetcher: _Prefetcher, system_parameters):
+        if prefetcher.after is None:
+            return prefetcher.func(system_parameters)
+        after_result = self.get(prefetcher.after)
+        if after_result is None:
+            return _PREFETCH_SKIPPED
+        return prefetcher.func(system_parameters, after_result)
+
+    def get(self, name: str, timeout: float = None):
+        """
+        等待并返回预取结果，未预取、已跳过或预取失败时返回 None
+        """
+        future = self._futures.get(name)
+        if future is None:
+            return None
+        try:
+            result = future.result(timeout)
+        except BaseException:
+            return None
+        return None if result is _PREFETCH_SKIPPED else result
+
+    def wait(self, name: str, timeout: float = None):
+        """
+        等待预取任务结束（无论成功与否），避免使用方与预取同时写入同一文件
+        """
+        self.get(name, timeout)
+
+    def close(self):
+        """
+        需在临时目录清理之前调用，未开始的任务直接取消
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _get_registry() -> Optional[PrefetchRegistry]:
+    from core.context import get_current_context
+    context = get_current_context()
+    return None if context is None else context.prefetch
+
+
+def get_prefetched(name: str):
+    """
+    获取当前运行中的预取结果，不在运行中（如子进程）、未预取或失败时返回 None
+    """
+    registry = _get_registry()
+    return None if registry is None else registry.get(name)
+
+
+def wait_prefetch(name: str):
+    registry = _get_registry()
+    if registry is not None:
+        registry.wait(name)
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from typing import Dict, List, Union
+
+from core._config import _PluginPool as PluginPool, _GlobalData as GlobalData
+from core.monitor import Dispatcher
+from core.root import get_base_dir, _current_temp_dir
+
+
+def _initialize_worker(system_parameters, temp_dir, shared_memory_name=None):
+    # 子进程不在运行上下文中，使用进程默认对象承载主进程当前运行的参数与临时目录
+    GlobalData.system_parameters = system_parameters
+    if shared_memory_name is not None:
+        # 主进程的全局数据位于共享内存，子进程只读附加，读取时无需进程间通信
+        GlobalData.attach_shared_memory(shared_memory_name)
+    PluginPool.set_include_inner_plugin(False)
+    _current_temp_dir.set(temp_dir)
+
+
+def _run_plugin(plugin):
+    """
+    子进程内执行插件的原始 run（不经过监听包装），广播由主进程在拿到结果后统一发出
+    """
+    # 反序列化插件时导入的模块可能通过 inner_plugin 注册了插件，子进程内不需要任何订阅者
+    PluginPool.set_plugins([])
+    run = type(plugin).run
+    run = getattr(run, '__wrapped__', run)
+    return run(plugin)
+
+
+class PluginProcessPool:
+    """
+    插件进程池：将 CPU 密集型插件的 run 放到独立进程中执行，绕开 GIL。
+    - 插件实例（含 get_notify 收集到的状态）与 GlobalData.system_parameters 通过 pickle 传入子进程
+    - DynamicFreezeObject / RunnerResult 以紧凑的普通结构跨进程传递（见各自的 __reduce__）
+    - 子进程返回结果后，由主进程以插件身份走正常的 Dispatcher 广播
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Union['ProcessPoolExecutor', None] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[int, tuple] = {}
+
+    @staticmethod
+    def is_process_plugin(plugin, process_plugins: List[str] = None) -> bool:
+        source_name = getattr(plugin, 'source_name', None) or plugin.__class__.__name__
+        return bool(getattr(plugin, 'run_in_process', False)) or source_name in (process_plugins or [])
+
+    def _get_executor(self) -> 'ProcessPoolExecutor':
+        with self._lock:
+            if self._executor is None:
+                # multiprocessing 导入较重，仅在确实有插件需要子进程执行时加载
+                from concurrent.futures import ProcessPoolExecutor
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initialize_worker,
+                                                     initargs=(GlobalData.system_parameters, get_base_dir(),
+                                                               GlobalData.shared_memory_name))
+            return self._executor
+
+    def run(self, plugin):
+        """
+        在子进程中执行插件并等待结果，可在多个调度线程中并发调用
+        """
+        start = time.perf_counter()
+        result = self._get_executor().submit(_run_plugin, plugin).result()
+        PluginPool.dispatch_stats.record_latency(
+            getattr(plugin, 'source_name', None) or plugin.__class__.__name__, 'run', time.perf_counter() - start)
+        Dispatcher(plugin, PluginPool, 'run', result).notify()
+        return result
+
+    def submit(self, plugin) -> 'Future':
+        future = self._get_executor().submit(_run_plugin, plugin)
+        self._pending[id(plugin)] = (plugin, future, time.perf_counter())
+        return future
+
+    def is_pending(self, plugin) -> bool:
+        return id(plugin) in self._pending
+
+    def wait(self, plugin):
+        """
+        等待插件在子进程中执行完毕，并以该插件的身份广播 run 的结果
+        """
+        plugin, future, start = self._pending.pop(id(plugin))
+        result = future.result()
+        PluginPool.dispatch_stats.record_latency(
+            getattr(plugin, 'source_name', None) or plugin.__class__.__name__, 'run', time.perf_counter() - start)
+        Dispatcher(plugin, PluginPool, 'run', result).notify()
+        return result
+
+    def wait_all(self):
+        for plugin in self.pending_plugins():
+            self.wait(plugin)
+
+    def pending_plugins(self) -> List:
+        return [plugin for plugin, _, _ in list(self._pending.values())]
+
+    def depends_on_pending(self, plugin) -> bool:
+        """
+        插件是否订阅了仍在子进程中运行的插件的 run，是则需要先等待其结果
+        """
+        for pending_plugin, _, _ in self._pending.values():
+            source_name = getattr(pending_plugin, 'source_name', None) or pending_plugin.__class__.__name__
+            if plugin in PluginPool.get_subscribers('plugin_allow_monitor_functions', 'run', source_name):
+                return True
+        return False
+
+    def close(self, wait: bool = True):
+        """
+        :param wait: 是否等待子进程中正在执行的插件结束，存在超时的插件时不再等待
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+        self._pending = {}
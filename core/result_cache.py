@@ -0,0 +1,241 @@
+import functools
+import os
+import pickle
+import shutil
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Union, Optional, List
+
+from core.root import BASE_DIR, get_base_dir
+from core.utils import content_hash, freeze_temp_paths, restore_temp_paths
+
+RESULT_FILE_NAME = "result.pickle"
+FILES_DIR_NAME = "files"
+CACHE_VERSION = 1
+_MISSING = object()
+
+
+def get_default_cache_dir() -> Path:
+    # 位于 core/temp 之外，不受 SystemContext 清理影响
+    return Path(BASE_DIR) / "core" / "cache"
+
+
+class ResultCache:
+    """
+    run 结果的磁盘缓存，每条缓存一个目录：
+        <dir>/<key>/result.pickle   (版本, 写入时间, 结果)
+        <dir>/<key>/files/          结果中引用的临时目录文件（如 BUG 文件）
+    过期的缓存在读取时删除；写入后总大小超过 max_size 时按最近访问时间淘汰（LRU）
+    """
+
+    def __init__(self, directory: Union[str, Path] = None, max_size: int = 256 * 1024 * 1024):
+        self.directory = Path(directory) if directory else get_default_cache_dir()
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, ttl: Optional[float] = None):
+        """
+        读取缓存，未命中或写入已超过 ttl 秒时返回 _MISSING
+        """
+        entry_dir = self.directory / key
+        result_path = entry_dir / RESULT_FILE_NAME
+        try:
+            with open(result_path, "rb") as file:
+                version, created, result = pickle.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return _MISSING
+        except Exception as e:
+            warnings.warn(f"结果缓存无法读取，已忽略：{entry_dir}，原因：{e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            self.misses += 1
+            return _MISSING
+        if version != CACHE_VERSION or (ttl is not None and time.time() - created > ttl):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            self.misses += 1
+            return _MISSING
+        files_dir = entry_dir / FILES_DIR_NAME
+        try:
+            if files_dir.exists():
+                shutil.copytree(files_dir, get_base_dir(), dirs_exist_ok=True)
+        except OSError as e:
+            # 缓存的文件已被其他运行淘汰或临时目录不可写，按未命中处理
+            warnings.warn(f"结果缓存的文件无法恢复，已忽略：{entry_dir}，原因：{e}")
+            self.misses += 1
+            return _MISSING
+        try:
+            # 访问时间用于 LRU 淘汰
+            os.utime(result_path)
+        except OSError:
+            # 其他运行正在淘汰该缓存，结果已读取，不影响本次命中
+            pass
+        self.hits += 1
+        return restore_temp_paths(result)
+
+    def set(self, key: str, result):
+        """
+        写入缓存，磁盘已满、目录只读等写入失败时仅警告，不影响本次 run 的结果
+        """
+        base_dir = get_base_dir()
+        files = []
+        frozen = freeze_temp_paths(result, base_dir, files)
+        try:
+            frame = pickle.dumps((CACHE_VERSION, time.time(), frozen), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            warnings.warn(f"run 结果无法序列化，未写入缓存：{key}，原因：{e}")
+            return
+        # 先写入临时目录再改名，避免并发运行读到写了一半的缓存
+        staging_dir = self.directory / f".{key}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            for relative_path in files:
+                target = staging_dir / FILES_DIR_NAME / relative_path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(base_dir / relative_path, target)
+            (staging_dir / RESULT_FILE_NAME).write_bytes(frame)
+        except OSError as e:
+            warnings.warn(f"run 结果无法写入缓存：{key}，原因：{e}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+        entry_dir = self.directory / key
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        try:
+            os.replace(staging_dir, entry_dir)
+        except OSError:
+            # 其他运行已写入相同的缓存
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        try:
+            self.evict()
+        except OSError as e:
+            warnings.warn(f"结果缓存淘汰失败：{self.directory}，原因：{e}")
+
+    def evict(self):
+        """
+        总大小超过 max_size 时删除最久未访问的缓存
+        """
+        with self._lock:
+            entries = []
+            total_size = 0
+            for entry_dir in self.directory.iterdir():
+                result_path = entry_dir / RESULT_FILE_NAME
+                if entry_dir.name.startswith(".") or not result_path.exists():
+                    continue
+                try:
+                    size = sum(path.stat().st_size for path in entry_dir.rglob("*") if path.is_file())
+                    entries.append((result_path.stat().st_mtime, size, entry_dir))
+                except OSError:
+                    # 其他运行正在淘汰该缓存
+                    continue
+                total_size += size
+            for _, size, entry_dir in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total_size -= size
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    按当前运行的系统参数获取结果缓存，--result_cache 2 时返回 None
+    """
+    from core._config import get_current_global_data
+    system_parameters = get_current_global_data().system_parameters
+    if system_parameters is not None and system_parameters.result_cache is False:
+        return None
+    directory = getattr(system_parameters, 'result_cache_dir', None) or get_default_cache_dir()
+    max_size = getattr(system_parameters, 'result_cache_size', None) or 256
+    cache_key = (str(directory), max_size)
+    cache = _caches.get(cache_key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(cache_key, ResultCache(directory, int(max_size) * 1024 * 1024))
+    return cache
+
+
+def get_fingerprint(obj, method_name: str, args, kwargs, inputs, system_parameter_names: List[str] = None) \
+        -> Optional[str]:
+    """
+    缓存键：类、方法、Parameter 对象的属性、系统参数、调用参数以及声明的输入结果的内容哈希（见 core.utils.content_hash），
+    含有无法计算内容哈希的值时返回 None（不使用缓存）
+    :param system_parameter_names: 参与缓存键的系统参数名，None 表示全部系统参数
+    """
+    from core._config import get_current_plugin_pool
+    parameter = getattr(obj, 'parameter', None)
+    system_parameter = getattr(obj, 'system_parameter', None) or {}
+    if system_parameter_names is not None:
+        system_parameter = {name: system_parameter.get(name) for name in system_parameter_names}
+    plugin_pool = get_current_plugin_pool()
+    try:
+        return content_hash((
+            type(obj).__module__, type(obj).__qualname__, method_name,
+            vars(parameter) if parameter is not None else None,
+            system_parameter, args, kwargs,
+            # 输入结果通常为 DynamicFreezeObject，单独计算以复用其缓存的哈希
+            [(source_name, content_hash(plugin_pool.get_input(source_name))) for source_name in inputs],
+        ))
+    except TypeError:
+        return None
+
+
+def cached_run(ttl: Optional[float] = 300, inputs: List[str] = None, streams: List[str] = None,
+               system_parameters: List[str] = None):
+    """
+    缓存 run 的结果：Parameter 对象、系统参数、调用参数与输入结果均相同且未超过 ttl（秒）时直接返回缓存，不再执行 run。
+    结果中引用的临时目录文件会一并缓存，命中时复制到当前运行的临时目录。
+    缓存位于 core/cache（--result_cache_dir），不受临时目录清理影响；--result_cache 2 关闭缓存
+    :param ttl: 有效期（秒），None 表示不过期
+    :param inputs: 参与缓存键的输入来源 source_name，默认取插件的 required_inputs
+    :param streams: run 中发布的流，有插件订阅时不使用缓存，保证订阅方能逐项收到元素
+    :param system_parameters: run 中读取的系统参数名（self.system_parameter 的键），默认全部系统参数参与缓存键
+    """
+
+    def decorator(func):
+
+        def get_key(self, args, kwargs):
+            if any(self.has_stream_subscribers(stream_name) for stream_name in streams or ()):
+                return None
+            source_names = inputs if inputs is not None else \
+                [required.partition('.')[0] for required in getattr(self, 'required_inputs', None) or ()]
+            return get_fingerprint(self, func.__name__, args, kwargs, source_names, system_parameters)
+
+        if func.__code__.co_flags & 0x80:
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                cache = get_result_cache()
+                key = get_key(self, args, kwargs) if cache is not None else None
+                if key is None:
+                    return await func(self, *args, **kwargs)
+                result = cache.get(key, ttl)
+                if result is _MISSING:
+                    result = await func(self, *args, **kwargs)
+                    cache.set(key, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = get_result_cache()
+            key = get_key(self, args, kwargs) if cache is not None else None
+            if key is None:
+                return func(self, *args, **kwargs)
+            result = cache.get(key, ttl)
+            if result is _MISSING:
+                result = func(self, *args, **kwargs)
+                cache.set(key, result)
+            return result
+
+        return wrapper
+
+    return decorator
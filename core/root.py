@@ -1,4 +1,5 @@
 import os
+from contextvars import ContextVar
 from enum import Enum
 from pathlib import Path
 
@@ -11,5 +12,14 @@ class SourceType(str, Enum):
     CUSTOMER = "customer"
 
 
-def get_base_dir() -> Path:
+# 当前运行上下文的临时目录，None 表示使用共享的 core/temp（见 core.context.RunContext）
+_current_temp_dir: ContextVar[Path | None] = ContextVar('temp_dir', default=None)
+
+
+def get_temp_root() -> Path:
     return Path(BASE_DIR) / "core" / "temp"
+
+
+def get_base_dir() -> Path:
+    temp_dir = _current_temp_dir.get()
+    return get_temp_root() if temp_dir is None else temp_dir
@@ -0,0 +1,78 @@
+import contextvars
+from typing import Callable, Dict, List, Iterable, Union
+
+from core._config._exception import SystemParameterException
+
+
+class _Node:
+
+    def __init__(self, name: str, action: Callable, depends_on: Iterable[str]):
+        self.name = name
+        self.action = action
+        self.depends_on: List[str] = list(depends_on)
+
+
+class DagScheduler:
+    """
+    依赖图调度器：每个节点（服务或插件）在其依赖的节点全部完成后立即提交到线程池执行，
+    整体耗时由各阶段之和降为最长依赖链。依赖中不存在于图内的名称会被忽略（例如被关闭的内置服务）。
+    任一节点异常后不再提交新节点，等待已运行节点结束后抛出首个异常。
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, _Node] = {}
+
+    def add(self, name: str, action: Callable, depends_on: Iterable[str] = ()):
+        if name in self.nodes:
+            raise SystemParameterException(f"调度节点重复：{name}")
+        self.nodes[name] = _Node(name, action, depends_on)
+
+    def _resolve(self) -> Dict[str, List[str]]:
+        dependencies = {name: [dep for dep in node.depends_on if dep in self.nodes and dep != name]
+                        for name, node in self.nodes.items()}
+        # 检查环：按入度逐层剥离，剩余节点即成环
+        remaining = {name: set(deps) for name, deps in dependencies.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise SystemParameterException(f"调度节点存在循环依赖：{sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return dependencies
+
+    def run(self):
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        dependencies = self._resolve()
+        waiting = {name: set(deps) for name, deps in dependencies.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for name, deps in dependencies.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        running: Dict['Future', str] = {}
+        error: Union[BaseException, None] = None
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="DagScheduler") as executor:
+            def submit_ready():
+                for name in [name for name, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    # 节点在线程池中执行，需沿用调度方的运行上下文（core.context.RunContext）
+                    running[executor.submit(contextvars.copy_context().run, self.nodes[name].action)] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    exception = future.exception()
+                    if exception is not None:
+                        error = error or exception
+                        continue
+                    for dependent in dependents[name]:
+                        if dependent in waiting:
+                            waiting[dependent].discard(name)
+                if error is None:
+                    submit_ready()
+        if error is not None:
+            raise error
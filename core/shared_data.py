@@ -0,0 +1,182 @@
+import pickle
+import struct
+import threading
+import uuid
+from typing import Dict, Optional, Tuple
+
+# 头部段布局：序号（8 字节，写入期间为奇数，为版本号的两倍）+ 索引段名称长度（2 字节）+ 索引段名称
+_HEADER_FORMAT = "<QH"
+_HEADER_SIZE = 256
+_NAME_OFFSET = struct.calcsize(_HEADER_FORMAT)
+
+
+def _create_segment(payload: bytes) -> 'SharedMemory':
+    from multiprocessing.shared_memory import SharedMemory
+    segment = SharedMemory(name=f"gd_{uuid.uuid4().hex[:16]}", create=True, size=max(len(payload), 1))
+    segment.buf[:len(payload)] = payload
+    return segment
+
+
+def _attach_segment(name: str) -> 'SharedMemory':
+    # 进程池子进程与主进程共用同一个资源追踪器，附加时的重复登记不会导致段被提前删除，
+    # 段的释放统一由创建方 unlink 完成
+    from multiprocessing.shared_memory import SharedMemory
+    return SharedMemory(name=name)
+
+
+class SharedMemoryStore:
+    """
+    基于 multiprocessing.shared_memory 的只写一次、多处读取的键值存储，供 GlobalData 跨进程共享：
+    - 每个值序列化一次写入独立的共享内存段，索引段记录 键 -> (段名称, 字节数)，头部段记录版本号与当前索引段
+    - 写入方（创建者）更新时先写新段，再以奇偶序号（seqlock）切换头部，旧段随后释放
+    - 读取方从共享内存反序列化，按版本号缓存，版本未变化时读取不产生任何复制或进程间通信
+    读取并非零复制：每个进程首次读取某个版本的值时都会完整反序列化一次（pickle.loads），值的内存在各进程中各有一份，
+    共享内存省去的是写入方逐个进程发送数据与重复序列化的开销，适合读多写少、值不大的全局数据。
+    读取到的值在同一进程内共享，应视为只读
+    """
+
+    def __init__(self, name: str = None):
+        self._lock = threading.Lock()
+        self.owner = name is None
+        self._header = _create_segment(bytes(_HEADER_SIZE)) if self.owner else _attach_segment(name)
+        self.name = self._header.name
+        # 写入方：键 -> 值所在的段；当前索引段
+        self._segments: Dict[str, 'SharedMemory'] = {}
+        self._index_segment: Optional['SharedMemory'] = None
+        # 读取缓存：序号、索引、已反序列化的值（键 -> (段名称, 值)）
+        self._cached_sequence = -1
+        self._index: Dict[str, Tuple[str, int]] = {}
+        self._values: Dict[str, tuple] = {}
+
+    def _get_sequence(self) -> int:
+        return struct.unpack_from("<Q", self._header.buf, 0)[0]
+
+    @property
+    def version(self) -> int:
+        return self._get_sequence() // 2
+
+    def update(self, items: Dict, version: int, replace: bool = False):
+        """
+        写入多个键值并将版本号设为 version，replace 为 True 时丢弃未包含的键
+        """
+        if not self.owner:
+            raise PermissionError("共享全局数据仅允许创建方写入")
+        with self._lock:
+            released = list(self._segments.values()) if replace else []
+            segments = {} if replace else dict(self._segments)
+            for key, value in items.items():
+                if key in segments and not replace:
+                    released.append(segments[key])
+                segments[key] = _create_segment(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+            index = {key: (segment.name, segment.size) for key, segment in segments.items()}
+            index_segment = _create_segment(pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+            if self._index_segment is not None:
+                released.append(self._index_segment)
+            self._publish(index_segment, version)
+            self._segments, self._index_segment = segments, index_segment
+            for segment in released:
+                segment.close()
+                segment.unlink()
+
+    def _publish(self, index_segment: 'SharedMemory', version: int):
+        buf = self._header.buf
+        name = index_segment.name.encode()
+        struct.pack_into(_HEADER_FORMAT, buf, 0, self._get_sequence() | 1, len(name))
+        buf[_NAME_OFFSET:_NAME_OFFSET + len(name)] = name
+        struct.pack_into("<Q", buf, 0, version * 2)
+
+    def _refresh(self):
+        """
+        版本变化时重新读取索引，未变化的段沿用已反序列化的值
+        """
+        while True:
+            sequence = self._get_sequence()
+            if sequence == self._cached_sequence:
+                return
+            if sequence % 2:
+                continue
+            _, length = struct.unpack_from(_HEADER_FORMAT, self._header.buf, 0)
+            if length == 0:
+                index = {}
+            else:
+                index_name = bytes(self._header.buf[_NAME_OFFSET:_NAME_OFFSET + length]).decode()
+                try:
+                    index = self._load(index_name)
+                except FileNotFoundError:
+                    # 读取期间写入方已切换索引
+                    continue
+            if self._get_sequence() == sequence:
+                self._index = index
+                self._values = {key: value for key, value in self._values.items()
+                                if key in index and index[key][0] == value[0]}
+                self._cached_sequence = sequence
+                return
+
+    def _load(self, name: str):
+        if self.owner:
+            # 创建方直接读取自己持有的段
+            own_segments = {segment.name: segment for segment in self._segments.values()}
+            if self._index_segment is not None:
+                own_segments[self._index_segment.name] = self._index_segment
+            if name not in own_segments:
+                raise FileNotFoundError(name)
+            return pickle.loads(own_segments[name].buf)
+        segment = _attach_segment(name)
+        try:
+            return pickle.loads(segment.buf)
+        finally:
+            segment.close()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            while True:
+                self._refresh()
+                if key not in self._index:
+                    return default
+                cached = self._values.get(key)
+                if cached is not None:
+                    return cached[1]
+                segment_name, _ = self._index[key]
+                try:
+                    value = self._load(segment_name)
+                except FileNotFoundError:
+                    continue
+                self._values[key] = (segment_name, value)
+                return value
+
+    def snapshot(self) -> Tuple[Dict, int]:
+        """
+        返回全部键值及其版本号
+        """
+        with self._lock:
+            while True:
+                self._refresh()
+                sequence = self._cached_sequence
+                values = {}
+                for key, (segment_name, _) in self._index.items():
+                    cached = self._values.get(key)
+                    if cached is None:
+                        try:
+                            cached = (segment_name, self._load(segment_name))
+                        except FileNotFoundError:
+                            break
+                        self._values[key] = cached
+                    values[key] = cached[1]
+                else:
+                    return values, sequence // 2
+
+    def close(self):
+        """
+        创建方关闭时释放所有共享内存段
+        """
+        with self._lock:
+            segments = list(self._segments.values())
+            if self._index_segment is not None:
+                segments.append(self._index_segment)
+            self._segments, self._index_segment = {}, None
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+            self._header.close()
+            if self.owner:
+                self._header.unlink()
@@ -4,6 +4,7 @@ from urllib.parse import urlparse
 
 from core._config import _const
 from core._config._exception import ModuleNotFoundException
+from core.prefetch import wait_prefetch
 from core.root import BASE_DIR
 from core.tooller.async_server import AsyncServerController, DownloadServerType
 
@@ -94,6 +95,12 @@ def generator_icon_picture(
 
 
 def get_font_path_by_remote() -> Path:
+    # 字体可能正在后台预取（见 inner_plugins.report_plugin），等待其结束避免重复下载同一文件
+    wait_prefetch("remote_font")
+    return download_remote_font()
+
+
+def download_remote_font() -> Path:
     def get_filename_func(url: str, *args) -> str:
         path = urlparse(url).path
         return os.path.basename(path)
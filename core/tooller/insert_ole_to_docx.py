@@ -10,6 +10,7 @@ import lxml
 
 from docx import Document
 
+from core.prefetch import wait_prefetch
 from core.root import BASE_DIR, get_base_dir
 from core.tooller._gen_pic import generator_icon_picture
 from core.tooller._gen_bin_file import create_bin_with_padding, generate_bin_file
@@ -96,6 +97,8 @@ class DocxOleEmbedderController:
         return self
 
     def action(self):
+        # OLE 模板可能正在后台预取（见 inner_plugins.report_plugin），等待其结束后只补齐缺少的模板
+        wait_prefetch("ole_templates")
         generate_bin_file([item for sublist in self.insert_mapping.values() for item in sublist], OLE_TEMPLATE_DIR)
         for search_string, file_path_list in self.insert_mapping.items():
             self.save_file_count = 0
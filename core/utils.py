@@ -1,15 +1,11 @@
 import functools
 import threading
 
-import requests
 from collections import defaultdict
 from collections.abc import Mapping
 from enum import Enum
-from typing import Union, List, Callable
+from typing import Union, List, Callable, Iterator
 
-import yaml
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 from core._config import _const
 from core._config._exception import HttpConfigException, ModuleNotFoundException, SystemParameterException
 from urllib.parse import urljoin
@@ -37,16 +33,22 @@ class HttpProtocolEnum(str, Enum):
     HTTPS = "https://"
 
 
-retries = Retry(
-    total=3,
-    backoff_factor=1,
-)
+@functools.lru_cache(maxsize=None)
+def _get_retries():
+    from urllib3 import Retry
+    return Retry(
+        total=3,
+        backoff_factor=1,
+    )
 
 
 class Sender:
 
     def __init__(self, domain=None, protocol=HttpProtocolEnum.HTTP):
-        adapter = HTTPAdapter(max_retries=retries)
+        # requests 在首次创建 Sender 时才导入，避免拖慢 --help 等不发请求的命令
+        import requests
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(max_retries=_get_retries())
         self.session = requests.Session()
         [self.session.mount(proxy, adapter) for proxy in _const.HTTP_CONFIG.adapters]
         self._method = HttpMethodEnum.GET
@@ -164,7 +166,7 @@ class Sender:
 
     def send(self, method=None, domain=None, path=None, params=None, data=None, json=None, headers=None,
              protocol=None, stream=False, filter_callback: Union[Callable[[dict], List]] = None,
-             target: str = None) -> Union[requests.models.Response, List]:
+             target: str = None) -> Union['requests.models.Response', List]:
         self.method = method or self._method
         self.domain = domain or self.domain
         self.path = path or self.path
@@ -178,16 +180,30 @@ class Sender:
                                            json=self.json,
                                            headers=self.headers, stream=stream)
         if self.stream and filter_callback is not None and target is not None:
-            self.result.raw.decode_content = True
-            try:
-                import ijson
-            except ModuleNotFoundError as e:
-                raise ModuleNotFoundException(
-                    _const.EXCEPTION.Module_Not_Found_Exception % ('ijson', 'pip install ijson==3.3.0', str(e),))
-            bugs_generator = ijson.items(self.result.raw, target)
-            return [bug for bug in bugs_generator if filter_callback(bug)]
+            return [bug for bug in self._iter_items(target) if filter_callback(bug)]
         return self.result
 
+    def send_iter(self, target: str, method=None, domain=None, path=None, params=None, data=None, json=None,
+                  headers=None, protocol=None) -> Iterator:
+        """
+        流式请求：边接收响应体边解析，逐项返回 target 指向的 JSON 元素，内存占用与响应大小无关
+        :param target: ijson 路径，如：bugs.item
+        """
+        self.send(method, domain, path, params, data, json, headers, protocol, stream=True)
+        try:
+            yield from self._iter_items(target)
+        finally:
+            self.result.close()
+
+    def _iter_items(self, target: str) -> Iterator:
+        self.result.raw.decode_content = True
+        try:
+            import ijson
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundException(
+                _const.EXCEPTION.Module_Not_Found_Exception % ('ijson', 'pip install ijson==3.3.0', str(e),))
+        return ijson.items(self.result.raw, target)
+
 
 class HiddenDefaultDict(defaultdict):
     def __init__(self, default_factory=None, callback=None):
@@ -249,13 +265,13 @@ def help_info():
     print(title + "\n\n".join(main_content))
 
 
+_object_setattr = object.__setattr__
+_object_getattribute = object.__getattribute__
+
+
 class RunnerParameter:
 
     def __init__(self, args: list):
-        if "--info" in args:
-            info_path = args.index("--info") + 1
-            self.args_mapping = self.get_yaml_info(args[info_path])
-            return
         self.args_mapping = {}
         i = 0
         while i < len(args):
@@ -267,8 +283,16 @@ class RunnerParameter:
                     i += 2
                     continue
             i += 1
+        if "--info" in args:
+            # 配置文件为主，命令行中的其他参数（如 --record）覆盖配置文件
+            command_args = self.args_mapping
+            command_args.pop("info", None)
+            info_path = args.index("--info") + 1
+            self.args_mapping = self.get_yaml_info(args[info_path])
+            self.args_mapping.update(command_args)
 
     def get_yaml_info(self, path):
+        import yaml
         with open(path, "r") as file:
             file_data: dict = yaml.safe_load(file)
             check_result = self.check_yaml_parameter(file_data)
@@ -304,64 +328,145 @@ class RunnerParameter:
 
 
 class DynamicFreezeObject(Mapping):
+    """
+    只读视图：包装原始数据而不复制，嵌套的 dict / list 在首次访问时才冻结（dict 转为 DynamicFreezeObject，
+    list 转为 tuple）并缓存。构造后请勿再修改传入的嵌套数据。
+    内容相同的对象哈希值相同（见 content_hash），可直接用作字典键或缓存键。
+    哈希在首次计算后缓存，只应对自身独占的数据（如 GlobalData 中的快照、run 返回后不再修改的结果）计算哈希
+    """
+    __slots__ = ('_data', '_frozen', '_digest')
+
+    def __init__(self, *args, **kwargs):
+        # 关键字参数的键必定是字符串，kwargs 本身即为新的字典，无需再复制
+        _object_setattr(self, '_data', kwargs)
+        _object_setattr(self, '_frozen', None)
+        _object_setattr(self, '_digest', None)
+
+    @classmethod
+    def _view(cls, mapping: dict) -> 'DynamicFreezeObject':
+        """
+        包装已有的字典，键均为字符串时不复制
+        """
+        obj = cls.__new__(cls)
+        if not all(type(key) is str for key in mapping):
+            # 确保键是字符串
+            mapping = {str(key): value for key, value in mapping.items()}
+        _object_setattr(obj, '_data', mapping)
+        _object_setattr(obj, '_frozen', None)
+        _object_setattr(obj, '_digest', None)
+        return obj
+
+    def _replace(self, key: str, value) -> 'DynamicFreezeObject':
+        """
+        返回替换（或新增）一个键后的新对象，其余键的原始数据与已冻结的值均与本对象共享，不会重新冻结
+        """
+        key = key if type(key) is str else str(key)
+        data = self._data.copy()
+        data[key] = value
+        frozen = self._frozen
+        if frozen is not None:
+            frozen = frozen.copy()
+            frozen.pop(key, None)
+        obj = DynamicFreezeObject.__new__(DynamicFreezeObject)
+        _object_setattr(obj, '_data', data)
+        _object_setattr(obj, '_frozen', frozen)
+        _object_setattr(obj, '_digest', None)
+        return obj
+
+    def _get(self, key: str):
+        frozen = self._frozen
+        if frozen is not None and key in frozen:
+            return frozen[key]
+        value = self._data[key]
+        if isinstance(value, (dict, list)):
+            value = freeze(value)
+            if frozen is None:
+                frozen = {}
+                _object_setattr(self, '_frozen', frozen)
+            frozen[key] = value
+        return value
+
     def __getitem__(self, key):
-        str_key = str(key)
-        if str_key in self.__dict__:
-            return self.__dict__[str_key]
-        else:
-            raise KeyError(f"Key '{key}' not found")
+        str_key = key if type(key) is str else str(key)
+        try:
+            value = self._data[str_key]
+        except KeyError:
+            raise KeyError(f"Key '{key}' not found") from None
+        # 标量直接返回，只有 dict / list 需要冻结
+        if isinstance(value, (dict, list)):
+            return self._get(str_key)
+        return value
+
+    def __contains__(self, key):
+        return str(key) in self._data
 
     def __len__(self):
-        return len(self.__dict__)
+        return len(self._data)
 
     def __iter__(self):
-        for key, value in self.__dict__.items():
+        for key in self._data:
+            value = self._get(key)
             if isinstance(value, DynamicFreezeObject):
                 yield key, dict(value)
             else:
                 yield key, value
 
-    def __init__(self, *args, **kwargs):
-        def process_value(value):
-            # 递归处理字典：转换键为字符串，并递归处理值
-            if isinstance(value, dict):
-                sanitized = {str(k): process_value(v) for k, v in value.items()}
-                return DynamicFreezeObject(**sanitized)
-            # 递归处理列表：转换为元组，并递归处理每个元素
-            elif isinstance(value, list):
-                return tuple(process_value(item) for item in value)
-            # 其他类型直接返回
-            else:
-                return value
+    __annotations__ = {}
 
-        for key, value in kwargs.items():
-            # 确保键是字符串
-            str_key = str(key) if not isinstance(key, str) else key
-            # 递归处理值并赋值给实例属性
-            self.__dict__[str_key] = process_value(value)
+    def __reduce__(self):
+        # 直接序列化包装的原始数据，不复制、不冻结，还原时同样只包装不复制
+        return _restore_dynamic_freeze_object, (self._data,)
 
-    __annotations__ = {}
+    def __hash__(self):
+        return int.from_bytes(self._get_digest()[:8], 'little')
+
+    def _get_digest(self) -> bytes:
+        digest = self._digest
+        if digest is None:
+            digest = _get_content_digest(self)
+            _object_setattr(self, '_digest', digest)
+        return digest
+
+    def content_hash(self) -> str:
+        """
+        稳定的内容哈希（十六进制），只取决于内容，与键的顺序、进程及 PYTHONHASHSEED 无关；
+        list 与 tuple、数值相等的 int 与 float 视为相同，与 == 的结果一致。
+        支持 str、数值、None、bytes、dict、list / tuple、set 以及 datetime、Decimal、Path、UUID、Enum 等值类型，
+        其他类型抛出 TypeError。结果会缓存，计算后包装的数据不可再被修改
+        """
+        return self._get_digest().hex()
+
+    def to_bytes(self) -> bytes:
+        """
+        二进制序列化，用 DynamicFreezeObject.from_bytes 还原
+        """
+        import pickle
+        return pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'DynamicFreezeObject':
+        import pickle
+        value = pickle.loads(data)
+        if not isinstance(value, cls):
+            raise TypeError(f"数据不是 {cls.__name__} 的序列化结果：{type(value).__name__}")
+        return value
 
     def __getattr__(self, name: str):
+        data = _object_getattribute(self, '_data')
+        if name in data:
+            return self._get(name)
         raise AttributeError(f"{self.__class__.__name__} 没有属性 '{name}'")
 
     def __repr__(self):
-        return str(self.__dict__)
+        return str(dict(self.items()))
 
     def __setattr__(self, name, value):
-        if getattr(self, '_initialized', False):
-            raise AttributeError(
-                f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
-        else:
-            super().__setattr__(name, value)
+        raise AttributeError(
+            f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
     def __delattr__(self, name):
-        if hasattr(self, name):
-            raise AttributeError(
-                f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
-        else:
-            raise AttributeError(
-                f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
+        raise AttributeError(
+            f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
     def __setitem__(self, key, value):
         raise TypeError(
@@ -372,69 +477,405 @@ class DynamicFreezeObject(Mapping):
             f"{self.__class__.__name__} 属性不可变，请勿修改广播对象的值，该操作有可能会影响后续的监听服务。")
 
     def keys(self):
-        return self.__dict__.keys()
+        return self._data.keys()
 
     def values(self):
-        return [(_ := lambda value: dict(value) if isinstance(value, DynamicFreezeObject) else value)(value) for value
-                in
-                self.__dict__.values()]
+        return [dict(value) if isinstance(value, DynamicFreezeObject) else value
+                for value in (self._get(key) for key in self._data)]
 
     def items(self):
-        """ 返回键值对视图（可选） """
-        return self.__dict__.items()
-
+        """ 返回键值对列表，值为冻结后的对象 """
+        return [(key, self._get(key)) for key in self._data]
+
+
+def freeze(value):
+    """
+    冻结值：dict 包装为 DynamicFreezeObject（键转为字符串，其中的值在访问时再冻结），
+    list 转换为 tuple 并冻结每个元素，其他类型原样返回。已冻结的 DynamicFreezeObject / tuple 不再复制
+    """
+    if isinstance(value, dict):
+        return DynamicFreezeObject._view(value)
+    elif isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    # 其他类型直接返回
+    else:
+        return value
+
+
+# 结果中引用临时目录文件的路径，持久化时替换为该前缀 + 相对路径，读取时还原到当前运行的临时目录
+TEMP_PATH_MARKER = "<temp>/"
+
+
+def freeze_temp_paths(value, base_dir, files: List[str] = None):
+    """
+    将结果中指向 base_dir 内文件的绝对路径替换为 TEMP_PATH_MARKER + 相对路径，
+    files 不为 None 时收集被替换文件的相对路径（供结果缓存 / 广播日志持久化后在其他运行中还原）
+    """
+    return _map_strings(value, functools.partial(_freeze_temp_path, base_dir, files))
+
+
+def restore_temp_paths(value):
+    """
+    将 freeze_temp_paths 替换的路径还原到当前运行的临时目录
+    """
+    return _map_strings(value, _restore_temp_path)
+
+
+def _freeze_temp_path(base_dir, files: List[str], value: str) -> str:
+    from pathlib import Path
+    try:
+        path = Path(value)
+        if not path.is_absolute() or not path.is_file():
+            return value
+        relative_path = path.relative_to(base_dir)
+    except (ValueError, OSError):
+        return value
+    if files is not None:
+        files.append(relative_path.as_posix())
+    return TEMP_PATH_MARKER + relative_path.as_posix()
+
+
+def _restore_temp_path(value: str) -> str:
+    if value.startswith(TEMP_PATH_MARKER):
+        from core.root import get_base_dir
+        return str(get_base_dir() / value[len(TEMP_PATH_MARKER):])
+    return value
+
+
+def _map_strings(value, func):
+    """
+    对结果中的字符串逐一执行 func，保持 DynamicFreezeObject、dict、tuple、list 的结构
+    """
+    if isinstance(value, str):
+        return func(value)
+    if isinstance(value, DynamicFreezeObject):
+        return DynamicFreezeObject(**{key: _map_strings(item, func) for key, item in value.items()})
+    if isinstance(value, dict):
+        return {key: _map_strings(item, func) for key, item in value.items()}
+    if isinstance(value, (tuple, list)):
+        return type(value)(_map_strings(item, func) for item in value)
+    return value
+
+
+def content_hash(value) -> str:
+    """
+    计算冻结值（或普通的 dict / list 等）的稳定内容哈希，不支持的类型抛出 TypeError
+    """
+    if isinstance(value, DynamicFreezeObject):
+        return value.content_hash()
+    return _get_content_digest(value).hex()
+
+
+def _get_content_digest(value) -> bytes:
+    from hashlib import blake2b
+    parts = []
+    _encode_content(value, parts.append)
+    return blake2b("".join(parts).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _encode_content(value, append: Callable):
+    """
+    将值编码为规范的文本片段：dict 按键排序，list / tuple 不作区分，整数值的 float 按 int 编码。
+    常见类型按精确类型判断，子类（如 str 枚举）再走 isinstance 分支
+    """
+    value_type = type(value)
+    if value_type is str:
+        append(f'S{len(value)}:{value}')
+    elif value_type is int or value_type is bool:
+        append(f'I{value:d};')
+    elif value is None:
+        append('N')
+    elif value_type is DynamicFreezeObject or value_type is dict:
+        mapping = value._data if value_type is DynamicFreezeObject else value
+        append(f'D{len(mapping)}:')
+        if all(type(key) is str for key in mapping):
+            for key in sorted(mapping):
+                append(f'S{len(key)}:{key}')
+                _encode_content(mapping[key], append)
+        else:
+            for key, item in sorted(((str(key), item) for key, item in mapping.items()), key=_get_first):
+                append(f'S{len(key)}:{key}')
+                _encode_content(item, append)
+    elif value_type is list or value_type is tuple:
+        append(f'L{len(value)}:')
+        for item in value:
+            _encode_content(item, append)
+    elif isinstance(value, float):
+        append(f'I{int(value)};' if value.is_integer() else f'F{value!r};')
+    elif isinstance(value, str):
+        _encode_content(str.__str__(value), append)
+    elif isinstance(value, int):
+        _encode_content(int(value), append)
+    elif isinstance(value, (DynamicFreezeObject, dict)):
+        _encode_content(dict(value._data if isinstance(value, DynamicFreezeObject) else value), append)
+    elif isinstance(value, (list, tuple)):
+        _encode_content(list(value), append)
+    elif isinstance(value, (set, frozenset)):
+        encoded = []
+        for item in value:
+            item_parts = []
+            _encode_content(item, item_parts.append)
+            encoded.append("".join(item_parts))
+        append(f'T{len(encoded)}:')
+        for item in sorted(encoded):
+            append(item)
+    elif isinstance(value, (bytes, bytearray)):
+        append(f'B{len(value)}:{bytes(value).hex()}')
+    elif isinstance(value, _get_repr_encoded_types()):
+        # repr 能完整表示取值的常见值类型，以类型与 repr 编码；其他类型的 repr 可能只含名称或内存地址，
+        # 按 repr 编码会使内容不同的对象得到相同的哈希，一律不支持
+        text = f'{value_type.__module__}.{value_type.__qualname__}:{value!r}'
+        append(f'R{len(text)}:{text}')
+    else:
+        raise TypeError(f"无法计算 {value_type.__name__} 类型的内容哈希")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_repr_encoded_types() -> tuple:
+    import datetime
+    import decimal
+    import enum
+    import pathlib
+    import uuid
+    return (datetime.date, datetime.time, datetime.timedelta, datetime.timezone, decimal.Decimal,
+            pathlib.PurePath, uuid.UUID, enum.Enum, complex)
+
+
+def _get_first(item: tuple):
+    return item[0]
+
+
+def _restore_dynamic_freeze_object(data: dict) -> DynamicFreezeObject:
+    return DynamicFreezeObject._view(data)
+
+
+_TOMBSTONE = object()
+
+
+class OrderedRegistry(dict):
+    """
+    有序注册表（服务注册表 server_stock、ServerStock 使用）：
+    - 按键查找、写入与 dict 相同，为 O(1)
+    - 删除只将注册顺序中的位置标记为墓碑，O(1)；墓碑过多时整体压缩
+    - 按位置访问、keys / values / items 使用缓存的有序视图，注册表未变化时不再重建
+    - 有序视图按 (优先级, 名称顺序, 注册顺序) 排列：优先级由 set_priority 在注册时指定（数值小的在前，默认 0），
+      名称顺序由 sort 记录，新注册的键同样遵循该顺序
+    - 所有修改方法（含 popitem、|=、|）都经由 __setitem__ / __delitem__；绕过它们直接调用 dict 的方法
+      （如 dict.update(registry, ...)）修改后，读取有序视图时按实际的键重建注册顺序
+    """
 
-class IndexingDict(dict):
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._keys = list(super().keys())
+        super().__init__()
+        # 注册顺序的键，删除后置为墓碑
+        self._slots: List = []
+        # 键 -> 在 _slots 中的下标
+        self._positions: dict = {}
+        # sort 设置的名称顺序，None 表示按注册顺序
+        self._order_map: Union[dict, None] = None
+        # set_priority 设置的优先级：键 -> 优先级，未设置的键为 0
+        self._priorities: Union[dict, None] = None
+        # 缓存的有序键与键值对，注册表变化时重置
+        self._ordered_keys: Union[tuple, None] = None
+        self._ordered_items: Union[tuple, None] = None
+        # 缓存的有序值：(由其生成的有序键值对, 值)，有序键值对重建后随之失效
+        self._ordered_values: Union[tuple, None] = None
+        if args and isinstance(args[0], OrderedRegistry) and args[0]._priorities:
+            self._priorities = dict(args[0]._priorities)
+        self.update(*args, **kwargs)
 
     def __setitem__(self, key, value):
         if key not in self:
-            self._keys.append(key)
+            self._positions[key] = len(self._slots)
+            self._slots.append(key)
+            self._ordered_keys = None
         super().__setitem__(key, value)
+        self._ordered_items = None
 
     def __delitem__(self, key):
+        if len(self._positions) != len(self):
+            self._sync()
         super().__delitem__(key)
-        self._keys.remove(key)
+        self._slots[self._positions.pop(key)] = _TOMBSTONE
+        if self._priorities is not None:
+            self._priorities.pop(key, None)
+        self._ordered_keys = None
+        self._ordered_items = None
+        if len(self._slots) > 2 * len(self) + 16:
+            self._compact()
+
+    def _compact(self):
+        self._slots = [key for key in self._slots if key is not _TOMBSTONE]
+        self._positions = {key: index for index, key in enumerate(self._slots)}
 
-    def __len__(self):
-        return len(self._keys)
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __reversed__(self):
+        return reversed(self.keys())
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def popitem(self):
+        """
+        删除并返回有序视图中的最后一项
+        """
+        keys = self.keys()
+        if not keys:
+            raise KeyError('popitem(): dictionary is empty')
+        key = keys[-1]
+        return key, self.pop(key)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __or__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        registry = self.copy()
+        registry.update(other)
+        return registry
+
+    def __ror__(self, other):
+        if not isinstance(other, dict):
+            return NotImplemented
+        registry = OrderedRegistry(other)
+        registry.update(self)
+        return registry
+
+    def copy(self) -> 'OrderedRegistry':
+        if len(self._positions) != len(self):
+            self._sync()
+        registry = OrderedRegistry((key, dict.__getitem__(self, key)) for key in self._slots if key is not _TOMBSTONE)
+        registry._order_map = self._order_map
+        registry._priorities = None if self._priorities is None else dict(self._priorities)
+        return registry
+
+    def _sync(self):
+        """
+        dict 的方法绕过 __setitem__ / __delitem__ 修改了键时，保留仍存在的键的注册顺序，新增的键按 dict 顺序追加
+        """
+        slots = [key for key in self._slots if key is not _TOMBSTONE and dict.__contains__(self, key)]
+        registered = set(slots)
+        slots.extend(key for key in dict.keys(self) if key not in registered)
+        self._slots = slots
+        self._positions = {key: index for index, key in enumerate(slots)}
+        if self._priorities:
+            self._priorities = {key: priority for key, priority in self._priorities.items()
+                                if dict.__contains__(self, key)}
+        self._ordered_keys = None
+        self._ordered_items = None
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def clear(self):
+        super().clear()
+        self._slots = []
+        self._positions = {}
+        self._priorities = None
+        self._ordered_keys = None
+        self._ordered_items = None
 
     def sort(self, sort_list: List[str]):
         """
-        重排序
-        :param sort_list:
-        :return:
+        优先级相同的键按名称（键的 __name__）顺序排列，未列出的键排在最后，同名次的键保持注册顺序
+        :param sort_list: 名称顺序
+        :return: self
         """
-        order_index = {name: i for i, name in enumerate(sort_list)}
-        self._keys = sorted(self._keys, key=lambda x: order_index.get(x.__name__, float('inf')))
+        self._order_map = {name: i for i, name in enumerate(sort_list)}
+        self._ordered_keys = None
+        self._ordered_items = None
         return self
 
+    def set_priority(self, key, priority: int):
+        """
+        设置键的优先级，数值小的排在前面，优先于 sort 的名称顺序
+        """
+        if key not in self:
+            raise KeyError(key)
+        if self._priorities is None:
+            self._priorities = {}
+        self._priorities[key] = priority
+        self._ordered_keys = None
+        self._ordered_items = None
+
+    def get_priority(self, key) -> int:
+        return 0 if self._priorities is None else self._priorities.get(key, 0)
+
     def get_key(self, index):
-        return self._keys[index]
+        return self.keys()[index]
 
     def get_value(self, index):
-        return self[self._keys[index]]
+        return self[self.keys()[index]]
 
     def get_item(self, index):
-        key = self._keys[index]
-        return (key, self[key])
+        return self.items()[index]
 
     def update(self, other=(), **kwargs):
-        for k, v in dict(other).items():
+        for k, v in (other.items() if hasattr(other, 'items') else other):
             self.__setitem__(k, v)
         for k, v in kwargs.items():
             self.__setitem__(k, v)
 
-    def keys(self):
-        return self._keys
-
-    def values(self):
-        return [self[key] for key in self._keys]
-
-    def items(self):
-        return [(key, self[key]) for key in self._keys]
+    def keys(self) -> tuple:
+        if len(self._positions) != len(self):
+            self._sync()
+        ordered_keys = self._ordered_keys
+        if ordered_keys is None:
+            ordered_keys = tuple(key for key in self._slots if key is not _TOMBSTONE)
+            # sorted 是稳定排序，优先级与名称顺序均相同的键保持注册顺序
+            if self._priorities:
+                order_map = self._order_map or {}
+                priorities = self._priorities
+                ordered_keys = tuple(sorted(ordered_keys, key=lambda x: (
+                    priorities.get(x, 0), order_map.get(getattr(x, '__name__', None), float('inf')))))
+            elif self._order_map is not None:
+                order_map = self._order_map
+                ordered_keys = tuple(sorted(ordered_keys, key=lambda x: order_map.get(
+                    getattr(x, '__name__', None), float('inf'))))
+            self._ordered_keys = ordered_keys
+        return ordered_keys
+
+    def values(self) -> tuple:
+        items = self.items()
+        ordered_values = self._ordered_values
+        if ordered_values is None or ordered_values[0] is not items:
+            ordered_values = (items, tuple(value for _, value in items))
+            self._ordered_values = ordered_values
+        return ordered_values[1]
+
+    def items(self) -> tuple:
+        if len(self._positions) != len(self):
+            self._sync()
+        ordered_items = self._ordered_items
+        if ordered_items is None:
+            ordered_items = tuple((key, dict.__getitem__(self, key)) for key in self.keys())
+            self._ordered_items = ordered_items
+        return ordered_items
+
+    def __reduce__(self):
+        return _restore_ordered_registry, (list(self.items()), self._order_map, self._priorities)
+
+
+def _restore_ordered_registry(items: list, order_map, priorities=None) -> OrderedRegistry:
+    registry = OrderedRegistry(items)
+    registry._order_map = order_map
+    registry._priorities = priorities
+    return registry
+
+
+# 兼容旧名称
+IndexingDict = OrderedRegistry
 
 
 def singleton(cls):
@@ -10,18 +10,32 @@ from core.generator import report_exception
 from core.deco import inner_plugin
 from core.base import T, RunnerResult
 from core.generator import ServicePlugin
-
-from core.tooller.async_server import AsyncServerController, DownloadServerType
+from core.prefetch import register_prefetch, get_prefetched
 from core.utils import DynamicFreezeObject
-from inner_plugins.source.excel_tree_controller import get_excel_tree_dict
 
 SUMMARY_EXCEL_NAME = '测试任务分配.xlsx'
 
 
+@register_prefetch("kdocs_files", owner="ExcelSummaryPlugin")
+def _prefetch_kdocs_files(system_parameters):
+    # 金山文档下载只依赖配置，配置解析后即可开始，与禅道登录、拉取 BUG 并行
+    from core.tooller.async_server import AsyncServerController
+    return AsyncServerController().generator_files(path="global")
+
+
 @inner_plugin
 class ExcelSummaryPlugin(ServicePlugin):
+    # 金山文档下载与禅道无关，可与 ZenDaoServer 并发
+    depends_on = []
+    replayable = True
+
     def run(self, *args, **kwargs) -> Union[RunnerResult, T]:
-        save_path_list = AsyncServerController().generator_files(path="global")
+        # aiohttp、openpyxl 等依赖较重，运行时再导入
+        from core.tooller.async_server import AsyncServerController, DownloadServerType
+        from inner_plugins.source.excel_tree_controller import get_excel_tree_dict
+        save_path_list = get_prefetched("kdocs_files")
+        if save_path_list is None:
+            save_path_list = AsyncServerController().generator_files(path="global")
         for save_path in save_path_list:
             if isinstance(save_path, BaseException):
                 from core.generator import GlobalData
@@ -1,24 +1,55 @@
 import copy
-from typing import Union
+from typing import Union, List
 
 from core.deco import inner_plugin
 from core.base import T, RunnerResult, Data
 from core.generator import ServicePlugin
-from inner_plugins.source.report_controller import dispatch_info_collection, generation_report
+from core.prefetch import register_prefetch
+
+
+@register_prefetch("remote_font", owner="ReportPlugin")
+def _prefetch_remote_font(system_parameters):
+    # 生成附件图标时系统默认字体不可用才需要远程字体，提前判断并下载
+    from PIL import ImageFont
+    from core.tooller.insert_ole_to_docx import DEFAULT_FONT_PATH
+    from core.tooller._gen_pic import download_remote_font
+    try:
+        ImageFont.truetype(DEFAULT_FONT_PATH, 10)
+        return None
+    except Exception:
+        return download_remote_font()
+
+
+@register_prefetch("ole_templates", owner="ReportPlugin", after="kdocs_files")
+def _prefetch_ole_templates(system_parameters, kdocs_files):
+    # 用例文件来自金山文档下载结果，按其大小提前准备对应的 OLE 模板
+    from core.tooller.insert_ole_to_docx import OLE_TEMPLATE_DIR
+    from core.tooller._gen_bin_file import generate_bin_file
+    generate_bin_file([file_path for file_path in kdocs_files
+                       if isinstance(file_path, str) and file_path.endswith(".xmind")], OLE_TEMPLATE_DIR)
+    return OLE_TEMPLATE_DIR
 
 
 @inner_plugin
 class ReportPlugin(ServicePlugin):
     server_allow_monitor_functions = ["run"]
+    required_inputs = ['ZenDaoServer']
+    # 金山文档与用例结果非必需，存在时需在生成报告前产生
+    depends_on = ['ExcelSummaryPlugin', 'XmindPlugin']
 
     def run(self, *args, **kwargs) -> Union[RunnerResult, T]:
+        # python-docx、lxml、PIL 等依赖较重，使用时再导入
+        from inner_plugins.source.report_controller import generation_report
         for reference_data_object in self.reference_data_object_list:
             generation_report(reference_data_object)
         return True
 
     def get_notify(self, data: Data):
-        result: RunnerResult = data.result
-        result_data = result.get_data()
+        self.get_notify_batch([data])
+
+    def get_notify_batch(self, data_list: List[Data]):
+        # 各环境的报告数据只需准备一次，同一批广播依次汇总
+        from inner_plugins.source.report_controller import dispatch_info_collection
         if not hasattr(self, "reference_data_object_list"):
             from core.generator import GlobalData
             self.reference_data_object_list = []
@@ -31,6 +62,9 @@ class ReportPlugin(ServicePlugin):
                     reference_data_object[key] = value
                 self.reference_data_object_list.append(reference_data_object)
                 del reference_data_object["env"]
-        for reference_data_object in self.reference_data_object_list:
-            dispatch_info_collection(result.source_name, reference_data_object,
-                                     result_data)
+        for data in data_list:
+            result: RunnerResult = data.result
+            result_data = result.get_data()
+            for reference_data_object in self.reference_data_object_list:
+                dispatch_info_collection(result.source_name, reference_data_object,
+                                         result_data)
@@ -5,12 +5,17 @@ from core.deco import inner_plugin
 from core.base import T, RunnerResult, Data
 from core.generator import ServicePlugin
 from core.utils import DynamicFreezeObject
-from inner_plugins.source.xmind_case_controller import analyze_xmind
 
 
 @inner_plugin
 class XmindPlugin(ServicePlugin):
+    # 金山文档中没有 xmind 文件时不解析用例
+    required_inputs = ['ZenDaoServer', 'ExcelSummaryPlugin.xmind_file_list']
+    input_sources_only = True
+    replayable = True
+
     def run(self, *args, **kwargs) -> Union[RunnerResult, T]:
+        from inner_plugins.source.xmind_case_controller import analyze_xmind
         case_result = analyze_xmind(self.xmind_path_list,
                                     '_'.join([self.executionName, os.getenv("XMIND_CASE_ZIP_NAME_SUFFIX")]))
         return DynamicFreezeObject(case_result=case_result)
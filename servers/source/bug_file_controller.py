@@ -71,21 +71,48 @@ def process_value(value, h: BugFileStream._ColumnBaseInfo):
     return value
 
 
-def generate_bug_file(file_name, row_data: List[dict]) -> str:
-    with BugFileStream(file_name) as (work_book, work_sheet, headers, context):
+def format_row(col: dict, headers: List[BugFileStream._ColumnBaseInfo]) -> list:
+    return [(_ := lambda v: h.default_value if v in (None, "", []) else
+    "\n".join(map(str, v)) if isinstance(v, list) else
+    process_value(v, h).strip())(col.get(h.field_name))
+            for h in headers]
+
+
+class BugFileWriter:
+    """
+    增量写入 BUG 文件：BUG 到达一条写入一条，无需先收集完整列表；退出时设置列宽并保存
+    """
+
+    def __init__(self, file_name):
+        self._stream = BugFileStream(file_name)
+        self.path = None
+        self.work_sheet = None
+        self.headers = None
+
+    def __enter__(self) -> 'BugFileWriter':
+        _, self.work_sheet, self.headers, _ = self._stream.__enter__()
         # 添加表头
-        work_sheet.append([h.header_name for h in headers])
+        self.work_sheet.append([h.header_name for h in self.headers])
         # 给表头设定特殊样式
-        work_sheet.row_dimensions[1].alignment = Alignment(horizontal='center', vertical='center')
-        work_sheet.row_dimensions[1].font = Font(bold=True)
-        # 模式匹配：为每行添加数据
-        for col in row_data:
-            work_sheet.append([(_ := lambda v: h.default_value if v in (None, "", []) else
-            "\n".join(map(str, v)) if isinstance(v, list) else
-            process_value(v, h).strip())(col.get(h.field_name))
-                               for h in headers])
+        self.work_sheet.row_dimensions[1].alignment = Alignment(horizontal='center', vertical='center')
+        self.work_sheet.row_dimensions[1].font = Font(bold=True)
+        self.path = str(self._stream.path)
+        return self
+
+    def append(self, row: dict):
+        self.work_sheet.append(format_row(row, self.headers))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
         # 动态设置列宽
-        for column in work_sheet.columns:
+        for column in self.work_sheet.columns:
             width = get_column_width(column)
-            work_sheet.column_dimensions[column[0].column_letter].width = width
-        return str(context.path)
+            self.work_sheet.column_dimensions[column[0].column_letter].width = width
+        self._stream.__exit__(exc_type, exc_val, exc_tb)
+
+
+def generate_bug_file(file_name, row_data: List[dict]) -> str:
+    with BugFileWriter(file_name) as writer:
+        # 模式匹配：为每行添加数据
+        for col in row_data:
+            writer.append(col)
+        return writer.path
@@ -1,20 +1,21 @@
 from enum import Enum
 from pathlib import Path
-from typing import List, Union
+from typing import List, Union, Callable, TYPE_CHECKING
 
 import dotenv
 import os
 
-from requests.models import Response
+if TYPE_CHECKING:
+    from requests.models import Response
 
 from core._config import _const
 from core._config._exception import SystemParameterException
 from core.generator import report_exception
 from core.deco import ServerRunner
 from core.base import Server, Parameter
+from core.result_cache import cached_run
 from core.root import BASE_DIR
 from core.utils import HttpProtocolEnum, HttpMethodEnum, HiddenDefaultDict, DynamicFreezeObject
-from servers.source.bug_file_controller import generate_bug_file
 
 dotenv.load_dotenv(dotenv_path=Path(BASE_DIR) / "core" / ".env")
 
@@ -117,6 +118,7 @@ class Task:
 
 @ServerRunner(ZenDaoParameter)
 class ZenDaoServer(Server):
+    depends_on = []
 
     @classmethod
     def ping(cls) -> bool:
@@ -210,42 +212,40 @@ class ZenDaoServer(Server):
                 return version
         raise RuntimeError(f"当前执行ID【{executions_id}】下没有找到版本号：【{self.parameter.zendao_version_id}】")
 
-    def get_bug_info(self, product_id, execution_id, version: Union[Version, None]):
+    def get_bug_info(self, product_id, execution_id, version: Union[Version, None],
+                     bug_writer: Callable[[dict], None] = None):
+        """
+        流式获取 BUG：边接收响应边按环境过滤并累计统计，命中环境的 BUG 逐条交给 bug_writer（如写入 BUG 文件），
+        并以流 "bugs" 广播给订阅插件（元素为 DynamicFreezeObject(bug=..., envs=[命中的环境名])），
+        内存占用与 zendao_bug_limit 无关
+        :return: {环境名: {"filter": 过滤条件, "bugs": 统计信息}}
+        """
         self.sender.path = os.getenv("ZENDAO_BUG_LIST") % (str(product_id),)
         self.sender.method = HttpMethodEnum.GET
 
-        class _BugFilter:
-            def __init__(self, bugs, *args, **kwargs):
-                self.bugs = bugs
-
         class _BugParams:
             def __init__(self, limit, status):
                 if limit:
                     self.limit = limit
                 self.status = status
 
-        def _gen_bug_summary_info(bug_list):
-            class ResultDict:
+        class ResultDict:
 
-                def __init__(self):
-                    self.severity_mapping = HiddenDefaultDict(int, self.update_total)
-                    self.resolution_mapping = HiddenDefaultDict(int)
-                    self.postponed_bugs = {}
-                    self.total = 0
+            def __init__(self):
+                self.severity_mapping = HiddenDefaultDict(int, self.update_total)
+                self.resolution_mapping = HiddenDefaultDict(int)
+                self.postponed_bugs = {}
+                self.total = 0
 
-                def update_total(self, _, old_value, new_value):
-                    self.total += (new_value - old_value)
+            def update_total(self, _, old_value, new_value):
+                self.total += (new_value - old_value)
 
-            result_dict = ResultDict()
-            bug_origin_data = []
-            for bug_data in bug_list:
+            def add(self, bug_data):
                 bug = Bug(**bug_data)
-                result_dict.severity_mapping[bug.severity] += 1
-                result_dict.resolution_mapping[bug.resolution] += 1
+                self.severity_mapping[bug.severity] += 1
+                self.resolution_mapping[bug.resolution] += 1
                 if bug.resolution == 'postponed':
-                    result_dict.postponed_bugs[bug.id] = bug.title
-                bug_origin_data.append(bug_data)
-            return result_dict.__dict__, bug_origin_data
+                    self.postponed_bugs[bug.id] = bug.title
 
         self.sender.params = _BugParams(self.parameter.zendao_bug_limit, self.parameter.zendao_bug_status).__dict__
         bug_mapping = {}
@@ -263,9 +263,9 @@ class ZenDaoServer(Server):
                         bug_filter["exclude"].append(bug_filter_name[1:])
                     else:
                         bug_filter["include"].append(bug_filter_name)
-                bug_mapping[env["name"]] = {"filter": bug_filter, "bugs": []}
+                bug_mapping[env["name"]] = {"filter": bug_filter, "bugs": ResultDict()}
 
-        def bug_filter_callback(bug):
+        def bug_filter_callback(bug) -> bool:
             if self.parameter.zendao_bug_range == "version":
                 if bug["id"] not in version.bugs:
                     return False
@@ -280,22 +280,40 @@ class ZenDaoServer(Server):
                     self.parameter.zendao_bug_filter_title_not_contains is not None) and self.parameter.zendao_bug_filter_title_not_contains in \
                     bug["title"]:
                 return False
+            return True
+
+        def match_envs(bug) -> List[str]:
+            envs = []
             for env_name, mapping in bug_mapping.items():
                 match_include = next(
                     (name for name in mapping["filter"]["include"] if name.lower() in bug["title"].lower()), None)
                 match_exclude = all(name.lower() not in bug["title"].lower() for name in mapping["filter"]["exclude"])
                 if match_include and match_exclude:
-                    bug_mapping[env_name]["bugs"].append(bug)
-
-        self.sender.send(stream=True,
-                         filter_callback=bug_filter_callback,
-                         target="bugs.item")
-        self.sender.clean_params()
-        origin_bug_list = []
-        for env_name, mapping in bug_mapping.items():
-            mapping["bugs"], origin_bug = _gen_bug_summary_info(mapping["bugs"])
-            origin_bug_list.extend(origin_bug)
-        return bug_mapping, origin_bug_list
+                    envs.append(env_name)
+            return envs
+
+        publish = self.has_stream_subscribers("bugs")
+        try:
+            for bug in self.sender.send_iter("bugs.item"):
+                if bug_filter_callback(bug) is False:
+                    continue
+                envs = match_envs(bug)
+                for env_name in envs:
+                    bug_mapping[env_name]["bugs"].add(bug)
+                    if bug_writer is not None:
+                        bug_writer(bug)
+                if publish and envs:
+                    self.publish_stream("bugs", DynamicFreezeObject(bug=bug, envs=envs))
+        finally:
+            self.sender.clean_params()
+            if publish:
+                self.end_stream("bugs")
+        for mapping in bug_mapping.values():
+            result_dict = mapping["bugs"]
+            mapping["bugs"] = {"severity_mapping": result_dict.severity_mapping,
+                               "resolution_mapping": result_dict.resolution_mapping,
+                               "postponed_bugs": result_dict.postponed_bugs, "total": result_dict.total}
+        return bug_mapping
 
     def _get_test_task(self, call_back, product_id):
         self.sender.params = {
@@ -320,6 +338,9 @@ class ZenDaoServer(Server):
                 "参数错误：--zendao_test_task_id：{self.parameter.zendao_test_task_id}，该参数无法找到测试单")
         return Task(**test_task)
 
+    # 同一执行、版本、测试单及环境配置（get_bug_info 读取的 env、report_type）在短时间内重复运行时直接使用缓存，
+    # BUG 文件随缓存一并保存
+    @cached_run(ttl=300, streams=["bugs"], system_parameters=["env", "report_type"])
     def run(self, *args, **kwargs):
         execution_id = self.parameter.zendao_execution_id
         product_id = self.parameter.zendao_product_id
@@ -329,15 +350,14 @@ class ZenDaoServer(Server):
             if self.parameter.zendao_version_id == None:
                 raise RuntimeError("缺少参数：--zendao_version_id")
             version = self._set_bug_list_by_version(execution_id)
-        # 获取BUG列表信息
-        bug_info, bug_origin_data = self.get_bug_info(product_id, execution_id, version)
-        # 获取任务列表信息
+        # 获取任务列表信息（BUG 文件名依赖测试单，需先于 BUG 获取）
         task_info = self.get_test_task(self.parameter.zendao_test_task_id, product_id)
-        # 创建BUG文件
-        bug_file_path = generate_bug_file(
-            task_info.executionName.replace(" ", "") + "_" + os.getenv("ZENDAO_BUG_FILE_NAME"),
-            bug_origin_data)
-        return DynamicFreezeObject(bug=bug_info, task=task_info.__dict__, bug_file_path=bug_file_path)
+        # 获取BUG列表信息，边接收边写入BUG文件（openpyxl 较重，按需导入）
+        from servers.source.bug_file_controller import BugFileWriter
+        with BugFileWriter(task_info.executionName.replace(" ", "") + "_" + os.getenv("ZENDAO_BUG_FILE_NAME")) \
+                as bug_writer:
+            bug_info = self.get_bug_info(product_id, execution_id, version, bug_writer.append)
+        return DynamicFreezeObject(bug=bug_info, task=task_info.__dict__, bug_file_path=bug_writer.path)
 
 
 ZenDaoProduct = Product
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from core.base import AsyncServer, ServerPlugin, ServerStock, EmptyParameter, run_sync, Data
+from core.context import RunContext
+from core.generator import PluginPool
+from core.utils import OrderedRegistry
+
+
+def _make_server(name):
+    class _Server(AsyncServer):
+        source_name = name
+
+        def __init__(self):
+            pass
+
+        @classmethod
+        def ping(cls) -> bool:
+            return True
+
+        def set_base_headers(self, *args, **kwargs) -> None:
+            pass
+
+        async def tokenization(self) -> bool:
+            await asyncio.sleep(0.1)
+            return True
+
+        def set_tokenization_headers(self):
+            pass
+
+        async def run(self, *args, **kwargs):
+            await asyncio.sleep(0.1)
+            return {"name": name}
+
+    return _Server
+
+
+class _SlowPlugin(ServerPlugin):
+
+    def get_notify(self, data: Data):
+        if data.method_name == "initialize":
+            time.sleep(0.3)
+
+
+def _make_stock():
+    registry = OrderedRegistry()
+    registry[_make_server("A1")] = EmptyParameter
+    registry[_make_server("A2")] = EmptyParameter
+    return ServerStock(registry, {}, include_inner_servers=False)
+
+
+def test_slow_subscriber_does_not_block_concurrent_servers():
+    with RunContext(include_inner_plugin=False):
+        PluginPool.register(_SlowPlugin())
+        start = time.perf_counter()
+        results = _make_stock().run_all()
+        elapsed = time.perf_counter() - start
+    assert results == [{"name": "A1"}, {"name": "A2"}]
+    # 两次 0.3 秒的 get_notify 并行执行，而不是在事件循环线程中依次执行（约 0.8 秒）
+    assert elapsed < 0.7
+
+
+def test_run_all_inside_running_loop():
+    async def main():
+        return _make_stock().run_all(), await _make_stock().arun_all()
+
+    with RunContext(include_inner_plugin=False):
+        from_sync, from_async = asyncio.run(main())
+    assert from_sync == from_async == [{"name": "A1"}, {"name": "A2"}]
+
+
+def test_run_sync_inside_running_loop():
+    async def compute():
+        await asyncio.sleep(0)
+        return 1
+
+    async def main():
+        return run_sync(compute())
+
+    assert asyncio.run(main()) == 1
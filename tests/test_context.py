@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import core.context
+from core.context import RunContext, prune_stale_temp_dirs
+
+
+@pytest.fixture
+def temp_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(core.context, "get_temp_root", lambda: tmp_path)
+    return tmp_path
+
+
+def _make_run_dir(path, age: float = 2 * 60 * 60):
+    (path / "sub").mkdir(parents=True, exist_ok=True)
+    (path / "sub" / "a.txt").write_text("x")
+    stale_time = time.time() - age
+    for item in (path / "sub" / "a.txt", path / "sub", path):
+        os.utime(item, (stale_time, stale_time))
+
+
+def test_enter_prunes_stale_run_dirs(temp_root):
+    stale_dir = temp_root / "0123456789ab"
+    _make_run_dir(stale_dir)
+    with RunContext(include_inner_plugin=False) as context:
+        assert context.temp_dir.parent == temp_root
+        assert not stale_dir.exists()
+
+
+def test_prune_keeps_active_and_recent_run_dirs(temp_root):
+    recent_dir = temp_root / "ba9876543210"
+    recent_dir.mkdir()
+    with RunContext(include_inner_plugin=False) as context:
+        _make_run_dir(context.temp_dir)
+        prune_stale_temp_dirs()
+        assert context.temp_dir.exists()
+        assert recent_dir.exists()
+
+
+def test_prune_checks_newest_mtime_in_tree(temp_root):
+    run_dir = temp_root / "0123456789ab"
+    _make_run_dir(run_dir)
+    # 只写入子目录中的文件，顶层目录的修改时间不变
+    os.utime(run_dir / "sub" / "a.txt")
+    prune_stale_temp_dirs()
+    assert run_dir.exists()
+
+
+@pytest.mark.skipif(os.name == "nt", reason="Windows 下不探测进程是否存活")
+def test_prune_keeps_dirs_of_live_processes(temp_root):
+    run_dir = temp_root / "0123456789ab"
+    _make_run_dir(run_dir)
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        (temp_root / "0123456789ab.pid").write_text(str(process.pid))
+        prune_stale_temp_dirs()
+        assert run_dir.exists()
+    finally:
+        process.kill()
+        process.wait()
+    prune_stale_temp_dirs()
+    assert not run_dir.exists()
+    assert not (temp_root / "0123456789ab.pid").exists()
+
+
+def test_marker_is_removed_on_exit(temp_root):
+    with RunContext(include_inner_plugin=False) as context:
+        marker = temp_root / (context.run_id + ".pid")
+        assert marker.read_text() == str(os.getpid())
+    assert not marker.exists()
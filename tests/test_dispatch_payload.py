@@ -0,0 +1,66 @@
+import core.monitor
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin, RunnerResult, Data
+from core.monitor import Dispatcher
+
+
+class _Source:
+    source_type = "server"
+    source_name = "BenchServer"
+    disable_method = []
+
+
+class _Recorder(ServerPlugin):
+    server_allow_monitor_functions = ["run"]
+    received = None
+
+    def run(self, *args, **kwargs):
+        pass
+
+    def get_notify(self, data: Data):
+        self.received.append(data)
+
+
+def _make_recorders(pool, count):
+    recorders = []
+    for _ in range(count):
+        recorder = _Recorder()
+        recorder.received = []
+        pool.register(recorder)
+        recorders.append(recorder)
+    return recorders
+
+
+def _dispatch(pool, result):
+    Dispatcher._generic_dispatch(_Source(), pool, "run", result, "server_allow_monitor_functions", False)
+
+
+def test_subscribers_share_one_payload():
+    pool = PluginPoolType(False)
+    recorders = _make_recorders(pool, 3)
+    _dispatch(pool, {"total": 1})
+    payloads = [recorder.received[0] for recorder in recorders]
+    assert all(payload is payloads[0] for payload in payloads)
+    assert payloads[0].method_name == "run"
+    assert payloads[0].result.source_name == "BenchServer"
+    assert payloads[0].result.get_data() == {"total": 1}
+
+
+def test_runner_result_is_not_wrapped_again():
+    pool = PluginPoolType(False)
+    recorder, = _make_recorders(pool, 1)
+    result = RunnerResult(_Source(), {"total": 1})
+    _dispatch(pool, result)
+    assert recorder.received[0].result is result
+
+
+def test_payload_is_not_built_without_subscribers(monkeypatch):
+    built = []
+
+    def get_payload_types():
+        built.append(1)
+        return RunnerResult, Data
+
+    monkeypatch.setattr(core.monitor, "_get_payload_types", get_payload_types)
+    _dispatch(PluginPoolType(False), {"total": 1})
+    assert built == []
@@ -0,0 +1,42 @@
+from core.monitor import DispatchStats
+
+
+def test_records_are_aggregated():
+    stats = DispatchStats()
+    for _ in range(10000):
+        stats.record_notify("ZenDaoServer", "run", 2)
+        stats.record_latency("ZenDaoServer", "run", 0.002)
+
+    snapshot = stats.snapshot()
+    assert snapshot["notifications"] == [
+        {"source_name": "ZenDaoServer", "method_name": "run", "count": 10000, "deliveries": 20000}]
+    latency = snapshot["latency"]["ZenDaoServer"]["run"]
+    assert latency["count"] == 10000
+    assert latency["max_ms"] == 2.0
+    assert latency["buckets"] == {"<=5ms": 10000}
+
+
+def test_reset():
+    stats = DispatchStats()
+    stats.record_notify("ZenDaoServer", "run", 1)
+    stats.reset()
+    assert stats.snapshot() == {"notifications": [], "latency": {}}
+
+
+def test_records_from_threads_are_merged():
+    import threading
+    stats = DispatchStats()
+
+    def record():
+        for _ in range(1000):
+            stats.record_notify("ZenDaoServer", "run", 1)
+            stats.record_latency("ZenDaoServer", "run", 0.0001)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    snapshot = stats.snapshot()
+    assert snapshot["notifications"][0]["count"] == 4000
+    assert snapshot["latency"]["ZenDaoServer"]["run"]["count"] == 4000
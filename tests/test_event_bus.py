@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+
+import pytest
+
+from core._config._global_obj import PluginPoolType
+from core.monitor import EventBus, DispatchStats, Dispatcher
+
+
+class _Payload:
+    callback_name = "get_notify"
+
+    def __init__(self, index):
+        self.index = index
+
+
+class _Recorder:
+    source_name = "Recorder"
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.received = []
+
+    def get_notify(self, payload):
+        if self.delay:
+            time.sleep(random.random() * self.delay)
+        self.received.append(payload.index)
+
+
+def _make_bus(max_queue_size: int = 64):
+    return EventBus(max_queue_size, max_workers=4, dispatch_stats=DispatchStats())
+
+
+def test_each_plugin_receives_events_in_publish_order():
+    bus = _make_bus()
+    plugins = [_Recorder(delay=0.001) for _ in range(3)]
+    for index in range(50):
+        for plugin in plugins:
+            bus.publish(plugin, _Payload(index))
+    bus.flush()
+    bus.close()
+    for plugin in plugins:
+        assert plugin.received == list(range(50))
+
+
+def test_full_queue_blocks_publisher():
+    bus = _make_bus(max_queue_size=2)
+    release = threading.Event()
+
+    class _Blocked(_Recorder):
+        def get_notify(self, payload):
+            release.wait()
+            super().get_notify(payload)
+
+    plugin = _Blocked()
+    published = []
+
+    def publish():
+        for index in range(6):
+            bus.publish(plugin, _Payload(index))
+            published.append(index)
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    time.sleep(0.2)
+    # 1 条正在处理，2 条在队列中，第 4 条等待队列空出
+    assert len(published) == 3
+    assert publisher.is_alive()
+    release.set()
+    publisher.join(5)
+    bus.flush()
+    bus.close()
+    assert plugin.received == list(range(6))
+
+
+def test_flush_is_a_barrier_for_nested_events():
+    bus = _make_bus(max_queue_size=1)
+    downstream = _Recorder(delay=0.01)
+
+    class _Forwarder(_Recorder):
+        def get_notify(self, payload):
+            # 消费线程内的嵌套广播即使队列已满也不会阻塞
+            for offset in range(3):
+                bus.publish(downstream, _Payload(payload.index * 10 + offset))
+            super().get_notify(payload)
+
+    forwarder = _Forwarder()
+    for index in range(3):
+        bus.publish(forwarder, _Payload(index))
+    bus.flush()
+    assert forwarder.received == [0, 1, 2]
+    assert downstream.received == [0, 1, 2, 10, 11, 12, 20, 21, 22]
+    bus.close()
+
+
+def test_flush_raises_first_plugin_error():
+    bus = _make_bus()
+
+    class _Failing(_Recorder):
+        def get_notify(self, payload):
+            raise ValueError(payload.index)
+
+    plugin = _Failing()
+    bus.publish(plugin, _Payload(1))
+    bus.publish(plugin, _Payload(2))
+    with pytest.raises(ValueError, match="1"):
+        bus.flush()
+    # 错误只抛出一次，之后的屏障正常返回
+    bus.flush()
+    bus.close()
+
+
+def test_flush_notify_waits_for_the_plugin_queue():
+    pool = PluginPoolType(False)
+    bus = _make_bus()
+    pool.set_event_bus(bus)
+    plugin = _Recorder(delay=0.01)
+    for index in range(5):
+        Dispatcher.deliver(pool, plugin, _Payload(index))
+    pool.flush_notify(plugin)
+    assert plugin.received == list(range(5))
+    bus.close()
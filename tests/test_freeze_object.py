@@ -0,0 +1,41 @@
+import datetime
+import pickle
+
+import pytest
+
+from core.utils import DynamicFreezeObject, content_hash
+
+
+def test_equal_objects_hash_equally():
+    first = DynamicFreezeObject(x=1, y={"b": [1, 2], "a": None}, z=(1.0, "s"))
+    second = DynamicFreezeObject(z=[True, "s"], y={"a": None, "b": (1, 2)}, x=1.0)
+    assert first == second
+    assert hash(first) == hash(second)
+    assert first.content_hash() == second.content_hash()
+    assert DynamicFreezeObject(x="1").content_hash() != DynamicFreezeObject(x=1).content_hash()
+
+
+def test_value_types_are_hashed_by_value():
+    assert content_hash({"day": datetime.date(2024, 1, 1)}) == content_hash({"day": datetime.date(2024, 1, 1)})
+    assert content_hash({"day": datetime.date(2024, 1, 1)}) != content_hash({"day": datetime.date(2024, 1, 2)})
+
+
+def test_unknown_types_are_rejected():
+    class Response:
+        def __repr__(self):
+            return "<Response [200]>"
+
+    with pytest.raises(TypeError):
+        content_hash({"response": Response()})
+    with pytest.raises(TypeError):
+        hash(DynamicFreezeObject(response=Response()))
+
+
+def test_binary_round_trip():
+    obj = DynamicFreezeObject(bugs=[{"id": 1}], total=1)
+    restored = DynamicFreezeObject.from_bytes(obj.to_bytes())
+    assert restored == obj
+    assert restored["bugs"][0]["id"] == 1
+    assert pickle.loads(pickle.dumps(obj)).content_hash() == obj.content_hash()
+    with pytest.raises(TypeError):
+        DynamicFreezeObject.from_bytes(pickle.dumps(1))
@@ -0,0 +1,99 @@
+import pytest
+
+from core._config._global_obj import GlobalDataType
+
+
+def test_update_item_isolated_from_caller():
+    global_data = GlobalDataType()
+    changes = []
+    global_data.watch(None, lambda changed, version: changes.append(version))
+    source = {"bugs": [1, 2], "total": 2}
+    global_data.update_item("result", source)
+
+    source["bugs"].append(3)
+    source["new"] = 1
+
+    snapshot, version = global_data.get_with_version()
+    assert version == 1
+    assert snapshot["result"]["bugs"] == (1, 2)
+    assert "new" not in snapshot["result"]
+    assert global_data.changes_since(1) == ({}, 1)
+    assert changes == [1]
+
+
+def test_set_data_isolated_from_caller():
+    global_data = GlobalDataType()
+    source = {"result": {"bugs": [1, 2]}}
+    global_data.set_data(source)
+
+    source["result"]["bugs"].append(3)
+    source["other"] = 1
+
+    assert global_data.get_data()["result"]["bugs"] == (1, 2)
+    assert "other" not in global_data.get_data()
+
+
+def test_update_item_shares_untouched_values():
+    global_data = GlobalDataType()
+    global_data.set_data({"bugs": [{"id": 1}], "summary": {"total": 1}})
+    bugs = global_data.get_data()["bugs"]
+    global_data.update_item("summary", {"total": 2})
+    snapshot = global_data.get_data()
+    # 未修改的键沿用上一版本已冻结的值
+    assert snapshot["bugs"] is bugs
+    assert snapshot["summary"]["total"] == 2
+
+
+def test_only_changed_keys_are_reported():
+    global_data = GlobalDataType()
+    changes = []
+    global_data.watch(None, lambda changed, version: changes.append(sorted(changed)))
+    global_data.set_data({"bugs": [1, 2], "summary": {"total": 2}})
+    global_data.set_data({"bugs": [1, 2], "summary": {"total": 3}, "step": 1})
+    global_data.update_item("step", 1)
+    global_data.set_data({"bugs": [1, 2], "step": 1})
+    assert changes == [["bugs", "summary"], ["step", "summary"], ["summary"]]
+    assert global_data.changes_since(2) == ({"summary": GlobalDataType.DELETED}, 4)
+
+
+class _ShortLogGlobalData(GlobalDataType):
+    CHANGE_LOG_SIZE = 2
+
+
+def test_changes_since_merges_versions_and_falls_back_to_full():
+    global_data = _ShortLogGlobalData()
+    global_data.update_item("bugs", [1])
+    global_data.update_item("summary", {"total": 1})
+    global_data.update_item("bugs", [1, 2])
+    # 多个版本的变更按键合并，值为当前快照中的值
+    assert global_data.changes_since(1) == ({"summary": {"total": 1}, "bugs": (1, 2)}, 3)
+    # 超出变更日志的版本返回全部键值
+    assert global_data.changes_since(0) == ({"bugs": (1, 2), "summary": {"total": 1}}, 3)
+    assert global_data.changes_since(3) == ({}, 3)
+
+
+def test_watch_filters_keys_until_unwatched():
+    global_data = GlobalDataType()
+    changes = []
+    watcher_id = global_data.watch(["summary"], lambda changed, version: changes.append((changed, version)))
+    global_data.update_item("bugs", [1])
+    global_data.update_item("summary", {"total": 1})
+    global_data.unwatch(watcher_id)
+    global_data.update_item("summary", {"total": 2})
+    assert changes == [({"summary": {"total": 1}}, 2)]
+
+
+def test_failing_watcher_only_warns():
+    global_data = GlobalDataType()
+    changes = []
+
+    def fail(changed, version):
+        raise ValueError("boom")
+
+    global_data.watch(None, fail)
+    global_data.watch(None, lambda changed, version: changes.append(version))
+    with pytest.warns(UserWarning, match="boom"):
+        global_data.update_item("bugs", [1])
+    # 回调异常不影响写入及其他监听
+    assert global_data.get_data()["bugs"] == (1,)
+    assert changes == [1]
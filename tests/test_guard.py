@@ -0,0 +1,62 @@
+import threading
+import time
+import warnings
+
+from core.guard import PluginGuard
+from core.monitor import _active_event_bus
+
+
+class _Plugin:
+    source_name = "SlowPlugin"
+    notify_timeout = 0.2
+    run_timeout = None
+
+
+def test_guarded_calls_reuse_bounded_threads():
+    guard = PluginGuard(max_workers=2)
+    idents = {guard.call(_Plugin(), "get_notify", threading.get_ident) for _ in range(50)}
+    guard.close()
+    assert len(idents) <= 2
+    assert threading.get_ident() not in idents
+
+
+def test_guarded_call_keeps_event_bus_worker_state():
+    guard = PluginGuard()
+    bus = object()
+    token = _active_event_bus.set(bus)
+    try:
+        assert guard.call(_Plugin(), "get_notify", _active_event_bus.get) is bus
+    finally:
+        _active_event_bus.reset(token)
+        guard.close()
+
+
+def test_timed_out_call_blocks_further_calls_until_done():
+    guard = PluginGuard()
+    plugin = _Plugin()
+    release = threading.Event()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert guard.call(plugin, "get_notify", release.wait) is None
+        assert guard.timeouts == 1
+        # 上一次超时的调用仍在执行
+        assert guard.call(plugin, "get_notify", lambda: 1) is None
+        release.set()
+        time.sleep(0.05)
+        assert guard.call(plugin, "get_notify", lambda: 1) == 1
+    assert guard.report()["SlowPlugin"]["failures"] == 2
+    guard.close()
+
+
+def test_plugin_timeout_error_is_not_treated_as_budget_timeout():
+    guard = PluginGuard()
+
+    def fail():
+        raise TimeoutError("remote")
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert guard.call(_Plugin(), "get_notify", fail) is None
+    guard.close()
+    assert guard.timeouts == 0
+    assert "remote" in str(caught[0].message)
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.import_time import FORBIDDEN_MODULES, measure
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _imported_after(statement: str) -> list:
+    # 在独立进程中导入，避免受当前测试进程已导入模块的影响
+    code = f"import sys; {statement}; print(' '.join(sorted(sys.modules)))"
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return process.stdout.split()
+
+
+def test_startup_does_not_import_heavy_dependencies():
+    imported = set(_imported_after("import report_generator"))
+    assert [module for module in FORBIDDEN_MODULES if module in imported] == []
+
+
+def test_inner_plugins_are_registered_without_their_dependencies():
+    statement = "import report_generator, inner_plugins; from core.deco import inner_plugin_registry; " \
+                "print(*[plugin_class.__name__ for plugin_class in inner_plugin_registry])"
+    output = _imported_after(statement)
+    # 插件类在导入时登记，但其依赖仍延迟到运行时导入
+    assert "ReportPlugin" in output and "XmindPlugin" in output
+    assert "docx" not in output and "xmindparser" not in output
+
+
+def test_measure_reports_entry_module():
+    records = measure("core.utils")
+    assert "core.utils" in [name for name, _, _ in records]
+    assert all(cumulative >= self_us for _, self_us, cumulative in records)
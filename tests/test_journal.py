@@ -0,0 +1,107 @@
+import pickle
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from core._config._exception import FileException
+from core.base import ServerPlugin, Data
+from core.context import RunContext
+from core.generator import PluginPool
+from core.journal import EventJournal, replay_events, JOURNAL_FILE_NAME
+from core.root import get_base_dir
+
+
+class _Source:
+    source_type = "server"
+
+
+class _CollectPlugin(ServerPlugin):
+    received = []
+
+    def get_notify(self, data: Data):
+        self.received.append(data)
+
+
+def test_replayed_temp_paths_point_to_current_run(tmp_path):
+    journal_dir = tmp_path / "journal"
+    record_dir = tmp_path / "record_run"
+    with RunContext(include_inner_plugin=False, temp_dir=record_dir):
+        bug_file = get_base_dir() / "bugs" / "bug.xlsx"
+        bug_file.parent.mkdir(parents=True)
+        bug_file.write_text("bug")
+        journal = EventJournal.open_for_record(journal_dir)
+        journal.record(_Source(), "ZenDaoServer", "run", {"bug_file": str(bug_file), "total": 1},
+                       "server_allow_monitor_functions", False)
+        journal.snapshot_temp()
+        journal.close()
+    # 记录运行的临时目录已被清理
+    shutil.rmtree(record_dir)
+
+    plugin = _CollectPlugin()
+    plugin.received = []
+    with RunContext(include_inner_plugin=False, temp_dir=tmp_path / "replay_run"):
+        PluginPool.register(plugin)
+        journal = EventJournal(journal_dir)
+        journal.restore_temp()
+        assert replay_events(journal, PluginPool, []) == ["ZenDaoServer"]
+        replay_base_dir = get_base_dir()
+    bug_file = Path(plugin.received[0].result.get_data()["bug_file"])
+    assert bug_file.is_file()
+    assert bug_file.parent.parent == replay_base_dir
+    assert plugin.received[0].result.get_data()["total"] == 1
+
+
+class _Plugin:
+    source_type = "plugin"
+    source_name = "ExcelSummaryPlugin"
+
+
+def _record(journal, obj, source_name, method_name, result, monitor_attr="server_allow_monitor_functions"):
+    journal.record(obj, source_name, method_name, result, monitor_attr, monitor_attr == "plugin_allow_monitor_functions")
+
+
+def test_events_are_read_back_in_order(tmp_path):
+    journal = EventJournal.open_for_record(tmp_path)
+    _record(journal, _Source(), "ZenDaoServer", "initialize", True)
+    _record(journal, _Source(), "ZenDaoServer", "run", {"total": 1})
+    with pytest.warns(UserWarning, match="无法序列化"):
+        _record(journal, _Source(), "ZenDaoServer", "run", threading.Lock())
+    journal.close()
+    events = list(EventJournal(tmp_path).events())
+    assert [(event.source_name, event.method_name, event.data) for event in events] == \
+        [("ZenDaoServer", "initialize", True), ("ZenDaoServer", "run", {"total": 1})]
+
+
+def test_missing_or_incompatible_journal_is_rejected(tmp_path):
+    with pytest.raises(FileException, match="不存在"):
+        list(EventJournal(tmp_path).events())
+    with open(tmp_path / JOURNAL_FILE_NAME, "wb") as file:
+        pickle.dump({"version": -1}, file)
+    with pytest.raises(FileException, match="版本不兼容"):
+        list(EventJournal(tmp_path).events())
+
+
+def test_replay_only_rebroadcasts_replayable_plugins(tmp_path):
+    journal = EventJournal.open_for_record(tmp_path)
+    _record(journal, _Source(), "ZenDaoServer", "run", {"total": 1})
+    _record(journal, _Plugin(), "ExcelSummaryPlugin", "run", {"xmind_file_list": []}, "plugin_allow_monitor_functions")
+    _record(journal, _Plugin(), "ReportPlugin", "run", True, "plugin_allow_monitor_functions")
+    journal.close()
+
+    class ExcelSummaryPlugin(ServerPlugin):
+        replayable = True
+
+        def run(self, *args, **kwargs):
+            pass
+
+    plugin = _CollectPlugin()
+    plugin.received = []
+    with RunContext(include_inner_plugin=False, temp_dir=tmp_path / "replay_run"):
+        PluginPool.register(plugin)
+        replayed = replay_events(EventJournal(tmp_path), PluginPool, [ExcelSummaryPlugin()])
+    # ReportPlugin 不可回放，其广播由实际运行产生
+    assert replayed == ["ZenDaoServer", "ExcelSummaryPlugin"]
+    assert [(data.result.source_name, data.result.get_data()) for data in plugin.received] == \
+        [("ZenDaoServer", {"total": 1}), ("ExcelSummaryPlugin", {"xmind_file_list": []})]
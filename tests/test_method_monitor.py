@@ -0,0 +1,51 @@
+from core.base import ServerPlugin
+from core.context import RunContext
+from core.generator import PluginPool
+from core.monitor import GenericMonitor, monitored
+
+
+def _is_wrapped(cls, name):
+    return getattr(cls.__dict__[name], '__monitor_wrapped__', False)
+
+
+def test_only_subscribed_or_declared_methods_are_wrapped():
+    class _Exporter(GenericMonitor):
+        def export_sheet_4b1c(self):
+            return 1
+
+        @monitored
+        def export_summary_4b1c(self):
+            return 2
+
+    assert not _is_wrapped(_Exporter, "export_sheet_4b1c")
+    assert _is_wrapped(_Exporter, "export_summary_4b1c")
+
+
+def test_existing_classes_are_wrapped_when_a_plugin_subscribes_later():
+    class _Exporter(GenericMonitor):
+        source_name = "Exporter"
+
+        def export_sheet_9e2a(self):
+            return {"rows": 1}
+
+    assert not _is_wrapped(_Exporter, "export_sheet_9e2a")
+
+    class _Listener(ServerPlugin):
+        server_allow_monitor_functions = []
+        allow_monitor_functions = ["export_sheet_9e2a"]
+        received = None
+
+        def run(self, *args, **kwargs):
+            pass
+
+        def get_notify(self, data):
+            self.received.append((data.result.source_name, data.result.get_data()))
+
+    # 订阅插件定义后，之前已创建的类补充包装
+    assert _is_wrapped(_Exporter, "export_sheet_9e2a")
+    listener = _Listener()
+    listener.received = []
+    with RunContext(include_inner_plugin=False):
+        PluginPool.register(listener)
+        assert _Exporter().export_sheet_9e2a() == {"rows": 1}
+    assert listener.received == [("Exporter", {"rows": 1})]
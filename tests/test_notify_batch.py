@@ -0,0 +1,77 @@
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin, Data
+from core.monitor import Dispatcher
+
+
+class _Source:
+    source_type = "server"
+    source_name = "ZenDaoServer"
+    disable_method = ()
+
+
+class _BatchPlugin(ServerPlugin):
+    server_allow_monitor_functions = ["run"]
+    notify_batch_size = 3
+    batches = []
+
+    def run(self, *args, **kwargs):
+        pass
+
+    def get_notify_batch(self, data_list):
+        self.batches.append([data.result.get_data() for data in data_list])
+
+
+class _SinglePlugin(ServerPlugin):
+    server_allow_monitor_functions = ["run"]
+    received = []
+
+    def run(self, *args, **kwargs):
+        pass
+
+    def get_notify(self, data: Data):
+        self.received.append(data.result.get_data())
+
+
+def _make_pool(*plugins):
+    pool = PluginPoolType(False)
+    for plugin in plugins:
+        pool.register(plugin)
+    return pool
+
+
+def _dispatch(pool, count):
+    for index in range(count):
+        Dispatcher._generic_dispatch(_Source(), pool, "run", index, "server_allow_monitor_functions", False)
+
+
+def test_notifies_are_batched_and_flushed_in_order():
+    batch_plugin, single_plugin = _BatchPlugin(), _SinglePlugin()
+    batch_plugin.batches, single_plugin.received = [], []
+    pool = _make_pool(batch_plugin, single_plugin)
+    _dispatch(pool, 7)
+    # 满 notify_batch_size 条即送达，未重写 get_notify_batch 的插件逐条接收
+    assert batch_plugin.batches == [[0, 1, 2], [3, 4, 5]]
+    assert single_plugin.received == list(range(7))
+    pool.flush_notify()
+    assert batch_plugin.batches == [[0, 1, 2], [3, 4, 5], [6]]
+    # 缓冲为空时不会送达空批次
+    pool.flush_notify()
+    assert len(batch_plugin.batches) == 3
+
+
+def test_flush_only_targets_given_plugin():
+    first, second = _BatchPlugin(), _BatchPlugin()
+    first.batches, second.batches = [], []
+    pool = _make_pool(first, second)
+    _dispatch(pool, 2)
+    pool.flush_notify(first)
+    assert first.batches == [[0, 1]]
+    assert second.batches == []
+    pool.flush_notify()
+    assert second.batches == [[0, 1]]
+
+
+def test_default_get_notify_batch_delivers_one_by_one():
+    pool = _make_pool()
+    assert pool.notify_batcher.get_batch_size(_SinglePlugin()) is None
+    assert pool.notify_batcher.get_batch_size(_BatchPlugin()) == 3
@@ -0,0 +1,74 @@
+import pickle
+
+from core.utils import OrderedRegistry
+
+
+def test_popitem_removes_last_ordered_key():
+    registry = OrderedRegistry([("a", 1), ("b", 2), ("c", 3)])
+    assert registry.popitem() == ("c", 3)
+    assert registry.keys() == ("a", "b")
+    assert registry.items() == (("a", 1), ("b", 2))
+
+
+def test_or_operators_keep_registry_consistent():
+    registry = OrderedRegistry([("a", 1)])
+    registry |= {"b": 2}
+    registry |= [("c", 3)]
+    assert registry.items() == (("a", 1), ("b", 2), ("c", 3))
+    merged = registry | {"a": 10, "d": 4}
+    assert isinstance(merged, OrderedRegistry)
+    assert merged.items() == (("a", 10), ("b", 2), ("c", 3), ("d", 4))
+    assert ({"z": 0} | registry).keys() == ("z", "a", "b", "c")
+
+
+def test_base_class_mutation_is_resynced():
+    registry = OrderedRegistry([("a", 1), ("b", 2)])
+    registry.keys()
+    dict.update(registry, {"c": 3})
+    assert registry.items() == (("a", 1), ("b", 2), ("c", 3))
+    dict.pop(registry, "a")
+    assert registry.keys() == ("b", "c")
+    del registry["c"]
+    assert registry.items() == (("b", 2),)
+
+
+def test_copy_and_pickle_keep_order():
+    registry = OrderedRegistry([("b", 2), ("a", 1)])
+    copied = registry.copy()
+    assert isinstance(copied, OrderedRegistry)
+    assert copied.keys() == ("b", "a")
+    assert pickle.loads(pickle.dumps(registry)).items() == registry.items()
+
+
+def test_values_view_is_cached_until_mutation():
+    registry = OrderedRegistry([("a", 1), ("b", 2)])
+    values = registry.values()
+    assert registry.values() is values
+    registry["c"] = 3
+    assert registry.values() == (1, 2, 3)
+    registry["a"] = 10
+    assert registry.values() == (10, 2, 3)
+    del registry["b"]
+    assert registry.values() == (10, 3)
+
+
+def _named(name):
+    return type(name, (), {})
+
+
+def test_priority_orders_before_names_and_registration():
+    first, second, third, fourth = _named("First"), _named("Second"), _named("Third"), _named("Fourth")
+    registry = OrderedRegistry([(first, 1), (second, 2), (third, 3), (fourth, 4)])
+    registry.sort(["Second", "First"])
+    assert registry.keys() == (second, first, third, fourth)
+    registry.set_priority(fourth, -1)
+    assert registry.keys() == (fourth, second, first, third)
+    # 优先级随复制、序列化及以注册表构造新注册表保留
+    assert registry.copy().keys() == registry.keys()
+    assert OrderedRegistry(registry).get_priority(fourth) == -1
+    registry_by_name = OrderedRegistry([("a", 1), ("b", 2)])
+    registry_by_name.set_priority("b", -1)
+    assert pickle.loads(pickle.dumps(registry_by_name)).keys() == ("b", "a")
+    del registry[fourth]
+    registry[fourth] = 4
+    assert registry.get_priority(fourth) == 0
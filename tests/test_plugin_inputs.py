@@ -0,0 +1,87 @@
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin, RunnerResult
+from core.utils import DynamicFreezeObject
+
+
+class _Source:
+    source_name = "ExcelPlugin"
+
+
+class _ExcelPlugin(ServerPlugin):
+    source_name = "ExcelPlugin"
+    required_inputs = ["ZenDaoServer"]
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _XmindPlugin(ServerPlugin):
+    source_name = "XmindPlugin"
+    required_inputs = ["ZenDaoServer", "ExcelPlugin.xmind_file_list"]
+    input_sources_only = True
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _ReportPlugin(ServerPlugin):
+    source_name = "ReportPlugin"
+    required_inputs = ["ZenDaoServer"]
+    depends_on = ["XmindPlugin"]
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _FreePlugin(ServerPlugin):
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+def _make_pool():
+    pool = PluginPoolType(False)
+    for plugin_class in (_XmindPlugin, _ReportPlugin, _ExcelPlugin, _FreePlugin):
+        pool.register_lazy(plugin_class)
+    return pool
+
+
+def test_activate_chains_plugin_inputs():
+    pool = _make_pool()
+    # 插件之间的输入与登记顺序无关
+    assert pool.activate(["ZenDaoServer"]) == []
+    assert {type(plugin) for plugin in pool.plugins} == {_XmindPlugin, _ReportPlugin, _ExcelPlugin, _FreePlugin}
+
+
+def test_activate_skips_plugins_without_sources():
+    pool = _make_pool()
+    assert sorted(pool.activate(["KdocsServer"])) == ["ExcelPlugin", "ReportPlugin", "XmindPlugin"]
+    assert [type(plugin) for plugin in pool.plugins] == [_FreePlugin]
+    assert pool.skipped_plugins["XmindPlugin"] == ["ZenDaoServer", "ExcelPlugin.xmind_file_list"]
+
+
+def test_check_inputs_requires_non_empty_fields():
+    pool = PluginPoolType(False)
+    plugin = _XmindPlugin()
+    pool.record_input("ZenDaoServer", RunnerResult(_Source(), DynamicFreezeObject(bug=[1])))
+    pool.record_input("ExcelPlugin", RunnerResult(_Source(), DynamicFreezeObject(xmind_file_list=[])))
+    assert not pool.check_inputs(plugin)
+    assert pool.skipped_plugins["XmindPlugin"] == ["ExcelPlugin.xmind_file_list"]
+    pool.record_input("ExcelPlugin", RunnerResult(_Source(), DynamicFreezeObject(xmind_file_list=["a.xmind"])))
+    assert pool.check_inputs(plugin)
+
+
+def test_dependencies_are_derived_from_required_inputs():
+    assert PluginPoolType.get_dependencies(_XmindPlugin) == ["ZenDaoServer", "ExcelPlugin"]
+    assert PluginPoolType.get_dependencies(_ReportPlugin) == ["ZenDaoServer", "XmindPlugin"]
+    assert PluginPoolType.get_dependencies(_FreePlugin) is None
+
+
+def test_input_sources_only_filters_broadcasts():
+    pool = _make_pool()
+    pool.activate(["ZenDaoServer"])
+    subscribers = pool.get_subscribers("plugin_allow_monitor_functions", "run", "ExcelPlugin")
+    assert _XmindPlugin in {type(plugin) for plugin in subscribers}
+    subscribers = pool.get_subscribers("plugin_allow_monitor_functions", "run", "FreePlugin")
+    assert _XmindPlugin not in {type(plugin) for plugin in subscribers}
+    assert _ReportPlugin in {type(plugin) for plugin in subscribers}
@@ -0,0 +1,38 @@
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin
+
+
+def _plugin_class(name, priority=0):
+    return type(name, (ServerPlugin,), {"priority": priority, "run": lambda self, *args, **kwargs: None})
+
+
+def _names(pool):
+    return [type(plugin).__name__ for plugin in pool.get_plugins()]
+
+
+def test_inner_plugins_follow_all_order_then_registration():
+    pool = PluginPoolType(True)
+    for name in ("CustomPlugin", "ReportPlugin", "OtherPlugin", "XmindPlugin", "ExcelSummaryPlugin"):
+        pool.register(_plugin_class(name)())
+    # 内置插件按 inner_plugins.__all__ 排列，其余插件保持注册顺序
+    assert _names(pool) == ["ExcelSummaryPlugin", "XmindPlugin", "ReportPlugin", "CustomPlugin", "OtherPlugin"]
+
+
+def test_priority_orders_before_inner_plugin_order():
+    pool = PluginPoolType(True)
+    for plugin_class in (_plugin_class("ExcelSummaryPlugin"), _plugin_class("ReportPlugin", priority=-1),
+                         _plugin_class("LatePlugin", priority=1), _plugin_class("CustomPlugin")):
+        pool.register(plugin_class())
+    assert _names(pool) == ["ReportPlugin", "ExcelSummaryPlugin", "CustomPlugin", "LatePlugin"]
+
+
+def test_order_is_cached_until_plugins_change():
+    pool = PluginPoolType(False)
+    pool.register(_plugin_class("SecondPlugin", priority=2)())
+    plugins = pool.get_plugins()
+    assert pool.get_plugins() is plugins
+    pool.register(_plugin_class("FirstPlugin", priority=1)())
+    assert _names(pool) == ["FirstPlugin", "SecondPlugin"]
+    pool.register_lazy(_plugin_class("ZeroPlugin"))
+    # 延迟登记的插件在获取时实例化并参与排序
+    assert _names(pool) == ["ZeroPlugin", "FirstPlugin", "SecondPlugin"]
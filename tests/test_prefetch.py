@@ -0,0 +1,54 @@
+import pytest
+
+import core.prefetch
+from core.prefetch import PrefetchRegistry, register_prefetch, get_prefetched
+
+
+@pytest.fixture
+def prefetchers(monkeypatch):
+    # 使用独立的注册表，不受插件模块导入时注册的预取任务影响
+    registered = {}
+    monkeypatch.setattr(core.prefetch, "_prefetchers", registered)
+    return registered
+
+
+def test_dependent_prefetch_receives_previous_result(prefetchers):
+    register_prefetch("bugs")(lambda system_parameters: system_parameters["bugs"])
+    register_prefetch("total", after="bugs")(lambda system_parameters, bugs: len(bugs))
+    registry = PrefetchRegistry()
+    registry.start({"bugs": [1, 2, 3]}, [])
+    assert registry.get("bugs", timeout=5) == [1, 2, 3]
+    assert registry.get("total", timeout=5) == 3
+    registry.close()
+
+
+def test_inactive_owner_is_not_prefetched(prefetchers):
+    calls = []
+    register_prefetch("excel", owner="ExcelSummaryPlugin")(calls.append)
+    registry = PrefetchRegistry()
+    registry.start({}, ["ZenDaoServer"])
+    registry.close()
+    assert calls == []
+    assert registry.get("excel") is None
+
+
+def test_failed_prefetch_skips_dependents(prefetchers):
+    calls = []
+
+    def fail(system_parameters):
+        raise ConnectionError("offline")
+
+    register_prefetch("bugs")(fail)
+    register_prefetch("total", after="bugs")(lambda system_parameters, bugs: calls.append(bugs))
+    registry = PrefetchRegistry()
+    registry.start({}, [])
+    # 预取失败不抛出，由使用方按原流程重新获取
+    assert registry.get("bugs", timeout=5) is None
+    assert registry.get("total", timeout=5) is None
+    registry.close()
+    assert calls == []
+
+
+def test_get_prefetched_outside_run_returns_none(prefetchers):
+    register_prefetch("bugs")(lambda system_parameters: [1])
+    assert get_prefetched("bugs") is None
@@ -0,0 +1,74 @@
+import os
+import pickle
+
+from core.base import ServerPlugin, RunnerResult, Data
+from core.context import RunContext
+from core.generator import PluginPool
+from core.process_pool import PluginProcessPool
+from core.utils import DynamicFreezeObject
+
+
+class _HeavyPlugin(ServerPlugin):
+    run_in_process = True
+    collected = ()
+
+    def run(self, *args, **kwargs):
+        return DynamicFreezeObject(pid=os.getpid(), collected=list(self.collected))
+
+
+class _Listener(ServerPlugin):
+    server_allow_monitor_functions = []
+    received = None
+
+    def run(self, *args, **kwargs):
+        pass
+
+    def get_notify(self, data: Data):
+        self.received.append((data.result.source_name, data.result.get_data()))
+
+
+class _Idle(ServerPlugin):
+    server_allow_monitor_functions = []
+    plugin_allow_monitor_functions = []
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _Source:
+    source_type = "plugin"
+    source_name = "HeavyPlugin"
+
+
+def test_payloads_survive_pickling():
+    data = DynamicFreezeObject(bugs=[{"id": 1}], total=1)
+    payload = Data(_Source(), RunnerResult(_Source(), data), "run")
+    restored = pickle.loads(pickle.dumps(payload))
+    assert restored.method_name == "run"
+    assert restored.result.source_type == "plugin"
+    assert restored.result.source_name == "HeavyPlugin"
+    assert restored.result.get_data() == data
+    assert restored.result.get_data()["bugs"][0]["id"] == 1
+
+
+def test_plugin_runs_in_child_and_result_is_broadcast():
+    plugin, listener, idle = _HeavyPlugin(), _Listener(), _Idle()
+    plugin.collected = ["bug-1"]
+    listener.received = []
+    process_pool = PluginProcessPool(max_workers=1)
+    try:
+        with RunContext(include_inner_plugin=False):
+            PluginPool.register(listener)
+            PluginPool.register(idle)
+            process_pool.submit(plugin)
+            assert process_pool.is_pending(plugin)
+            # 订阅了子进程插件 run 的插件需要等待其结果
+            assert process_pool.depends_on_pending(listener)
+            assert not process_pool.depends_on_pending(idle)
+            result = process_pool.wait(plugin)
+            assert not process_pool.depends_on_pending(listener)
+    finally:
+        process_pool.close()
+    assert result["pid"] != os.getpid()
+    assert result["collected"] == ("bug-1",)
+    assert listener.received == [("_HeavyPlugin", result)]
@@ -0,0 +1,72 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from core.context import RunContext
+from core.result_cache import ResultCache, cached_run, get_fingerprint, _MISSING
+
+
+def test_round_trip(tmp_path):
+    cache = ResultCache(tmp_path)
+    cache.set("key", {"total": 1})
+    assert cache.get("key", ttl=60) == {"total": 1}
+    assert cache.get("other", ttl=60) is _MISSING
+
+
+def test_set_failure_only_warns(tmp_path):
+    # 缓存目录位置被普通文件占用，无法创建目录
+    blocker = tmp_path / "cache"
+    blocker.write_text("")
+    cache = ResultCache(blocker)
+    with pytest.warns(UserWarning, match="无法写入缓存"):
+        cache.set("key", {"total": 1})
+    with pytest.warns(UserWarning, match="无法读取"):
+        assert cache.get("key") is _MISSING
+
+
+def test_get_ignores_touch_failure(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    cache.set("key", {"total": 1})
+
+    def utime(*args, **kwargs):
+        raise FileNotFoundError("evicted")
+
+    monkeypatch.setattr(os, "utime", utime)
+    assert cache.get("key") == {"total": 1}
+
+
+class _Server:
+    calls = 0
+
+    def __init__(self, env):
+        self.parameter = None
+        self.system_parameter = {"env": env, "report_type": "测试环境", "out_put_dir": "."}
+
+    @cached_run(ttl=60, system_parameters=["env", "report_type"])
+    def run(self):
+        _Server.calls += 1
+        return {"env": self.system_parameter["env"]}
+
+
+def test_system_parameters_are_part_of_key(tmp_path):
+    system_parameters = SimpleNamespace(result_cache=True, result_cache_dir=tmp_path, result_cache_size=None)
+    with RunContext(system_parameters, include_inner_plugin=False):
+        _Server.calls = 0
+        assert _Server([{"name": "测试环境"}]).run() == {"env": [{"name": "测试环境"}]}
+        assert _Server([{"name": "测试环境"}]).run() == {"env": [{"name": "测试环境"}]}
+        assert _Server.calls == 1
+        # 系统参数不同时不命中缓存
+        assert _Server([{"name": "生产环境"}]).run() == {"env": [{"name": "生产环境"}]}
+        assert _Server.calls == 2
+        # 未声明的系统参数不参与缓存键
+        server = _Server([{"name": "测试环境"}])
+        server.system_parameter["out_put_dir"] = "out"
+        server.run()
+        assert _Server.calls == 2
+
+
+def test_unhashable_values_skip_cache():
+    server = _Server(object())
+    assert get_fingerprint(server, "run", (), {}, [], ["env"]) is None
+    assert get_fingerprint(server, "run", (), {}, [], ["report_type"]) is not None
@@ -0,0 +1,90 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from core._config._exception import SystemParameterException
+from core.scheduler import DagScheduler
+
+_run_name = contextvars.ContextVar("run_name", default=None)
+
+
+def _recorder(order, name, delay=0.0):
+    lock = threading.Lock()
+
+    def action():
+        time.sleep(delay)
+        with lock:
+            order.append(name)
+
+    return action
+
+
+def test_independent_nodes_run_concurrently_after_dependencies():
+    order = []
+    scheduler = DagScheduler(max_workers=4)
+    scheduler.add("ZenDaoServer", _recorder(order, "ZenDaoServer", 0.2))
+    scheduler.add("KdocsServer", _recorder(order, "KdocsServer", 0.2))
+    scheduler.add("ReportPlugin", _recorder(order, "ReportPlugin"), ["ZenDaoServer", "KdocsServer"])
+    start = time.perf_counter()
+    scheduler.run()
+    assert time.perf_counter() - start < 0.35
+    assert order[-1] == "ReportPlugin"
+    assert sorted(order[:2]) == ["KdocsServer", "ZenDaoServer"]
+
+
+def test_cycle_is_rejected_before_running():
+    order = []
+    scheduler = DagScheduler()
+    scheduler.add("A", _recorder(order, "A"), ["C"])
+    scheduler.add("B", _recorder(order, "B"), ["A"])
+    scheduler.add("C", _recorder(order, "C"), ["B"])
+    scheduler.add("D", _recorder(order, "D"))
+    with pytest.raises(SystemParameterException, match="循环依赖"):
+        scheduler.run()
+    assert order == []
+
+
+def test_duplicate_node_is_rejected():
+    scheduler = DagScheduler()
+    scheduler.add("A", lambda: None)
+    with pytest.raises(SystemParameterException, match="重复"):
+        scheduler.add("A", lambda: None)
+
+
+def test_dependencies_outside_the_graph_are_ignored():
+    # 如被关闭的内置服务
+    order = []
+    scheduler = DagScheduler()
+    scheduler.add("XmindPlugin", _recorder(order, "XmindPlugin"), ["ZenDaoServer", "XmindPlugin"])
+    scheduler.run()
+    assert order == ["XmindPlugin"]
+
+
+def test_failure_stops_dependents_and_is_raised():
+    order = []
+
+    def fail():
+        raise ValueError("login failed")
+
+    scheduler = DagScheduler()
+    scheduler.add("ZenDaoServer", fail)
+    scheduler.add("KdocsServer", _recorder(order, "KdocsServer", 0.1))
+    scheduler.add("ReportPlugin", _recorder(order, "ReportPlugin"), ["ZenDaoServer"])
+    with pytest.raises(ValueError, match="login failed"):
+        scheduler.run()
+    # 已运行的节点执行完毕，依赖失败节点的节点不再运行
+    assert order == ["KdocsServer"]
+
+
+def test_nodes_keep_the_caller_context():
+    seen = []
+    scheduler = DagScheduler()
+    scheduler.add("A", lambda: seen.append(_run_name.get()))
+    token = _run_name.set("run-1")
+    try:
+        scheduler.run()
+    finally:
+        _run_name.reset(token)
+    assert seen == ["run-1"]
@@ -0,0 +1,60 @@
+import multiprocessing
+
+from core.shared_data import SharedMemoryStore
+
+
+def _read_while_writing(name, ready, stop, results):
+    store = SharedMemoryStore(name)
+    reads, errors, last_version = 0, [], 0
+    ready.set()
+    try:
+        while not stop.is_set():
+            values, version = store.snapshot()
+            reads += 1
+            if version < last_version:
+                errors.append(f"版本回退：{last_version} -> {version}")
+            last_version = version
+            # 同一次 update 写入的键必须来自同一版本
+            if values and (values["a"] != version or values["b"] != [version] * 100):
+                errors.append(f"读到不一致的数据：{version} {values['a']} {values['b'][:1]}")
+        results.put((reads, last_version, errors))
+    finally:
+        store.close()
+
+
+def test_reader_process_sees_consistent_versions():
+    context = multiprocessing.get_context("spawn")
+    store = SharedMemoryStore()
+    ready, stop, results = context.Event(), context.Event(), context.Queue()
+    reader = context.Process(target=_read_while_writing, args=(store.name, ready, stop, results))
+    reader.start()
+    try:
+        assert ready.wait(30)
+        for version in range(1, 301):
+            store.update({"a": version, "b": [version] * 100}, version)
+        stop.set()
+        reads, last_version, errors = results.get(timeout=30)
+        reader.join(30)
+    finally:
+        stop.set()
+        store.close()
+    assert errors == []
+    assert reads > 0
+    assert last_version <= 300
+    assert reader.exitcode == 0
+
+
+def test_reads_are_cached_per_version():
+    store = SharedMemoryStore()
+    try:
+        store.update({"bugs": [1, 2]}, 1)
+        reader = SharedMemoryStore(store.name)
+        first = reader.get("bugs")
+        assert reader.get("bugs") is first
+        store.update({"name": "x"}, 2)
+        # 未变化的键沿用已反序列化的值
+        assert reader.get("bugs") is first
+        assert reader.snapshot() == ({"bugs": [1, 2], "name": "x"}, 2)
+        reader.close()
+    finally:
+        store.close()
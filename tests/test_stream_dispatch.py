@@ -0,0 +1,70 @@
+import pytest
+
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin, StreamData
+from core.monitor import Dispatcher
+
+
+class _Source:
+    source_type = "server"
+    source_name = "ZenDaoServer"
+
+
+class _BugStreamPlugin(ServerPlugin):
+    allow_monitor_streams = ["bugs"]
+    received = []
+
+    def run(self, *args, **kwargs):
+        pass
+
+    def get_stream(self, data: StreamData):
+        self.received.append((data.source_name, data.stream_name, data.item, data.end))
+
+    def get_notify(self, data):
+        raise AssertionError("流式广播不应送达 get_notify")
+
+
+class _Journal:
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, obj, source_name, method_name, result, monitor_attr, identity_check):
+        self.records.append((source_name, method_name, result, monitor_attr))
+
+
+def _make_pool():
+    plugin = _BugStreamPlugin()
+    plugin.received = []
+    pool = PluginPoolType(False)
+    pool.register(plugin)
+    return pool, plugin
+
+
+def test_stream_items_reach_get_stream_in_order():
+    pool, plugin = _make_pool()
+    for bug in ({"id": 1}, {"id": 2}):
+        assert Dispatcher.stream_dispatch(_Source(), pool, "bugs", bug)
+    Dispatcher.stream_dispatch(_Source(), pool, "bugs", None, end=True)
+    # 未订阅的流不会送达
+    Dispatcher.stream_dispatch(_Source(), pool, "cases", {"id": 3})
+    assert plugin.received == [("ZenDaoServer", "bugs", {"id": 1}, False),
+                                ("ZenDaoServer", "bugs", {"id": 2}, False),
+                                ("ZenDaoServer", "bugs", None, True)]
+
+
+def test_has_stream_subscribers_lets_publisher_skip_items():
+    pool, _ = _make_pool()
+    assert Dispatcher.has_stream_subscribers(_Source(), pool, "bugs")
+    assert not Dispatcher.has_stream_subscribers(_Source(), pool, "cases")
+    # 记录广播日志时，即使无订阅也需要发布元素以便回放
+    pool.journal = _Journal()
+    assert Dispatcher.has_stream_subscribers(_Source(), pool, "cases")
+    Dispatcher.stream_dispatch(_Source(), pool, "cases", {"id": 3})
+    assert pool.journal.records == [("ZenDaoServer", "cases", ({"id": 3}, False), "allow_monitor_streams")]
+
+
+def test_stream_item_is_immutable():
+    data = StreamData(_Source(), "bugs", {"id": 1})
+    with pytest.raises(AttributeError):
+        data.item = None
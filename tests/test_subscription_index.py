@@ -0,0 +1,61 @@
+from core._config._global_obj import PluginPoolType
+from core.base import ServerPlugin
+
+
+class _RunListener(ServerPlugin):
+    server_allow_monitor_functions = ["run"]
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _InitializeListener(ServerPlugin):
+    server_allow_monitor_functions = ["initialize"]
+    priority = -1
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _BothListener(ServerPlugin):
+    server_allow_monitor_functions = ["initialize", "run"]
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+class _PluginRunListener(ServerPlugin):
+    server_allow_monitor_functions = []
+
+    def run(self, *args, **kwargs):
+        pass
+
+
+def _make_pool(*plugins):
+    pool = PluginPoolType(False)
+    for plugin in plugins:
+        pool.register(plugin)
+    return pool
+
+
+def test_subscribers_follow_monitor_lists_and_plugin_order():
+    run_listener, initialize_listener, both = _RunListener(), _InitializeListener(), _BothListener()
+    pool = _make_pool(run_listener, both, initialize_listener)
+    assert pool.get_subscribers("server_allow_monitor_functions", "run", "ZenDaoServer") == (run_listener, both)
+    # priority 小的插件排在前面
+    assert pool.get_subscribers("server_allow_monitor_functions", "initialize", "ZenDaoServer") == \
+        (initialize_listener, both)
+    assert pool.get_subscribers("server_allow_monitor_functions", "tokenization", "ZenDaoServer") == ()
+
+
+def test_subscribers_are_cached_until_plugins_change():
+    run_listener = _RunListener()
+    pool = _make_pool(run_listener, _PluginRunListener())
+    subscribers = pool.get_subscribers("plugin_allow_monitor_functions", "run", "ReportPlugin")
+    assert len(subscribers) == 2
+    assert pool.get_subscribers("plugin_allow_monitor_functions", "run", "ReportPlugin") is subscribers
+    added = _RunListener()
+    pool.register(added)
+    assert pool.get_subscribers("server_allow_monitor_functions", "run", "ZenDaoServer") == (run_listener, added)
+    pool.set_plugins([added])
+    assert pool.get_subscribers("plugin_allow_monitor_functions", "run", "ReportPlugin") == (added,)